@@ -1,27 +1,279 @@
 import requests
 import time
-from config import HEADERS
+import os
+import sys
+import json
+import gzip
+import hashlib
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from config import API_KEY, HEADERS, CURRENT_SEASON
+import cassette
 
-BASE_URL = "https://api.collegefootballdata.com"
+BASE_URL = os.getenv("CFBD_BASE_URL", "https://api.collegefootballdata.com")
 
-def fetch_with_retry(endpoint, params):
+# live: normal network calls. record: live calls, raw responses saved to
+# cassettes/. replay: serve cassettes only (no network, no API key needed).
+MODE = os.getenv("CFBD_MODE", "live")
+if "--record" in sys.argv:
+    MODE = "record"
+elif "--replay" in sys.argv:
+    MODE = "replay"
+
+# --- HTTP CLIENT ---
+# One keep-alive session for the whole process so repeated calls reuse the
+# TCP/TLS connection instead of paying a fresh handshake every time.
+POOL_SIZE = int(os.getenv("CFBD_POOL_SIZE", "10"))
+# Token bucket: sustained requests/second and how many may burst at once
+RATE_LIMIT = float(os.getenv("CFBD_RATE_LIMIT", "5"))
+RATE_BURST = int(os.getenv("CFBD_RATE_BURST", "5"))
+# Worker threads used by fetch_many
+CONCURRENCY = int(os.getenv("CFBD_CONCURRENCY", "8"))
+
+
+class TokenBucket:
+    """
+    Process-wide token bucket. Each request takes one token; tokens refill at
+    `rate` per second up to `capacity`. A 429 pauses the whole bucket so every
+    thread backs off together instead of hammering the API in parallel.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _build_session()
+LIMITER = TokenBucket(RATE_LIMIT, RATE_BURST)
+
+
+def _require_key():
+    if MODE != "replay" and not API_KEY:
+        raise ValueError("API Key not found! Check your .env file (or run with --replay).")
+
+
+def _request(endpoint, params):
+    if MODE == "replay":
+        return cassette.replay(cache_key(endpoint, params), endpoint)
+    LIMITER.wait()
+    res = SESSION.get(f"{BASE_URL}{endpoint}", params=params, timeout=60)
+    if MODE == "record":
+        cassette.record(cache_key(endpoint, params), endpoint, _normalize_params(params), res)
+    return res
+
+
+def _retry_after(response, default):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+# --- RESPONSE CACHE ---
+# Responses are stored on disk, keyed by a hash of (endpoint, params).
+# Pass --refresh to any script (or set CFBD_REFRESH=1) to skip cache reads;
+# scripts with their own argparse declare it through add_cli_flags().
+CACHE_DIR = os.getenv("CFBD_CACHE_DIR", ".cfbd_cache")
+REFRESH = "--refresh" in sys.argv or os.getenv("CFBD_REFRESH") == "1"
+# Recording must hit the network and replay must be deterministic, so both
+# bypass the cache.
+CACHE_ENABLED = MODE == "live"
+
+# TTLs (seconds) for current-season data. Past seasons never expire.
+CACHE_TTL = {
+    "/games": 60 * 60,
+    "/lines": 15 * 60,
+    "/games/weather": 6 * 60 * 60,
+    "/ratings/srs": 12 * 60 * 60,
+    "/talent": 24 * 60 * 60,
+}
+DEFAULT_TTL = 12 * 60 * 60
+
+CACHE_STATS = {"hits": 0, "misses": 0, "expired": 0, "bypassed": 0}
+
+
+def add_cli_flags(parser):
+    """
+    Declare the flags this module reads from sys.argv at import time, so
+    scripts with their own argparse accept them instead of erroring out.
+    """
+    parser.add_argument("--refresh", action="store_true", help="Skip API cache reads (or CFBD_REFRESH=1)")
+    parser.add_argument("--record", action="store_true", help="Record API responses to cassettes/")
+    parser.add_argument("--replay", action="store_true", help="Serve API responses from cassettes/ only")
+    return parser
+
+
+def _normalize_params(params):
+    # numpy ints (e.g. df['season'].unique()) are not JSON serializable
+    return {str(k): str(v) for k, v in sorted((params or {}).items())}
+
+
+def cache_key(endpoint, params):
+    raw = json.dumps({"endpoint": endpoint, "params": _normalize_params(params)}, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json.gz")
+
+
+def _is_immutable(endpoint, params, data):
+    """
+    A /games or /lines payload is frozen once every game in it has a final
+    score (in any season, so postponed games are still refetched after the
+    rollover). Everything else from a completed season never changes.
+    """
+    try:
+        year = int(params.get("year"))
+    except (TypeError, ValueError):
+        return False
+
+    if endpoint == "/games" and isinstance(data, list) and data:
+        return all(g.get("completed") for g in data)
+    if endpoint == "/lines" and isinstance(data, list) and data:
+        return all(g.get("homeScore") is not None and g.get("awayScore") is not None for g in data)
+    return year < CURRENT_SEASON
+
+
+def cache_get(endpoint, params, refresh=False):
+    if not CACHE_ENABLED:
+        return None
+    if REFRESH or refresh:
+        CACHE_STATS["bypassed"] += 1
+        return None
+
+    path = _cache_path(cache_key(endpoint, params))
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        CACHE_STATS["misses"] += 1
+        return None
+
+    if not entry.get("immutable"):
+        ttl = CACHE_TTL.get(endpoint, DEFAULT_TTL)
+        if time.time() - entry.get("fetched_at", 0) > ttl:
+            CACHE_STATS["expired"] += 1
+            return None
+
+    CACHE_STATS["hits"] += 1
+    return entry["data"]
+
+
+def cache_put(endpoint, params, data):
+    if not CACHE_ENABLED:
+        return
+    path = _cache_path(cache_key(endpoint, params))
+    entry = {
+        "endpoint": endpoint,
+        "params": _normalize_params(params),
+        "fetched_at": time.time(),
+        "immutable": _is_immutable(endpoint, params, data),
+        "data": data,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"      ⚠️ Could not write cache for {endpoint}: {e}")
+
+
+def cache_report():
+    s = CACHE_STATS
+    lookups = s["hits"] + s["misses"] + s["expired"]
+    hit_rate = (s["hits"] / lookups * 100) if lookups > 0 else 0.0
+    return (f"API cache: {s['hits']} hits, {s['misses']} misses, {s['expired']} expired, "
+            f"{s['bypassed']} bypassed ({hit_rate:.0f}% hit rate)")
+
+
+@atexit.register
+def _print_cache_report():
+    if any(CACHE_STATS.values()):
+        print(f"   -> {cache_report()}")
+    if any(cassette.STATS.values()):
+        s = cassette.STATS
+        print(f"   -> Cassettes ({MODE}): {s['recorded']} recorded, {s['replayed']} replayed, {s['missing']} missing")
+
+
+def fetch_with_retry(endpoint, params, refresh=False):
     """
     Fetch data from CFBD API with rate limiting and retries.
     Used for batch processes where we want to be robust.
+    refresh=True skips the cache read for this call (the response is still cached).
     """
-    url = f"{BASE_URL}{endpoint}"
-    for attempt in range(1, 4): 
+    cached = cache_get(endpoint, params, refresh)
+    if cached is not None:
+        return cached
+
+    _require_key()
+    for attempt in range(1, 4):
         try:
-            res = requests.get(url, headers=HEADERS, params=params)
-            if res.status_code == 200: 
-                return res.json()
-            elif res.status_code == 429: 
-                print(f"      ⚠️ Rate limit hit. Sleeping {10 * attempt}s...")
-                time.sleep(10 * attempt)
+            res = _request(endpoint, params)
+            if res.status_code == 200:
+                data = res.json()
+                cache_put(endpoint, params, data)
+                return data
+            elif res.status_code == 429:
+                wait = _retry_after(res, default=10 * attempt)
+                print(f"      ⚠️ Rate limit hit. Backing off {wait:.0f}s...")
+                LIMITER.pause(wait)
             else:
                  # For other errors, we might want to just continue retry or log
                  pass
-        except Exception as e: 
+        except cassette.CassetteMiss:
+            # Replay is deterministic: a missing recording won't appear on retry
+            raise
+        except Exception as e:
             time.sleep(5)
     return []
 
@@ -30,14 +282,45 @@ def get_data(endpoint, params):
     Simpler wrapper for API calls, often used where we want to print status.
     Maintains compatibility with previous simpler implementations.
     """
+    cached = cache_get(endpoint, params)
+    if cached is not None:
+        return cached
+
+    _require_key()
     url = f"{BASE_URL}{endpoint}"
     try:
         # Optional: verify if we want to print here or leave it to the caller.
         # The original code printed "Fetching..." often.
-        response = requests.get(url, headers=HEADERS, params=params)
+        response = _request(endpoint, params)
         response.raise_for_status()
-        time.sleep(0.5) 
-        return response.json()
+        data = response.json()
+        cache_put(endpoint, params, data)
+        return data
+    except cassette.CassetteMiss:
+        raise
     except Exception as e:
         print(f"Error fetching {url}: {e}")
         return []
+
+
+def fetch_many(batch, max_workers=None, refresh=False):
+    """
+    Fetch a batch of (endpoint, params) requests concurrently.
+    All workers share the global token bucket, and results come back in the
+    same order as `batch`. Duplicate requests are only sent once.
+    refresh=True bypasses cache reads for just this batch; a collection of
+    endpoints (e.g. {"/lines"}) bypasses them for those endpoints only.
+    """
+    batch = list(batch)
+    keys = [cache_key(endpoint, params) for endpoint, params in batch]
+    unique = {}
+    for key, req in zip(keys, batch):
+        unique.setdefault(key, req)
+
+    workers = min(max_workers or CONCURRENCY, len(unique)) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {key: pool.submit(fetch_with_retry, endpoint, params,
+                                     refresh if isinstance(refresh, bool) else endpoint in refresh) for key, (endpoint, params) in unique.items()}
+        results = {key: f.result() for key, f in futures.items()}
+
+    return [results[key] for key in keys]
@@ -2,7 +2,13 @@ import streamlit as st
 import pandas as pd
 import os
 import hmac
+import requests
 from dotenv import load_dotenv
+from grading import grade_history
+from service import query
+from rollup import load_rollup, aggregate, bet_rows, summarize
+from config import ROLLUP_FILE, PREDICTIONS_DB
+import prediction_store as store
 
 # --- CONFIG ---
 st.set_page_config(page_title="CFB Quant Engine", page_icon="🏈", layout="wide")
@@ -41,28 +47,101 @@ if not check_password():
 
 st.title("🏈 CFB Quant Engine: Triple Threat Dashboard")
 load_dotenv()
+SERVICE_URL = os.getenv("CFB_SERVICE_URL", "http://127.0.0.1:8700")
+
+PREDICTIONS_FILE = "live_predictions.csv"
+PAGE_SIZE = 50
 
 # --- 1. LOAD DATA ---
-@st.cache_data(ttl=0)
-def load_data():
-    if not os.path.exists("live_predictions.csv"):
-        return pd.DataFrame()
-    
+# Cached on the file's (mtime, size): reruns reuse the parsed frame and graded
+# views until predict.py actually writes new predictions.
+def file_version(path):
     try:
-        df = pd.read_csv("live_predictions.csv")
-    except pd.errors.EmptyDataError:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def data_source():
+    """The prediction store when there is one (its WAL file changes on every commit), else the CSV export."""
+    if os.path.exists(PREDICTIONS_DB):
+        return PREDICTIONS_DB, (file_version(PREDICTIONS_DB), file_version(f"{PREDICTIONS_DB}-wal"))
+    return PREDICTIONS_FILE, file_version(PREDICTIONS_FILE)
+
+@st.cache_data(max_entries=2)
+def load_data(path, version):
+    if version is None:
         return pd.DataFrame()
     
-    if 'GameID' in df.columns:
-        df['GameID'] = df['GameID'].astype(str).str.replace(r'\.0$', '', regex=True)
+    if path == PREDICTIONS_DB:
+        # Read-only WAL reader: never blocks (or is blocked by) predict.py
+        conn = store.connect(path, readonly=True)
+        df = store.read_predictions(conn, formatted=True)
+        conn.close()
+    else:
+        try:
+            df = pd.read_csv(path)
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame()
+        if 'GameID' in df.columns:
+            df['GameID'] = df['GameID'].astype(str).str.replace(r'\.0$', '', regex=True)
         
     if 'Manual_HomeScore' not in df.columns:
         df['Manual_HomeScore'] = pd.NA
         df['Manual_AwayScore'] = pd.NA
+
+    if 'StartDate' in df.columns:
+        df = df.sort_values(by='StartDate', ascending=True)
         
     return df
 
-df = load_data()
+@st.cache_data(max_entries=2)
+def graded_views(path, version):
+    """Upcoming board and graded history (newest first), once per data version."""
+    df = load_data(path, version)
+    upcoming_df = df[df['Manual_HomeScore'].isna()].copy()
+    graded_df = grade_history(df[df['Manual_HomeScore'].notna()])
+    if graded_df.empty:
+        return upcoming_df, graded_df
+
+    h_score = graded_df['Manual_HomeScore'].astype(float).astype(int).astype(str)
+    a_score = graded_df['Manual_AwayScore'].astype(float).astype(int).astype(str)
+    graded_df['Res (SU)'] = graded_df['ML_Result']
+    graded_df['Res (Spr)'] = graded_df['Spread_Result']
+    graded_df['Res (Tot)'] = graded_df['Total_Result']
+    graded_df['Pick (SU)'] = graded_df.get('Moneyline Pick')
+    graded_df['Pick (Spr)'] = graded_df.get('Spread Pick')
+    graded_df['Pick (Tot)'] = graded_df.get('Total Pick')
+    graded_df['Date'] = graded_df['StartDate'].astype(str).str[:10]
+    graded_df['Game'] = graded_df['AwayTeam'] + " " + a_score + " - " + h_score + " " + graded_df['HomeTeam']
+    return upcoming_df, graded_df.iloc[::-1].reset_index(drop=True)
+
+@st.cache_data(max_entries=2)
+def rollup_table(path, version, history_path, history_version):
+    """The grading step's performance rollup; built from the history if predict.py hasn't written one yet."""
+    if version is not None:
+        return load_rollup(path)[0]
+    return aggregate(bet_rows(load_data(history_path, history_version)))
+
+# --- SHARED RESOURCES ---
+@st.cache_resource
+def service_session():
+    """One keep-alive HTTP session to the prediction service, shared by every browser session."""
+    return requests.Session()
+
+def paginate(frame, key, styler=None, subset=()):
+    """Render one page of a large table; styling is applied to that page only."""
+    pages = max(1, -(-len(frame) // PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_{pages}")
+    view = frame.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+    if styler is not None:
+        view = view.style.map(styler, subset=[c for c in subset if c in view.columns])
+    st.dataframe(view, use_container_width=True, hide_index=True)
+
+source, version = data_source()
+df = load_data(source, version)
 
 # --- 2. DIAGNOSTICS ---
 with st.expander("🛠️ Data Diagnostics", expanded=False):
@@ -74,60 +153,9 @@ if df.empty:
     st.warning("⚠️ Waiting for data... (CSV is empty)")
     st.stop()
 
-if 'StartDate' in df.columns:
-    df = df.sort_values(by='StartDate', ascending=True)
-
-# --- 4. PRE-CALCULATE GRADES ---
-graded_rows = []
-
-for _, row in df.iterrows():
-    if pd.notna(row['Manual_HomeScore']):
-        h_score = float(row['Manual_HomeScore'])
-        a_score = float(row['Manual_AwayScore'])
-        winner = row['HomeTeam'] if h_score > a_score else row['AwayTeam']
-        
-        # SU
-        su_pick = row.get('Moneyline Pick')
-        su_res = "WIN" if su_pick == winner else "LOSS"
-        
-        # Spread
-        spread_res = "PUSH"
-        if pd.notna(row.get('Pick_Line')):
-            pick_team = row.get('Pick_Team')
-            line = float(row.get('Pick_Line', 0))
-            if pick_team == row['HomeTeam']: margin = (h_score - a_score) + line
-            else: margin = (a_score - h_score) + line
-            if margin > 0: spread_res = "WIN"
-            elif margin < 0: spread_res = "LOSS"
-            
-        # Total
-        total_res = "PUSH"
-        if pd.notna(row.get('Pick_Total')):
-            actual_total = h_score + a_score
-            target = float(row.get('Pick_Total', 0))
-            side = row.get('Pick_Side')
-            if side == 'OVER': total_res = "WIN" if actual_total > target else "LOSS"
-            elif side == 'UNDER': total_res = "WIN" if actual_total < target else "LOSS"
-            if actual_total == target: total_res = "PUSH"
-
-        new_row = row.copy()
-        new_row['Res (SU)'] = su_res
-        new_row['Res (Spr)'] = spread_res
-        new_row['Res (Tot)'] = total_res
-        new_row['Pick (SU)'] = su_pick
-        new_row['Pick (Spr)'] = row.get('Spread Pick')
-        new_row['Pick (Tot)'] = row.get('Total Pick')
-        new_row['Date'] = str(row.get('StartDate'))[:10]
-        new_row['Game'] = f"{row['AwayTeam']} {int(a_score)} - {int(h_score)} {row['HomeTeam']}"
-        
-        graded_rows.append(new_row)
-
-if graded_rows:
-    graded_df = pd.DataFrame(graded_rows)
-else:
-    graded_df = pd.DataFrame()
-
-upcoming_df = df[df['Manual_HomeScore'].isna()].copy()
+# --- 4. PRE-CALCULATED GRADES ---
+upcoming_df, graded_df = graded_views(source, version)
+rollup = rollup_table(ROLLUP_FILE, file_version(ROLLUP_FILE), source, version)
 
 t1, t2, t3 = st.tabs(["🔮 Forecast Board", "📜 Performance History", "💰 Bankroll Simulator"])
 
@@ -151,69 +179,81 @@ with t1:
         cols = ['StartDate', 'Game', 'Moneyline Pick', 'Moneyline Conf', 
                 'Spread Pick', 'Spread Conf', 'Total Pick', 'Total Conf']
         valid_cols = [c for c in cols if c in upcoming_df.columns]
-        st.dataframe(upcoming_df[valid_cols].style.map(color_conf, subset=[c for c in ['Moneyline Conf', 'Spread Conf', 'Total Conf'] if c in valid_cols]), use_container_width=True, hide_index=True)
+        paginate(upcoming_df[valid_cols], "page_upcoming", color_conf, ['Moneyline Conf', 'Spread Conf', 'Total Conf'])
     else:
         st.info("No upcoming games found.")
 
+    # Ad-hoc matchups go to the warm prediction service (python service.py)
+    with st.expander("🛰️ Matchup Lookup", expanded=False):
+        q1, q2, q3, q4 = st.columns(4)
+        home = q1.text_input("Home")
+        away = q2.text_input("Away")
+        spread = q3.text_input("Spread (optional)")
+        total = q4.text_input("Total (optional)")
+        if home and away:
+            pick = query("/predict", {'home': home, 'away': away, 'spread': spread, 'total': total}, url=SERVICE_URL, session=service_session())
+            if pick is None:
+                st.info(f"Prediction service not reachable at {SERVICE_URL} (or no line for this matchup).")
+            else:
+                lookup_cols = ['Game', 'Moneyline Pick', 'Moneyline Conf', 'Spread Pick', 'Spread Conf', 'Total Pick', 'Total Conf']
+                st.dataframe(pd.DataFrame([pick])[lookup_cols], use_container_width=True, hide_index=True)
+
 with t2:
     if not graded_df.empty:
-        display_df = graded_df.sort_values(by='StartDate', ascending=False)
-        def get_record(df, res_col):
-            if res_col not in df.columns: return "0-0-0", 0.0
-            wins = len(df[df[res_col] == 'WIN'])
-            losses = len(df[df[res_col] == 'LOSS'])
-            pushes = len(df[df[res_col] == 'PUSH'])
-            total = wins + losses
-            pct = (wins / total * 100) if total > 0 else 0.0
-            return f"{wins}-{losses}-{pushes}", pct
-
-        rec_su, pct_su = get_record(display_df, 'Res (SU)')
-        rec_spr, pct_spr = get_record(display_df, 'Res (Spr)')
-        rec_tot, pct_tot = get_record(display_df, 'Res (Tot)')
+        display_df = graded_df
+        # Records, units and ROI come from the rollup, never from the per-game history
+        f1, f2 = st.columns(2)
+        seasons = sorted(rollup['season'].unique(), reverse=True)
+        season = f1.selectbox("Season", [None] + seasons, format_func=lambda v: "All" if v is None else str(v))
+        breakdown = f2.selectbox("Break down by", ['week', 'conference', 'conf_bucket', 'book'])
+        by_market = summarize(rollup, by=['market'], season=season).set_index('market')
+
+        def get_record(market):
+            if market not in by_market.index: return "0-0-0", 0.0
+            r = by_market.loc[market]
+            return f"{r['wins']}-{r['losses']}-{r['pushes']}", r['win_pct']
+
+        rec_su, pct_su = get_record('ml')
+        rec_spr, pct_spr = get_record('spread')
+        rec_tot, pct_tot = get_record('total')
 
         st.markdown("### 📊 Performance Report")
         m1, m2, m3 = st.columns(3)
         m1.metric("🏆 Straight Up", rec_su, f"{pct_su:.1f}%")
         m2.metric("⚖️ Spread", rec_spr, f"{pct_spr:.1f}%")
         m3.metric("↕️ Total", rec_tot, f"{pct_tot:.1f}%")
+        breakdown_df = summarize(rollup, by=['market', breakdown], season=season)
+        st.dataframe(breakdown_df.round({'units': 2, 'win_pct': 1, 'roi': 1}), use_container_width=True, hide_index=True)
         st.divider()
         hist_cols = ['Date', 'Game', 'Pick (SU)', 'Res (SU)', 'Pick (Spr)', 'Res (Spr)', 'Pick (Tot)', 'Res (Tot)']
         valid_hist_cols = [c for c in hist_cols if c in display_df.columns]
-        st.dataframe(display_df[valid_hist_cols].style.map(color_result_cell, subset=[c for c in ['Res (SU)', 'Res (Spr)', 'Res (Tot)'] if c in valid_hist_cols]), use_container_width=True, hide_index=True)
+        paginate(display_df[valid_hist_cols], "page_history", color_result_cell, ['Res (SU)', 'Res (Spr)', 'Res (Tot)'])
     else:
         st.info("No graded games yet.")
 
 with t3:
-    if not graded_df.empty:
+    if not rollup.empty:
         st.markdown("### 📈 Bankroll Simulator (Spread & Total Only)")
         wager = st.number_input("Enter Bet Amount ($)", min_value=10, value=100, step=10)
         st.caption(f"Simulation: ${wager} per game. Assumes standard -110 odds for Spread and Total.")
         
-        sim_df = graded_df.sort_values(by='StartDate', ascending=True).copy()
-        
-        # PROFIT CALCULATOR (Spread & Total Only)
-        def calc_pnl(row, pick_type):
-            res_col = f"Res ({pick_type})"
-            res = row.get(res_col)
-            
-            if res == 'LOSS': return -float(wager)
-            if res == 'PUSH': return 0.0
-            if res == 'WIN': return wager * (100/110) # Standard -110 odds
-            return 0.0
-
-        sim_df['Profit_Spread'] = sim_df.apply(lambda r: calc_pnl(r, 'Spr'), axis=1)
-        sim_df['Profit_Total'] = sim_df.apply(lambda r: calc_pnl(r, 'Tot'), axis=1)
-
-        sim_df['Bankroll_Spread'] = sim_df['Profit_Spread'].cumsum()
-        sim_df['Bankroll_Total'] = sim_df['Profit_Total'].cumsum()
+        # Weekly units from the rollup, in calendar order (regular season before bowls)
+        weekly = summarize(rollup, by=['season', 'season_type', 'week', 'market'])
+        weekly['order'] = weekly['season_type'].map({'regular': 0}).fillna(1)
+        weekly = weekly.pivot_table(index=['season', 'order', 'week'], columns='market', values='units', aggfunc='sum', fill_value=0.0)
+        weekly = weekly.reindex(columns=['spread', 'total'], fill_value=0.0) * wager
+        # Labels sort in play order: "2025-03" ... "2025-15", then bowls "2025-P1"
+        sim_df = pd.DataFrame({'Week': [f"{s}-{w:02d}" if o == 0 else f"{s}-P{w}" for s, o, w in weekly.index],
+                               'Bankroll_Spread': weekly['spread'].cumsum().to_numpy(),
+                               'Bankroll_Total': weekly['total'].cumsum().to_numpy()})
         
         # Plot (Only Spread and Total)
-        st.line_chart(sim_df[['Date', 'Bankroll_Spread', 'Bankroll_Total']].set_index('Date'))
+        st.line_chart(sim_df.set_index('Week'))
         
         # Metrics (2 Columns instead of 3)
         b1, b2 = st.columns(2)
-        b1.metric("Spread Net Profit", f"${sim_df['Profit_Spread'].sum():,.2f}")
-        b2.metric("Total Net Profit", f"${sim_df['Profit_Total'].sum():,.2f}")
+        b1.metric("Spread Net Profit", f"${weekly['spread'].sum():,.2f}")
+        b2.metric("Total Net Profit", f"${weekly['total'].sum():,.2f}")
         
     else:
-        st.info("No history available.")
\ No newline at end of file
+        st.info("No history available.")
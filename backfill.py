@@ -1,9 +1,11 @@
 import os
 import pandas as pd
-import joblib
+from registry import load_model
 import time
-from api import fetch_with_retry
+from snapshot import load_season, game_records, srs_lookup, talent_lookup, first_line_lookup
 from config import HISTORY_CUTOFF, VALID_BOOKS
+import prediction_store as store
+from rollup import sync_rollup
 
 # --- CONFIG ---
 
@@ -12,43 +14,28 @@ def main():
     
     # 1. Load Models
     try:
-        model_spread = joblib.load("model_spread_tuned.pkl")
-        model_total = joblib.load("model_total.pkl")
-        feat_cols = model_spread.feature_names_in_
+        model_spread = load_model("spread")
+        model_total = load_model("total")
+        feat_cols = model_spread.features
     except:
         print("❌ Models missing. Run retrain.py first.")
         return
 
-    # 2. Fetch Games (Weeks 14, 15, 16, Postseason)
-    all_games = []
-    all_lines = []
-    
+    # 2. Load Games (Weeks 14, 15, 16, Postseason) from the season snapshot
     # December spans late regular season + postseason
-    scenarios = [
-        {"year": 2025, "seasonType": "regular", "week": 14},
-        {"year": 2025, "seasonType": "regular", "week": 15},
-        {"year": 2025, "seasonType": "regular", "week": 16},
-        {"year": 2025, "seasonType": "postseason"}
-    ]
+    scenarios = [("regular", 14), ("regular", 15), ("regular", 16)]
     
-    print("   -> Fetching historical data...")
-    for s in scenarios:
-        g = fetch_with_retry("/games", s)
-        l = fetch_with_retry("/lines", s)
-        if isinstance(g, list): all_games.extend(g)
-        if isinstance(l, list): all_lines.extend(l)
+    print("   -> Loading historical data...")
+    snap = load_season(2025)
+    all_games = [g for g in game_records(snap)
+                 if (g['season_type'], g['week']) in scenarios or g['season_type'] == "postseason"]
 
     # 3. Process Data
-    lines_map = {}
-    for g in all_lines:
-        valid = [l for l in g.get('lines', []) if l.get('provider') in VALID_BOOKS]
-        if valid: lines_map[str(g['id'])] = valid[0] # Take first valid book
+    lines_map = first_line_lookup(snap, VALID_BOOKS) # Take first valid book
 
-    # Fetch Stats (We need these to run the model)
-    srs = fetch_with_retry("/ratings/srs", {"year": 2025})
-    talent = fetch_with_retry("/talent", {"year": 2025})
-    srs_map = {x['team']: x['rating'] for x in srs} if isinstance(srs, list) else {}
-    tal_map = {x.get('school', x.get('team')): x['talent'] for x in talent} if isinstance(talent, list) else {}
+    # Stats (We need these to run the model)
+    srs_map = srs_lookup(snap)
+    tal_map = talent_lookup(snap)
 
     history_rows = []
     
@@ -65,8 +52,8 @@ def main():
         gid = str(g['id'])
         home = g.get('home_team') or g.get('homeTeam')
         away = g.get('away_team') or g.get('awayTeam')
-        h_score = g.get('home_points') or g.get('homePoints')
-        a_score = g.get('away_points') or g.get('awayPoints')
+        h_score = g['home_points']
+        a_score = g['away_points']
         
         # Get Line
         line_data = lines_map.get(gid)
@@ -115,26 +102,17 @@ def main():
             "Manual_HomeScore": h_score, "Manual_AwayScore": a_score # This triggers the "History" tab
         })
 
-    # 4. Merge with Existing Future Predictions
+    # 4. Upsert into the prediction store (upcoming picks are left alone)
     print(f"   -> Found {len(history_rows)} completed games.")
-    
-    try:
-        existing = pd.read_csv("live_predictions.csv")
-        # Keep only UPCOMING games from the existing file (where score is empty)
-        if 'Manual_HomeScore' in existing.columns:
-            future = existing[existing['Manual_HomeScore'].isna()]
-        else:
-            future = existing
-    except:
-        future = pd.DataFrame()
-        
-    # Combine
     hist_df = pd.DataFrame(history_rows)
-    final_df = pd.concat([future, hist_df], ignore_index=True)
-    
-    # Save
-    final_df.to_csv("live_predictions.csv", index=False)
-    print(f"✅ SUCCESS: Database now has {len(hist_df)} history games and {len(future)} upcoming games.")
+    conn = store.connect()
+    written = store.upsert_predictions(conn, hist_df)
+    upcoming = len(store.game_ids(conn, graded=False))
+    store.export_csv(conn)
+    rollup, added = sync_rollup(conn, {2025: snap})
+    conn.close()
+    print(f"   -> Rollup: +{added} graded games ({len(rollup)} rows)")
+    print(f"✅ SUCCESS: Database now has {len(hist_df)} history games ({written} written) and {upcoming} upcoming games.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,15 +1,11 @@
-import os
 import pandas as pd
-import requests
-import time
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from dotenv import load_dotenv
+from api import fetch_many
+from strategy import bet_mask, side_outcome, simulate
+from snapshot import load_seasons, game_records, srs_lookup, talent_lookup, first_line_lookup
 
 # --- CONFIG ---
-load_dotenv()
-API_KEY = os.getenv("CFBD_API_KEY")
-HEADERS = {"Authorization": f"Bearer {API_KEY}", "Accept": "application/json"}
 VALID_BOOKS = ['DraftKings', 'FanDuel', 'BetMGM', 'Caesars', 'PointsBet', 'BetRivers', 'Unibet']
 
 # V2 FEATURES (EPA Enriched)
@@ -22,33 +18,26 @@ FEATURES = [
     'home_success_rate', 'away_success_rate'
 ]
 
-def fetch_with_retry(endpoint, params):
-    url = f"https://api.collegefootballdata.com{endpoint}"
-    for attempt in range(1, 4):
-        try:
-            res = requests.get(url, headers=HEADERS, params=params)
-            if res.status_code == 200: return res.json()
-            elif res.status_code == 429: time.sleep(10 * attempt)
-        except: time.sleep(5)
-    return []
-
 def main():
     print("--- 💰 RUNNING V2 PROFIT SIMULATION (EPA MODEL) 💰 ---")
     
     # 1. Fetch Data
     print("   -> Fetching full season data with Advanced Stats...")
     all_games = []
+    years = [2024, 2025]
+    
+    # Games/lines/SRS/talent come from season snapshots; advanced stats are
+    # not part of the snapshot, so fetch them in one concurrent batch
+    snaps = load_seasons(years)
+    advanced = fetch_many([("/stats/season/advanced", {"year": year, "excludeGarbageTime": "true"}) for year in years])
     
-    for year in [2024, 2025]:
-        games = fetch_with_retry("/games", {"year": year, "seasonType": "both"})
-        lines = fetch_with_retry("/lines", {"year": year, "seasonType": "both"})
-        srs = fetch_with_retry("/ratings/srs", {"year": year})
-        talent = fetch_with_retry("/talent", {"year": year})
-        adv = fetch_with_retry("/stats/season/advanced", {"year": year, "excludeGarbageTime": "true"})
+    for year, adv in zip(years, advanced):
+        snap = snaps[year]
+        games = game_records(snap)
         
         # Build Maps
-        srs_map = {x['team']: x['rating'] for x in srs} if isinstance(srs, list) else {}
-        tal_map = {x.get('school', x.get('team')): x['talent'] for x in talent} if isinstance(talent, list) else {}
+        srs_map = srs_lookup(snap)
+        tal_map = talent_lookup(snap)
         
         adv_map = {}
         if isinstance(adv, list):
@@ -59,11 +48,7 @@ def main():
                     'success_rate': t['offense']['successRate']
                 }
 
-        line_map = {}
-        if isinstance(lines, list):
-            for g in lines:
-                valid = [l for l in g.get('lines', []) if l.get('provider') in VALID_BOOKS]
-                if valid: line_map[str(g['id'])] = valid[0]
+        line_map = first_line_lookup(snap, VALID_BOOKS)
 
         if isinstance(games, list):
             for g in games:
@@ -72,8 +57,8 @@ def main():
                 gid = str(g['id'])
                 home = g.get('home_team') or g.get('homeTeam')
                 away = g.get('away_team') or g.get('awayTeam')
-                h_pts = g.get('home_points') or g.get('homePoints')
-                a_pts = g.get('away_points') or g.get('awayPoints')
+                h_pts = g['home_points']
+                a_pts = g['away_points']
                 start_date = g.get('start_date') or g.get('startDate')
 
                 if not home or not away or h_pts is None: continue
@@ -121,42 +106,22 @@ def main():
 
     # 3. RUN SIMULATION
     print("\n--- 📊 PERFORMANCE REPORT (V2) ---")
-    bets = 0
-    wins = 0
-    losses = 0
-    bankroll = 0.0
-    
-    for _, row in test_df.iterrows():
-        # Predict
-        input_row = pd.DataFrame([row])[FEATURES]
-        prob = model.predict_proba(input_row)[0][1]
-        conf = max(prob, 1-prob)
-        
-        # Strategy: Bet if Conf > 55%
-        if conf > 0.55:
-            bets += 1
-            
-            # Did Home Cover?
-            home_covered = (row['Manual_HomeScore'] + row['spread']) > row['Manual_AwayScore']
-            
-            # Our Pick
-            pick_home = (prob > 0.5)
-            
-            if pick_home == home_covered:
-                wins += 1
-                bankroll += 90.91 # Win $90.91 on $100 bet (-110 odds)
-            else:
-                losses += 1
-                bankroll -= 100.00 # Lose $100
+    # Strategy: Bet if Conf > 55%, pick side = home if prob > 0.5, flat $100 at -110
+    prob = model.predict_proba(test_df[FEATURES])[:, 1]
+    home_covered = ((test_df['Manual_HomeScore'] + test_df['spread']) > test_df['Manual_AwayScore']).astype(int)
+    sim = simulate(bet_mask(prob, 0.55), side_outcome(prob, home_covered))
 
+    bets, wins, losses = int(sim['bets']), int(sim['wins']), int(sim['losses'])
+    bankroll = float(sim['profit'])
     win_rate = (wins/bets*100) if bets > 0 else 0.0
-    roi = (bankroll / (bets * 100) * 100) if bets > 0 else 0.0
+    roi = float(sim['roi'])
 
     print(f"Total Bets Placed: {bets}")
     print(f"Wins: {wins} | Losses: {losses}")
     print(f"Win Rate: {win_rate:.1f}% (V1 Benchmark: 56.9%)")
     print(f"Net Profit: ${bankroll:.2f}")
     print(f"ROI: {roi:.1f}%")
+    print(f"Max Drawdown: ${float(sim['max_drawdown']):.2f}")
     
     if win_rate > 56.9:
         print("\n✅ RESULT: V2 IS BETTER! KEEP THE UPGRADE.")
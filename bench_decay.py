@@ -0,0 +1,72 @@
+import time
+import numpy as np
+import pandas as pd
+from decay import decay_bank
+from features import DECAY_METRICS
+
+SEASONS = 20
+TEAMS = 130
+GAMES = 13
+SPANS = (3, 5, 10)
+WINDOWS = (3, 5)
+
+def make_history():
+    rng = np.random.default_rng(42)
+    n = SEASONS * TEAMS * GAMES
+    df = pd.DataFrame({
+        'team': np.repeat([f"Team {t:03d}" for t in range(TEAMS)], SEASONS * GAMES),
+        'season': np.tile(np.repeat(np.arange(2006, 2006 + SEASONS), GAMES), TEAMS),
+        'week': np.tile(np.arange(1, GAMES + 1), SEASONS * TEAMS),
+    })
+    for m in DECAY_METRICS:
+        df[m] = rng.normal(0.1, 0.2, n)
+    return df.sample(frac=1.0, random_state=1).reset_index(drop=True)
+
+def legacy_decay(df_stats):
+    # The original per-group lambda implementation (span=3 only)
+    df_stats = df_stats.sort_values(by=['team', 'season', 'week'])
+    for metric in DECAY_METRICS:
+        df_stats[f"decay_{metric}"] = df_stats.groupby(['team', 'season'])[metric].transform(
+            lambda x: x.ewm(span=3, adjust=False).mean().shift(1)
+        )
+    return df_stats
+
+def pandas_bank(df_stats):
+    # The same feature bank built the groupby/transform way
+    df_stats = df_stats.sort_values(by=['team', 'season', 'week'])
+    g = df_stats.groupby(['team', 'season'])
+    for metric in DECAY_METRICS:
+        for span in SPANS:
+            df_stats[f"ewm{span}_{metric}"] = g[metric].transform(lambda x: x.ewm(span=span, adjust=False).mean().shift(1))
+        for w in WINDOWS:
+            df_stats[f"roll{w}_{metric}"] = g[metric].transform(lambda x: x.rolling(w, min_periods=1).mean().shift(1))
+        df_stats[f"season_{metric}"] = g[metric].transform(lambda x: x.expanding().mean().shift(1))
+    return df_stats
+
+def timed(label, fn, df, rows, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df.copy())
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<38} | {best * 1000:9.1f} ms | {rows / best:12,.0f} rows/s")
+    return best
+
+def main():
+    df = make_history()
+    n_feats = len(DECAY_METRICS) * (len(SPANS) + len(WINDOWS) + 1)
+    print("--- ⏱️ DECAY FEATURE BENCHMARK ---")
+    print(f"{SEASONS} seasons x {TEAMS} teams x {GAMES} games = {len(df):,} team-games, {len(DECAY_METRICS)} metrics")
+    print("-" * 72)
+
+    legacy = timed("Legacy lambda (span=3 only)", legacy_decay, df, len(df))
+    vec = timed("Vectorized (span=3 only)", lambda d: decay_bank(d, DECAY_METRICS, spans=(3,)), df, len(df))
+    full_pd = timed(f"Pandas groupby bank ({n_feats} features)", pandas_bank, df, len(df), repeat=1)
+    full_vec = timed(f"Vectorized bank ({n_feats} features)",
+                     lambda d: decay_bank(d, DECAY_METRICS, spans=SPANS, windows=WINDOWS, season_to_date=True), df, len(df))
+
+    print("-" * 72)
+    print(f"Speedup (span=3): {legacy / vec:.1f}x | Speedup (full bank): {full_pd / full_vec:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import time
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from forest import export_forest, PackedForest
+
+FEATURES = 18
+TRAIN_GAMES = 3000
+FORESTS = [(100, 5), (200, 5), (200, 10)]  # (trees, max_depth) as trained in model.py/retrain.py/tuner.py
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    rng = np.random.default_rng(42)
+    cols = [f"f{i}" for i in range(FEATURES)]
+    X = pd.DataFrame(rng.normal(size=(TRAIN_GAMES, FEATURES)), columns=cols)
+    y = (X['f0'] + rng.normal(size=TRAIN_GAMES) > 0).astype(int)
+    slate = pd.DataFrame(rng.normal(size=(1000, FEATURES)), columns=cols)
+
+    print("--- ⏱️ FOREST INFERENCE BENCHMARK ---")
+    print(f"{'FOREST':<20} | {'GAMES':>5} | {'SKLEARN':>10} | {'PACKED':>10} | {'SPEEDUP':>7}")
+    print("-" * 66)
+    for trees, depth in FORESTS:
+        model = RandomForestClassifier(n_estimators=trees, max_depth=depth, random_state=42).fit(X, y)
+        packed = PackedForest(export_forest(model))
+        diff = np.abs(packed.predict_proba(slate) - model.predict_proba(slate)).max()
+        for n in [1, 1000]:
+            games = slate.iloc[:n]
+            sk = timed(lambda: model.predict_proba(games), 5)
+            pk = timed(lambda: packed.predict_proba(games), 50)
+            label = f"{trees} trees, depth {depth}"
+            print(f"{label:<20} | {n:>5} | {sk * 1000:8.2f}ms | {pk * 1000:8.3f}ms | {sk / pk:6.1f}x")
+        print(f"{'':<20} | max |p_sklearn - p_packed| = {diff:.1e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import json
+import gzip
+import time
+
+# Record/replay store for raw CFBD responses.
+# Each request is saved as one gzipped JSON file named after its cache key,
+# so a recorded run can be replayed later with no network or API key.
+CASSETTE_DIR = os.getenv("CFBD_CASSETTE_DIR", "cassettes")
+# Optional artificial latency (seconds) added to every replayed response
+REPLAY_LATENCY = float(os.getenv("CFBD_REPLAY_LATENCY", "0"))
+
+STATS = {"recorded": 0, "replayed": 0, "missing": 0}
+
+
+class CassetteMiss(LookupError):
+    """A replayed request that was never recorded."""
+    def __init__(self, key, endpoint):
+        self.key = key
+        self.endpoint = endpoint
+        super().__init__(f"No recording for {endpoint} (key {key}). Record it with --record first.")
+
+
+class ReplayResponse:
+    """Minimal stand-in for requests.Response built from a recorded entry."""
+    def __init__(self, status_code, body, headers=None):
+        self.status_code = status_code
+        self.text = body
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"Replay returned HTTP {self.status_code}")
+
+
+def _path(key):
+    return os.path.join(CASSETTE_DIR, f"{key}.json.gz")
+
+
+def record(key, endpoint, params, response):
+    """Store the raw body of a successful live response."""
+    if response.status_code != 200:
+        return
+    entry = {
+        "endpoint": endpoint,
+        "params": params,
+        "status": response.status_code,
+        "recorded_at": time.time(),
+        "body": response.text,
+    }
+    os.makedirs(CASSETTE_DIR, exist_ok=True)
+    tmp_path = f"{_path(key)}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, _path(key))
+    STATS["recorded"] += 1
+
+
+def replay(key, endpoint):
+    """
+    Serve a recorded response. A request that was never recorded raises
+    CassetteMiss right away; retrying it could never succeed.
+    """
+    if REPLAY_LATENCY > 0:
+        time.sleep(REPLAY_LATENCY)
+    try:
+        with gzip.open(_path(key), "rt", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        STATS["missing"] += 1
+        raise CassetteMiss(key, endpoint)
+    STATS["replayed"] += 1
+    return ReplayResponse(entry.get("status", 200), entry["body"])
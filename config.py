@@ -1,14 +1,13 @@
 import os
+from datetime import date
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Checked lazily in api.py so replay mode can run without a key
 API_KEY = os.getenv("CFBD_API_KEY")
 
-if not API_KEY:
-    raise ValueError("API Key not found! Check your .env file.")
-
 HEADERS = {
     "Authorization": f"Bearer {API_KEY}",
     "Accept": "application/json"
@@ -17,4 +16,9 @@ HEADERS = {
 # Constants
 VALID_BOOKS = ['DraftKings', 'FanDuel', 'BetMGM', 'Caesars', 'PointsBet', 'BetRivers', 'Unibet', 'Bovada', 'ESPN Bet']
 HISTORY_FILE = "live_predictions.csv"
+PREDICTIONS_DB = os.getenv("CFB_PREDICTIONS_DB", "predictions.db")
+ROLLUP_FILE = os.getenv("CFB_ROLLUP_FILE", "performance_rollup.json")
 HISTORY_CUTOFF = "2025-12-01"
+
+# CFB seasons start in August; January bowls belong to the previous year's season.
+CURRENT_SEASON = date.today().year if date.today().month >= 8 else date.today().year - 1
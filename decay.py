@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# Vectorized decay feature bank.
+# Every feature is "as of kickoff": it only uses the team's earlier games in
+# the same season (the equivalent of .shift(1) inside each team-season group).
+KEYS = ['team', 'season']
+
+
+def _layout(df):
+    """Group boundaries of a frame already sorted by team, season, week."""
+    codes = pd.MultiIndex.from_frame(df[KEYS]).codes
+    new_group = np.ones(len(df), dtype=bool)
+    if len(df) > 1:
+        new_group[1:] = (codes[0][1:] != codes[0][:-1]) | (codes[1][1:] != codes[1][:-1])
+    starts = np.flatnonzero(new_group)
+    lengths = np.diff(np.append(starts, len(df)))
+    pos = np.arange(len(df)) - np.repeat(starts, lengths)
+    return starts, lengths, pos
+
+
+def ewm_shifted(X, starts, lengths, span):
+    """
+    Per-group `ewm(span, adjust=False).mean().shift(1)` for every column of X.
+    Steps through game k of all groups at once, so the Python loop runs once
+    per game-of-season (~15), not once per group.
+    """
+    a = 2.0 / (span + 1.0)
+    out = np.full(X.shape, np.nan)
+    state = X[starts].copy()
+    for k in range(1, lengths.max() if len(lengths) else 0):
+        active = lengths > k
+        rows = starts[active] + k
+        out[rows] = state[active]
+        # Same arithmetic as pandas' adjust=False recursion
+        state[active] = ((1 - a) * state[active] + a * X[rows]) / ((1 - a) + a)
+    return out
+
+
+def rolling_shifted(X, pos, window):
+    """Per-group mean of the previous `window` games (partial windows allowed)."""
+    before = np.cumsum(X, axis=0) - X
+    n_prev = np.minimum(pos, window)
+    idx = np.arange(len(X))
+    total = before - before[idx - n_prev]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = total / n_prev[:, None]
+    out[pos == 0] = np.nan
+    return out
+
+
+def season_to_date_shifted(X, starts, lengths, pos):
+    """Per-group mean of all previous games this season."""
+    before = np.cumsum(X, axis=0) - X
+    total = before - before[np.repeat(starts, lengths)]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out = total / pos[:, None]
+    out[pos == 0] = np.nan
+    return out
+
+
+def decay_bank(df_stats, metrics, spans=(3,), windows=(), season_to_date=False):
+    """
+    Compute a bank of decay features for every metric in one pass.
+    Columns: decay_{m} for the first span (the original feature),
+    decay_ewm{s}_{m} for other spans, decay_roll{w}_{m} and decay_season_{m}.
+    Returns df_stats sorted by team, season, week with the new columns added.
+    """
+    df = df_stats.sort_values(by=KEYS + ['week'], kind='mergesort').reset_index(drop=True)
+    for m in metrics:
+        df[m] = df[m].fillna(0.0) if m in df.columns else 0.0
+    if df.empty:
+        return df
+
+    X = df[metrics].to_numpy(dtype=float)
+    starts, lengths, pos = _layout(df)
+
+    blocks = {}
+    for span in spans:
+        prefix = "decay_" if span == spans[0] else f"decay_ewm{span}_"
+        blocks[prefix] = ewm_shifted(X, starts, lengths, span)
+    for w in windows:
+        blocks[f"decay_roll{w}_"] = rolling_shifted(X, pos, w)
+    if season_to_date:
+        blocks["decay_season_"] = season_to_date_shifted(X, starts, lengths, pos)
+
+    new_cols = {}
+    for prefix, values in blocks.items():
+        for j, m in enumerate(metrics):
+            new_cols[f"{prefix}{m}"] = values[:, j]
+    return pd.concat([df, pd.DataFrame(new_cols, index=df.index)], axis=1)
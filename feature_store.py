@@ -0,0 +1,198 @@
+import os
+import numpy as np
+import pandas as pd
+from storage import read_table, write_table
+from decay import decay_bank
+
+# Incremental store for the decay features.
+# Keeps, per (team, season), everything the next game's features depend on:
+# the latest (unshifted) EWMA for every span, the last few raw values for the
+# rolling means and the running sum for the season-to-date mean. A nightly
+# run only folds in the new weeks instead of recomputing history.
+STORE_DIR = os.getenv("CFB_FEATURE_STORE", "feature_store")
+KEYS = ['team', 'season']
+
+
+class DecayFeatureStore:
+    """
+    Matches `groupby(['team','season'])[m].transform(lambda x: x.ewm(span, adjust=False).mean().shift(1))`:
+    the feature for a game is the EWMA of that team's previous games that season.
+    With `spans` / `windows` / `season_to_date` it keeps the same bank of
+    columns as decay.decay_bank, both from rebuild() and update().
+    """
+    def __init__(self, metrics, span=3, path=STORE_DIR, spans=(), windows=(), season_to_date=False):
+        self.metrics = list(metrics)
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.path = path
+        self.bank = {'spans': (span,) + tuple(s for s in spans if s != span), 'windows': tuple(windows),
+                     'season_to_date': season_to_date}
+        self.depth = max(self.bank['windows'], default=0)
+        self.decay_cols = [f"decay_{m}" for m in self.metrics]
+        self.bank_cols = [f"{prefix}{m}" for prefix in self._prefixes() for m in self.metrics]
+        # State: base EWMA under the metric names, then the extra spans, lags and sums
+        self.state_cols = (self.metrics
+                           + [f"ewm{s}_{m}" for s in self.bank['spans'][1:] for m in self.metrics]
+                           + [f"lag{i}_{m}" for i in range(1, self.depth + 1) for m in self.metrics]
+                           + ([f"sum_{m}" for m in self.metrics] if season_to_date else [])
+                           + ['n_games'])
+        self.state = pd.DataFrame(columns=KEYS + ['last_week'] + self.state_cols)
+        self.features = pd.DataFrame(columns=KEYS + ['week'] + self.bank_cols)
+
+    def _prefixes(self):
+        return (["decay_"] + [f"decay_ewm{s}_" for s in self.bank['spans'][1:]]
+                + [f"decay_roll{w}_" for w in self.bank['windows']]
+                + (["decay_season_"] if self.bank['season_to_date'] else []))
+
+    # --- PERSISTENCE ---
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def load(self):
+        try:
+            state = read_table(self._file("decay_state"))
+            features = read_table(self._file("decay_features"))
+        except FileNotFoundError:
+            return self
+        # A store saved with a smaller bank is treated as empty, so every season is rebuilt
+        if set(self.bank_cols) <= set(features.columns) and set(self.state_cols) <= set(state.columns):
+            self.state, self.features = state, features
+        return self
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        meta = {'metrics': self.metrics, 'decay': self.bank_cols}
+        write_table(self.state, self._file("decay_state"), groups=meta)
+        write_table(self.features, self._file("decay_features"), groups=meta)
+
+    def seasons(self):
+        return set(self.state['season'].astype(int)) if not self.state.empty else set()
+
+    # --- FULL BUILD ---
+    def rebuild(self, df_stats):
+        """
+        Recompute every season in df_stats from scratch with the vectorized
+        decay bank, replacing those seasons' features and state.
+        Returns the rebuilt feature rows.
+        """
+        bank = decay_bank(df_stats[KEYS + ['week'] + [m for m in self.metrics if m in df_stats]],
+                          self.metrics, **self.bank)
+        if bank.empty:
+            return bank.reindex(columns=KEYS + ['week'] + self.bank_cols)
+        bank['season'] = bank['season'].astype(int)
+        bank['week'] = bank['week'].astype(int)
+        seasons = set(bank['season'])
+
+        # State after each team's last game, ready for update()
+        groups = bank.groupby(KEYS, sort=False)
+        last = groups.tail(1)
+        idx = pd.MultiIndex.from_frame(last[KEYS])
+        x = last[self.metrics].to_numpy(dtype=float)
+        cols = {'last_week': last['week'].to_numpy()}
+        for s in self.bank['spans']:
+            prefix = "decay_" if s == self.span else f"decay_ewm{s}_"
+            stepped = self._step(last[[f"{prefix}{m}" for m in self.metrics]].to_numpy(dtype=float), x, s)
+            names = self.metrics if s == self.span else [f"ewm{s}_{m}" for m in self.metrics]
+            cols.update(dict(zip(names, stepped.T)))
+        for i in range(1, self.depth + 1):
+            lag = groups[self.metrics].nth(-i)
+            lag = lag.set_index(pd.MultiIndex.from_frame(bank.loc[lag.index, KEYS]))[self.metrics].reindex(idx)
+            cols.update({f"lag{i}_{m}": lag[m].to_numpy(dtype=float) for m in self.metrics})
+        if self.bank['season_to_date']:
+            sums = groups[self.metrics].sum().reindex(idx)
+            cols.update({f"sum_{m}": sums[m].to_numpy(dtype=float) for m in self.metrics})
+        cols['n_games'] = groups.size().reindex(idx).to_numpy()
+        state = pd.concat([last[KEYS].reset_index(drop=True), pd.DataFrame(cols)], axis=1)
+
+        rebuilt = bank[KEYS + ['week'] + self.bank_cols]
+        keep_state = self.state[~self.state['season'].astype(int).isin(seasons)] if not self.state.empty else self.state
+        keep_feats = self.features[~self.features['season'].astype(int).isin(seasons)] if not self.features.empty else self.features
+        self.state = pd.concat([t for t in (keep_state, state) if not t.empty], ignore_index=True)
+        self.features = pd.concat([t for t in (keep_feats, rebuilt) if not t.empty], ignore_index=True)
+        return rebuilt
+
+    # --- UPDATE ---
+    def _step(self, prev, x, span=None):
+        # Same arithmetic as pandas' adjust=False recursion, so results are bit-identical
+        a = self.alpha if span is None else 2.0 / (span + 1.0)
+        return np.where(np.isnan(prev), x, ((1 - a) * prev + a * x) / ((1 - a) + a))
+
+    def _features(self, st):
+        """Feature columns for the next game from state arrays {state column: values}."""
+        m = self.metrics
+        n = st['n_games'][:, None]
+        out = {"decay_": np.column_stack([st[c] for c in m])}
+        for s in self.bank['spans'][1:]:
+            out[f"decay_ewm{s}_"] = np.column_stack([st[f"ewm{s}_{c}"] for c in m])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for w in self.bank['windows']:
+                lags = np.stack([np.column_stack([st[f"lag{i}_{c}"] for c in m]) for i in range(1, w + 1)])
+                out[f"decay_roll{w}_"] = np.nansum(lags, axis=0) / np.minimum(n, w)
+            if self.bank['season_to_date']:
+                out["decay_season_"] = np.column_stack([st[f"sum_{c}"] for c in m]) / n
+        for prefix in out:
+            if prefix != "decay_":
+                out[prefix] = np.where(n > 0, out[prefix], np.nan)
+        return out
+
+    def _advance(self, st, x):
+        """State arrays after one more game with metric values x."""
+        m = self.metrics
+        new = dict(st)
+        stepped = self._step(np.column_stack([st[c] for c in m]), x)
+        new.update({c: stepped[:, j] for j, c in enumerate(m)})
+        for s in self.bank['spans'][1:]:
+            stepped = self._step(np.column_stack([st[f"ewm{s}_{c}"] for c in m]), x, s)
+            new.update({f"ewm{s}_{c}": stepped[:, j] for j, c in enumerate(m)})
+        for i in range(self.depth, 1, -1):
+            new.update({f"lag{i}_{c}": st[f"lag{i - 1}_{c}"] for c in m})
+        if self.depth:
+            new.update({f"lag1_{c}": x[:, j] for j, c in enumerate(m)})
+        if self.bank['season_to_date']:
+            new.update({f"sum_{c}": st[f"sum_{c}"] + x[:, j] for j, c in enumerate(m)})
+        new['n_games'] = st['n_games'] + 1
+        return new
+
+    def update(self, df_stats):
+        """
+        Fold new team-game rows into the store. Rows at or before a team's
+        last processed week are skipped. Returns the newly added feature rows
+        (every bank column, same values as a rebuild of the season).
+        """
+        new = df_stats[KEYS + ['week'] + self.metrics].copy()
+        new[self.metrics] = new[self.metrics].fillna(0.0)
+        new['season'] = new['season'].astype(int)
+        new['week'] = new['week'].astype(int)
+
+        state = self.state.set_index(KEYS) if not self.state.empty else \
+            pd.DataFrame(columns=['last_week'] + self.state_cols, index=pd.MultiIndex.from_tuples([], names=KEYS))
+        last_week = state['last_week'].reindex(pd.MultiIndex.from_frame(new[KEYS])).to_numpy(dtype=float)
+        new = new[~(new['week'].to_numpy() <= last_week)]
+        if new.empty:
+            return new.reindex(columns=KEYS + ['week'] + self.bank_cols)
+
+        new = new.sort_values(KEYS + ['week']).reset_index(drop=True)
+        new['_k'] = new.groupby(KEYS).cumcount()
+        feats = {prefix: np.full((len(new), len(self.metrics)), np.nan) for prefix in self._prefixes()}
+        # Teams new to the store start from nothing: no games, no sums
+        empty = {c: (0.0 if c == 'n_games' or c.startswith('sum_') else np.nan) for c in self.state_cols}
+
+        # Walk forward one game at a time per team; usually a single step.
+        for k in range(new['_k'].max() + 1):
+            rows = np.flatnonzero(new['_k'].to_numpy() == k)
+            sub = new.iloc[rows]
+            idx = pd.MultiIndex.from_frame(sub[KEYS])
+            prev = state[self.state_cols].reindex(idx).astype(float).fillna(empty)
+            st = {c: prev[c].to_numpy(dtype=float) for c in self.state_cols}
+            for prefix, values in self._features(st).items():
+                feats[prefix][rows] = values
+            updated = pd.DataFrame(self._advance(st, sub[self.metrics].to_numpy(dtype=float)), index=idx)
+            updated['last_week'] = sub['week'].to_numpy()
+            kept = state.drop(idx, errors='ignore')
+            state = pd.concat([kept, updated]) if not kept.empty else updated
+
+        self.state = state.reset_index()[KEYS + ['last_week'] + self.state_cols]
+        added = new[KEYS + ['week']].copy()
+        added[self.bank_cols] = np.column_stack([feats[prefix] for prefix in self._prefixes()])
+        self.features = pd.concat([self.features, added], ignore_index=True) if not self.features.empty else added
+        return added
@@ -1,50 +1,45 @@
 import pandas as pd
-import numpy as np
 from api import get_data
+from storage import read_table, write_table
+from feature_store import DecayFeatureStore
+from config import CURRENT_SEASON
+from decay import decay_bank
+
+# REQUIRED METRICS (We force these to exist)
+DECAY_METRICS = [
+    'offense.ppa', 'defense.ppa',
+    'offense.rushing.ppa', 'defense.rushing.ppa',
+    'offense.rushing.successRate', 'defense.rushing.successRate',
+    'offense.passing.ppa', 'defense.passing.ppa',
+    'offense.passing.successRate', 'defense.passing.successRate'
+]
+DECAY_SPAN = 3
+# Extra bank columns: slower EWMAs, short rolling means and season-to-date means
+DECAY_BANK = {'spans': (DECAY_SPAN, 5, 10), 'windows': (3, 5), 'season_to_date': True}
 
 def calculate_weighted_decay(df_stats):
-    df_stats = df_stats.sort_values(by=['team', 'season', 'week'])
-    
-    # REQUIRED METRICS (We force these to exist)
-    metrics = [
-        'offense.ppa', 'defense.ppa',
-        'offense.rushing.ppa', 'defense.rushing.ppa',
-        'offense.rushing.successRate', 'defense.rushing.successRate',
-        'offense.passing.ppa', 'defense.passing.ppa',
-        'offense.passing.successRate', 'defense.passing.successRate'
-    ]
-    
-    # 1. Force columns to exist (Fill missing with 0.0)
-    for m in metrics:
-        if m not in df_stats.columns:
-            df_stats[m] = 0.0
-        else:
-            df_stats[m] = df_stats[m].fillna(0.0)
-            
-    # 2. Calculate Decay
-    for metric in metrics:
-        col_name = f"decay_{metric}"
-        df_stats[col_name] = df_stats.groupby(['team', 'season'])[metric].transform(
-            lambda x: x.ewm(span=3, adjust=False).mean().shift(1)
-        )
-    
-    return df_stats
+    # One vectorized pass over the sorted team-week array (see decay.py)
+    return decay_bank(df_stats, DECAY_METRICS, **DECAY_BANK)
 
 def main():
     print("--- 🚀 BUILDING GRANULAR DECAY FEATURES (ROBUST) 🚀 ---")
     
     try:
-        df_master = pd.read_csv("cfb_training_data_ultimate.csv")
+        df_master = read_table("cfb_training_data_ultimate")
         print(f"Loaded {len(df_master)} games from Ultimate dataset.")
     except FileNotFoundError:
-        print("Error: cfb_training_data_ultimate.csv not found.")
+        print("Error: cfb_training_data_ultimate not found.")
         return
 
-    print("Fetching game-level stats...")
-    years = df_master['season'].unique()
+    # Seasons already in the feature store are final unless still in progress
+    store = DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, **DECAY_BANK).load()
+    years = [int(y) for y in df_master['season'].unique()]
+    to_fetch = [y for y in years if y not in store.seasons() or y >= CURRENT_SEASON]
+    
+    print(f"Fetching game-level stats for {to_fetch or 'no'} seasons...")
     all_game_stats = []
 
-    for year in years:
+    for year in to_fetch:
         stats = get_data("/stats/game/advanced", {"year": year})
         if stats:
             df = pd.json_normalize(stats)
@@ -52,16 +47,29 @@ def main():
             df['season'] = year
             all_game_stats.append(df)
 
-    if not all_game_stats: return
+    if all_game_stats:
+        df_stats_raw = pd.concat(all_game_stats, ignore_index=True)
+        for m in DECAY_METRICS:
+            if m not in df_stats_raw.columns:
+                df_stats_raw[m] = 0.0
+        
+        # Seasons new to the store (or saved with a smaller bank) are built in one
+        # vectorized pass; the in-progress season only folds in its new weeks
+        stored = store.seasons()
+        is_new = ~df_stats_raw['season'].isin(stored)
+        if is_new.any():
+            print("Building the decay bank for new seasons...")
+            rebuilt = store.rebuild(df_stats_raw[is_new])
+            print(f"   -> Rebuilt {len(rebuilt)} team-weeks.")
+        added = store.update(df_stats_raw[~is_new])
+        print(f"   -> Added {len(added)} new team-weeks to stored seasons.")
+        store.save()
+        print(f"   -> {len(store.features)} team-weeks x {len(store.bank_cols)} decay features in the feature store.")
 
-    df_stats_raw = pd.concat(all_game_stats, ignore_index=True)
-    
-    print("Applying EWMA to Rushing/Passing splits...")
-    df_decay = calculate_weighted_decay(df_stats_raw)
+    if store.features.empty: return
     
-    # Keep only the new decay columns
-    cols_to_keep = ['team', 'season', 'week'] + [c for c in df_decay.columns if 'decay_' in c]
-    df_features = df_decay[cols_to_keep].copy()
+    # Keep only the decay columns
+    df_features = store.features[['team', 'season', 'week'] + store.bank_cols].copy()
 
     print("Merging granular features...")
     
@@ -83,8 +91,9 @@ def main():
     decay_cols = [c for c in df_master.columns if 'decay_' in c]
     df_master[decay_cols] = df_master[decay_cols].fillna(0.0)
     
-    output_filename = "cfb_training_data_granular.csv"
-    df_master.to_csv(output_filename, index=False)
+    output_filename = write_table(df_master, "cfb_training_data_granular",
+                                  groups={'decay': decay_cols},
+                                  parent="cfb_training_data_ultimate")
     print(f"\nSUCCESS: Saved GRANULAR dataset to {output_filename}")
     
     # DEBUG CHECK
@@ -0,0 +1,90 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Packed random-forest evaluator.
+# A fitted sklearn forest is flattened into a handful of flat numpy arrays
+# (all trees' nodes back to back) and scored with a vectorized walk that moves
+# every (game, tree) pair down one level per step, so a call costs ~max_depth
+# numpy operations regardless of the number of trees.
+ARRAYS = ['feature', 'threshold', 'children', 'value', 'roots', 'classes']
+
+
+def export_forest(model):
+    """Flatten a fitted RandomForestClassifier into packed arrays."""
+    trees = [est.tree_ for est in model.estimators_]
+    sizes = np.array([t.node_count for t in trees])
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    children, value = [], []
+    for t, off in zip(trees, offsets):
+        leaf = t.children_left == -1
+        # Leaves point at themselves, so extra steps leave them in place
+        own = np.arange(t.node_count) + off
+        left = np.where(leaf, own, t.children_left + off)
+        right = np.where(leaf, own, t.children_right + off)
+        children.append(np.stack([left, right], axis=1))
+        v = t.value[:, 0, :]
+        value.append(v / v.sum(axis=1, keepdims=True))
+
+    return {
+        'feature': np.concatenate([np.maximum(t.feature, 0) for t in trees]).astype(np.intp),
+        'threshold': np.concatenate([t.threshold for t in trees]),
+        # Row i = (left, right) child of node i, flattened: child = children[2*i + went_right]
+        'children': np.concatenate(children).astype(np.intp).ravel(),
+        # Class-major (n_classes, n_nodes): one cheap 1-D gather per class
+        'value': np.ascontiguousarray(np.concatenate(value).T),
+        'roots': offsets.astype(np.intp),
+        'classes': np.asarray(model.classes_),
+        'depth': int(max(t.max_depth for t in trees)),
+        'features': list(getattr(model, 'feature_names_in_', [])),
+    }
+
+
+class PackedForest:
+    """predict_proba over packed arrays; matches sklearn within float tolerance."""
+    def __init__(self, packed):
+        for k in ARRAYS:
+            setattr(self, k, packed[k])
+        self.depth = int(packed['depth'])
+        self.features = list(packed.get('features', []))
+        self.classes_ = self.classes
+
+    def predict_proba(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X[self.features] if self.features else X
+            X = X.to_numpy()
+        # Same input cast as sklearn's trees (float32 values vs float64 thresholds)
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        # Flat gathers (np.take) are much cheaper than 2-D fancy indexing
+        flat = X.ravel()
+        base = (np.arange(len(X), dtype=np.intp) * X.shape[1])[:, None]
+        node = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.depth):
+            go_right = np.take(flat, base + np.take(self.feature, node)) > np.take(self.threshold, node)
+            node = np.take(self.children, 2 * node + go_right)
+        return np.stack([np.take(v, node).mean(axis=1) for v in self.value], axis=1)
+
+    def predict(self, X):
+        return self.classes[self.predict_proba(X).argmax(axis=1)]
+
+
+def save_packed(packed, path):
+    """One .npy per array so each can be memory-mapped (and shared) on load."""
+    os.makedirs(path, exist_ok=True)
+    for k in ARRAYS:
+        np.save(os.path.join(path, f"{k}.npy"), packed[k])
+    with open(os.path.join(path, "meta.txt"), "w") as f:
+        f.write(f"{packed['depth']}\n" + "\n".join(packed['features']))
+
+
+def load_packed(path):
+    packed = {k: np.load(os.path.join(path, f"{k}.npy"), mmap_mode='r', allow_pickle=False) for k in ARRAYS}
+    with open(os.path.join(path, "meta.txt")) as f:
+        lines = f.read().split("\n")
+    packed['depth'] = int(lines[0])
+    packed['features'] = [l for l in lines[1:] if l]
+    return PackedForest(packed)
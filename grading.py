@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+# Shared WIN/LOSS/PUSH grading for spread, total and moneyline picks.
+# Everything is computed as array expressions over the whole history frame.
+#
+# Rules (the same everywhere):
+#   Spread: pick-side margin + line > 0 WIN, < 0 LOSS, == 0 PUSH
+#   Total:  OVER wins if total > line, UNDER if total < line, equal is a PUSH
+#   ML:     picking the winner is a WIN, a tie is a PUSH
+# Rows without final scores, or without the relevant pick, are left ungraded.
+
+RESULT_COLUMNS = {'spread': 'Spread_Result', 'total': 'Total_Result', 'ml': 'ML_Result'}
+_LABELS = np.array(["LOSS", "PUSH", "WIN"], dtype=object)
+
+
+def _label(edge):
+    """Map edge > 0 / == 0 / < 0 to WIN / PUSH / LOSS; NaN edges become None."""
+    edge = np.asarray(edge, dtype=float)
+    valid = ~np.isnan(edge)
+    out = np.full(edge.shape, None, dtype=object)
+    out[valid] = _LABELS[(np.sign(edge[valid]) + 1).astype(int)]
+    return out
+
+
+def _col(df, name, numeric=False):
+    if name not in df.columns:
+        return np.full(len(df), np.nan if numeric else None, dtype=float if numeric else object)
+    if numeric:
+        return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+    return df[name].to_numpy(dtype=object)
+
+
+def grade_arrays(h_score, a_score, home, away, pick_team, pick_line, pick_side, pick_total, ml_pick):
+    """Grade raw arrays. Returns (spread, total, ml) result arrays."""
+    h_score = np.asarray(h_score, dtype=float)
+    a_score = np.asarray(a_score, dtype=float)
+    pick_line = np.asarray(pick_line, dtype=float)
+    pick_total = np.asarray(pick_total, dtype=float)
+    home_margin = h_score - a_score
+
+    # Spread (pick not matching the home team is treated as the away side)
+    has_pick = pd.notna(pick_team)
+    spread_edge = np.where(pick_team == home, home_margin, -home_margin) + pick_line
+    spread_edge = np.where(has_pick, spread_edge, np.nan)
+
+    # Total
+    diff = (h_score + a_score) - pick_total
+    total_edge = np.where(pick_side == "OVER", diff, np.where(pick_side == "UNDER", -diff, np.nan))
+
+    # Moneyline (a pick matching neither team is a loss)
+    ml_edge = np.where(ml_pick == home, home_margin,
+                       np.where(ml_pick == away, -home_margin, -1.0))
+    ml_edge = np.where(pd.notna(ml_pick) & ~np.isnan(home_margin), ml_edge, np.nan)
+
+    return _label(spread_edge), _label(total_edge), _label(ml_edge)
+
+
+def grade_history(df):
+    """
+    Return a copy of a prediction history frame with Spread_Result,
+    Total_Result and ML_Result filled in for every row that has scores.
+    Rows without scores keep whatever result they already had.
+    """
+    df = df.copy()
+    h = _col(df, 'Manual_HomeScore', numeric=True)
+    a = _col(df, 'Manual_AwayScore', numeric=True)
+    scored = ~np.isnan(h) & ~np.isnan(a)
+
+    results = grade_arrays(
+        h, a, _col(df, 'HomeTeam'), _col(df, 'AwayTeam'),
+        _col(df, 'Pick_Team'), _col(df, 'Pick_Line', numeric=True),
+        _col(df, 'Pick_Side'), _col(df, 'Pick_Total', numeric=True),
+        _col(df, 'Moneyline Pick'),
+    )
+    for col, res in zip(RESULT_COLUMNS.values(), results):
+        existing = _col(df, col)
+        df[col] = np.where(scored, res, existing)
+    return df
+
+
+def record(results):
+    """(wins, losses, pushes, win %) for a result column; pushes don't count toward win %."""
+    results = pd.Series(results)
+    wins = int((results == "WIN").sum())
+    losses = int((results == "LOSS").sum())
+    pushes = int((results == "PUSH").sum())
+    pct = (wins / (wins + losses) * 100) if (wins + losses) > 0 else 0.0
+    return wins, losses, pushes, pct
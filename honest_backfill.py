@@ -1,9 +1,11 @@
 import os
+import numpy as np
 import pandas as pd
 import time
 from sklearn.ensemble import RandomForestClassifier
-from api import fetch_with_retry
+from snapshot import load_seasons, game_records, srs_lookup, talent_lookup, first_line_lookup
 from config import VALID_BOOKS
+from grading import grade_history, record
 
 # --- CONFIG ---
 SPLIT_DATE = "2025-08-01" 
@@ -13,26 +15,17 @@ FEATURES = [
     'home_srs_rating', 'away_srs_rating'
 ]
 
-def main():
-    print("--- ⚖️ RUNNING HONEST BACKFILL (WITH REAL ODDS) ---")
-    
-    # 1. Fetch ALL Data
-    print("   -> Fetching full season data...")
+def load_games(years):
+    """Completed games with a VALID_BOOKS line, one row per game, with model features."""
     all_games = []
+    # Season snapshots (built once, then loaded from disk)
+    snaps = load_seasons(years)
     
-    for year in [2024, 2025]:
-        games = fetch_with_retry("/games", {"year": year, "seasonType": "both"})
-        lines = fetch_with_retry("/lines", {"year": year, "seasonType": "both"})
-        srs = fetch_with_retry("/ratings/srs", {"year": year})
-        talent = fetch_with_retry("/talent", {"year": year})
-        
-        srs_map = {x['team']: x['rating'] for x in srs} if isinstance(srs, list) else {}
-        tal_map = {x.get('school', x.get('team')): x['talent'] for x in talent} if isinstance(talent, list) else {}
-        line_map = {}
-        if isinstance(lines, list):
-            for g in lines:
-                valid = [l for l in g.get('lines', []) if l.get('provider') in VALID_BOOKS]
-                if valid: line_map[str(g['id'])] = valid[0]
+    for year, snap in snaps.items():
+        games = game_records(snap)
+        srs_map = srs_lookup(snap)
+        tal_map = talent_lookup(snap)
+        line_map = first_line_lookup(snap, VALID_BOOKS)
 
         if isinstance(games, list):
             for g in games:
@@ -43,8 +36,8 @@ def main():
                 
                 home = g.get('home_team') or g.get('homeTeam')
                 away = g.get('away_team') or g.get('awayTeam')
-                h_pts = g.get('home_points') or g.get('homePoints')
-                a_pts = g.get('away_points') or g.get('awayPoints')
+                h_pts = g['home_points']
+                a_pts = g['away_points']
                 
                 line_data = line_map.get(gid)
                 if not line_data: continue
@@ -53,6 +46,7 @@ def main():
                     'GameID': gid,
                     'HomeTeam': home, 'AwayTeam': away,
                     'StartDate': start_date,
+                    'season': year, 'season_type': g.get('season_type'), 'week': g.get('week'),
                     'Manual_HomeScore': h_pts, 'Manual_AwayScore': a_pts,
                     'spread': line_data.get('spread'),
                     'overUnder': line_data.get('overUnder'),
@@ -66,7 +60,71 @@ def main():
                 }
                 all_games.append(row)
 
-    df = pd.DataFrame(all_games)
+    return pd.DataFrame(all_games)
+
+def make_targets(df):
+    """(y_spread, y_win, y_total) as int arrays: home covers, home wins, game goes over."""
+    h, a = df['Manual_HomeScore'], df['Manual_AwayScore']
+    y_spread = ((h + df['spread']) > a).astype(int)
+    y_win = (h > a).astype(int)
+    y_total = ((h + a) > df['overUnder']).astype(int)
+    return y_spread, y_win, y_total
+
+def fit_models(X, y_spread, y_win, y_total, n_jobs=None):
+    model_spread = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42, n_jobs=n_jobs)
+    model_spread.fit(X, y_spread)
+    
+    model_moneyline = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42, n_jobs=n_jobs)
+    model_moneyline.fit(X, y_win)
+    
+    model_total = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42, n_jobs=n_jobs)
+    model_total.fit(X, y_total)
+    return model_spread, model_moneyline, model_total
+
+def make_picks(test_df, prob_spr, prob_win, prob_tot):
+    """Turn model probabilities into an (ungraded) history frame in the backtest_2025.csv schema."""
+    home = test_df['HomeTeam'].to_numpy(dtype=object)
+    away = test_df['AwayTeam'].to_numpy(dtype=object)
+    spread = test_df['spread'].to_numpy(dtype=float)
+    total = test_df['overUnder']
+
+    # SPREAD
+    pick_team_spr = pd.Series(np.where(prob_spr > 0.5, home, away))
+    pick_line_spr = pd.Series(np.where(prob_spr > 0.5, spread, -spread))
+    
+    # MONEYLINE + LOGIC ENFORCEMENT (laying points means we also take them to win)
+    ml_pick = np.where(prob_win > 0.5, home, away)
+    ml_pick = np.where(pick_line_spr < 0, pick_team_spr, ml_pick)
+    
+    # TOTAL
+    pick_side = pd.Series(np.where(prob_tot > 0.5, "OVER", "UNDER"))
+    
+    return pd.DataFrame({
+        "GameID": test_df['GameID'].to_numpy(),
+        "HomeTeam": home, "AwayTeam": away,
+        "Game": test_df['AwayTeam'].to_numpy(dtype=object) + " @ " + home,
+        "StartDate": test_df['StartDate'].to_numpy(),
+        "Moneyline Pick": ml_pick, "Moneyline Conf": "N/A",
+        "Spread Pick": pick_team_spr + " (" + pick_line_spr.astype(str) + ")",
+        "Spread Conf": pd.Series(np.maximum(prob_spr, 1 - prob_spr) * 100).map('{:.1f}%'.format),
+        "Total Pick": pick_side + " " + total.astype(str).to_numpy(),
+        "Total Conf": pd.Series(np.maximum(prob_tot, 1 - prob_tot) * 100).map('{:.1f}%'.format),
+        "Pick_Team": pick_team_spr, "Pick_Line": pick_line_spr,
+        "Pick_Side": pick_side, "Pick_Total": total.to_numpy(),
+        # Store Real Odds
+        "Pick_ML_Odds": np.where(ml_pick == home, test_df['Home_ML'].to_numpy(), test_df['Away_ML'].to_numpy()),
+        "Manual_HomeScore": test_df['Manual_HomeScore'].to_numpy(),
+        "Manual_AwayScore": test_df['Manual_AwayScore'].to_numpy(),
+        # Graded later (column order matches backtest_2025.csv)
+        "Spread_Result": None, "ML_Result": None, "Total_Result": None,
+    })
+
+def main():
+    print("--- ⚖️ RUNNING HONEST BACKFILL (WITH REAL ODDS) ---")
+    
+    # 1. Fetch ALL Data
+    print("   -> Fetching full season data...")
+    df = load_games([2024, 2025])
     
     # 2. THE SPLIT
     train_df = df[df['StartDate'] < SPLIT_DATE].copy()
@@ -74,113 +132,27 @@ def main():
     
     # 3. TRAIN MODELS
     print(f"   -> Training models on {len(train_df)} games...")
-    X_train = train_df[FEATURES]
-    y_spread = ((train_df['Manual_HomeScore'] + train_df['spread']) > train_df['Manual_AwayScore']).astype(int)
-    y_win = (train_df['Manual_HomeScore'] > train_df['Manual_AwayScore']).astype(int)
-    y_total = ((train_df['Manual_HomeScore'] + train_df['Manual_AwayScore']) > train_df['overUnder']).astype(int)
-    
-    model_spread = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42)
-    model_spread.fit(X_train, y_spread)
-    
-    model_moneyline = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42)
-    model_moneyline.fit(X_train, y_win)
-    
-    model_total = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42)
-    model_total.fit(X_train, y_total)
+    model_spread, model_moneyline, model_total = fit_models(train_df[FEATURES], *make_targets(train_df))
     
     # 4. PREDICT & ENFORCE LOGIC
     print(f"   -> Grading {len(test_df)} December games...")
-    history_rows = []
-    
-    for idx, row in test_df.iterrows():
-        input_row = pd.DataFrame([row[FEATURES]])
-        
-        # SPREAD PREDICTION
-        prob_spr = model_spread.predict_proba(input_row)[0][1]
-        conf_spr = max(prob_spr, 1-prob_spr)
-        pick_team_spr = row['HomeTeam'] if prob_spr > 0.5 else row['AwayTeam']
-        pick_line_spr = row['spread'] if prob_spr > 0.5 else -row['spread']
-        
-        # MONEYLINE PREDICTION
-        prob_win = model_moneyline.predict_proba(input_row)[0][1]
-        ml_pick = row['HomeTeam'] if prob_win > 0.5 else row['AwayTeam']
-        
-        # LOGIC ENFORCEMENT
-        if pick_line_spr < 0:
-            if ml_pick != pick_team_spr: ml_pick = pick_team_spr
-
-        # TOTAL PREDICTION
-        prob_tot = model_total.predict_proba(input_row)[0][1]
-        conf_tot = max(prob_tot, 1-prob_tot)
-        pick_side = "OVER" if prob_tot > 0.5 else "UNDER"
-        
-        history_rows.append({
-            "GameID": row['GameID'],
-            "HomeTeam": row['HomeTeam'], "AwayTeam": row['AwayTeam'],
-            "Game": f"{row['AwayTeam']} @ {row['HomeTeam']}",
-            "StartDate": row['StartDate'],
-            "Moneyline Pick": ml_pick, "Moneyline Conf": "N/A",
-            "Spread Pick": f"{pick_team_spr} ({pick_line_spr})", "Spread Conf": f"{conf_spr:.1%}",
-            "Total Pick": f"{pick_side} {row['overUnder']}", "Total Conf": f"{conf_tot:.1%}",
-            "Pick_Team": pick_team_spr, "Pick_Line": pick_line_spr,
-            "Pick_Side": pick_side, "Pick_Total": row['overUnder'],
-            # Store Real Odds
-            "Pick_ML_Odds": row['Home_ML'] if ml_pick == row['HomeTeam'] else row['Away_ML'],
-            "Manual_HomeScore": row['Manual_HomeScore'],
-            "Manual_AwayScore": row['Manual_AwayScore']
-        })
+    X_test = test_df[FEATURES]
+    results_df = make_picks(
+        test_df,
+        model_spread.predict_proba(X_test)[:, 1],
+        model_moneyline.predict_proba(X_test)[:, 1],
+        model_total.predict_proba(X_test)[:, 1],
+    )
 
     # 5. SAVE & REPORT
-    results_df = pd.DataFrame(history_rows)
-    
     # Grade Results Immediately for Report
-    results_df['Spread_Result'] = "LOSS"
-    results_df['ML_Result'] = "LOSS"
-    results_df['Total_Result'] = "LOSS"
-    
-    for idx, row in results_df.iterrows():
-        # Spread
-        margin = row['Manual_HomeScore'] - row['Manual_AwayScore']
-        if row['Pick_Team'] == row['AwayTeam']: margin = -margin 
-        # (If pick is Away, margin is Away - Home. But above is Home - Away. So negative.)
-        # Wait, let's keep it simple. Score + Line > Opponent?
-        home = row['HomeTeam']
-        away = row['AwayTeam']
-        h_score = row['Manual_HomeScore']
-        a_score = row['Manual_AwayScore']
-        
-        # Spread
-        if row['Pick_Team'] == home:
-            cover = (h_score + row['Pick_Line']) > a_score
-            push = (h_score + row['Pick_Line']) == a_score
-        else:
-            cover = (a_score + row['Pick_Line']) > h_score
-            push = (a_score + row['Pick_Line']) == h_score
-        results_df.at[idx, 'Spread_Result'] = "PUSH" if push else ("WIN" if cover else "LOSS")
-        
-        # ML
-        winner = home if h_score > a_score else away
-        if row['Moneyline Pick'] == winner:
-            results_df.at[idx, 'ML_Result'] = "WIN"
-            
-        # Total
-        total_score = h_score + a_score
-        if row['Pick_Side'] == "OVER":
-            res = "WIN" if total_score > row['Pick_Total'] else ("LOSS" if total_score < row['Pick_Total'] else "PUSH")
-        else:
-            res = "WIN" if total_score < row['Pick_Total'] else ("LOSS" if total_score > row['Pick_Total'] else "PUSH")
-        results_df.at[idx, 'Total_Result'] = res
+    results_df = grade_history(results_df)
 
     results_df.to_csv("backtest_2025.csv", index=False)
     
     print("\n--- 📊 2025 SEASON RESULTS ---")
     for bet_type, col in [("Spread", "Spread_Result"), ("Moneyline", "ML_Result"), ("Total", "Total_Result")]:
-        counts = results_df[col].value_counts()
-        wins = counts.get("WIN", 0)
-        losses = counts.get("LOSS", 0)
-        pushes = counts.get("PUSH", 0)
-        total_graded = wins + losses
-        win_rate = (wins / total_graded * 100) if total_graded > 0 else 0
+        wins, losses, pushes, win_rate = record(results_df[col])
         print(f"{bet_type}: {wins}-{losses}-{pushes} ({win_rate:.1f}%)")
 
     print(f"\n✅ SUCCESS: Full season backtest saved to backtest_2025.csv")
@@ -2,7 +2,7 @@ import os
 from api import fetch_with_retry
 from dotenv import load_dotenv
 import json
-import statistics
+from lines import board_from_json, market
 
 load_dotenv()
 
@@ -24,23 +24,20 @@ def inspect():
             print(f"\nFOUND GAME: {away} @ {home} (ID: {game['id']})")
             print("-" * 50)
             
-            raw_lines = game.get('lines', [])
-            valid_spreads = []
-            
-            for l in raw_lines:
+            for l in game.get('lines', []):
                 prov = l.get('provider')
                 spread = l.get('spread')
                 print(f"Provider: {prov:15} | Spread: {spread}")
-                if spread is not None:
-                    valid_spreads.append(spread)
-            
-            if valid_spreads:
-                med = statistics.median(valid_spreads)
-                print("-" * 50)
-                print(f"CALCULATED MEDIAN: {med}")
+
+            m = market(board_from_json([game])).iloc[0]
+            print("-" * 50)
+            if m['n_books']:
+                print(f"CALCULATED MEDIAN: {m['spread']}")
+                print(f"BEST HOME: {m['best_home_spread']:+g} ({m['best_home_spread_book']}) | "
+                      f"BEST AWAY: {m['best_away_spread']:+g} ({m['best_away_spread_book']})")
             else:
                 print("No spreads available.")
-    
+
     if not found:
         print("Oregon game not found in 2025 Postseason Week 1.")
 
@@ -1,16 +1,29 @@
-import pandas as pd
 import os
-from config import HISTORY_FILE
+import numpy as np
+import prediction_store as store
+from config import PREDICTIONS_DB
+from strategy import kelly_fraction
+from pricing import board_prices, pick_ev
 
 def calculate_kelly():
     print("--- 💰 KELLY CRITERION BET SIZER 💰 ---")
     
-    # 1. Load Predictions
-    if not os.path.exists(HISTORY_FILE):
-        print(f"Error: {HISTORY_FILE} not found. Run predict.py first!")
+    # 1. Load Pending Predictions (confidences are already numeric)
+    if not os.path.exists(PREDICTIONS_DB):
+        print(f"Error: {PREDICTIONS_DB} not found. Run predict.py first!")
         return
         
-    df = pd.read_csv(HISTORY_FILE)
+    conn = store.connect(readonly=True)
+    df = store.read_predictions(conn, graded=False)
+    conn.close()
+
+    # Best available prices from the picks' season board; recorded odds if it can't be loaded
+    try:
+        prices = board_prices(df)
+    except Exception as e:
+        print(f"⚠️ Live lines unavailable ({e}); using recorded odds (-110 spreads/totals).")
+        prices = None
+    ev = pick_ev(df, prices)
     
     # 2. Settings
     BANKROLL = 1000  # Example Bankroll ($1,000)
@@ -19,41 +32,24 @@ def calculate_kelly():
     print(f"Bankroll: ${BANKROLL}")
     print(f"Strategy: Quarter Kelly (Aggressiveness: {KELLY_FRACTION*100}%)")
     print("-" * 60)
-    print(f"{'GAME':<30} | {'PICK':<20} | {'CONF':<6} | {'WAGER':<8}")
+    print(f"{'GAME':<30} | {'PICK':<20} | {'CONF':<6} | {'ODDS':>5} | {'WAGER':<8}")
     print("-" * 60)
     
     total_wagered = 0
     
-    for index, row in df.iterrows():
-        # Clean string "58.4%" -> float 0.584
-        try:
-            win_prob = float(row['Conf'].strip('%')) / 100.0
-        except:
-            continue
-            
-        # FILTER: Only bet if edge is significant (>53%)
-        if win_prob <= 0.53:
-            continue
-            
-        # KELLY FORMULA
-        # f* = (bp - q) / b
-        # b = odds (1 to 1 for spread, so b=0.91 if -110 odds)
-        # We assume standard -110 juice (b = 0.9091)
-        b = 0.9091
-        p = win_prob
-        q = 1 - p
-        
-        f_star = (b * p - q) / b
-        
-        # Apply Safety Fraction (Quarter Kelly)
-        fraction_to_bet = f_star * KELLY_FRACTION
+    for pick_col, leg in [('Spread Pick', 'Spread'), ('Total Pick', 'Total'), ('Moneyline Pick', 'ML')]:
+        win_prob = ev[f'{leg}_Prob'].to_numpy()
+        odds = ev[f'{leg}_Odds'].to_numpy()
         
-        # Calculate Dollar Amount
-        wager = BANKROLL * fraction_to_bet
+        # FILTER: Only bet if edge is significant (>53%) and the price is known
+        # KELLY FORMULA: f* = (bp - q) / b, with b the payout at the best available odds
+        f_star = kelly_fraction(win_prob, odds)
+        wager = BANKROLL * KELLY_FRACTION * f_star
+        bet = (win_prob > 0.53) & ~np.isnan(odds) & (wager > 0)
         
-        if wager > 0:
-            total_wagered += wager
-            print(f"{row['Game']:<30} | {row['Pick']:<20} | {row['Conf']:<6} | ${wager:.2f}")
+        for game, pick, p, o, w in zip(df['Game'][bet], df[pick_col][bet], win_prob[bet], odds[bet], wager[bet]):
+            total_wagered += w
+            print(f"{game:<30} | {pick:<20} | {p:<6.1%} | {o:>+5.0f} | ${w:.2f}")
 
     print("-" * 60)
     print(f"TOTAL EXPOSURE: ${total_wagered:.2f}")
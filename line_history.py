@@ -0,0 +1,282 @@
+import os
+import glob
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from config import CURRENT_SEASON, VALID_BOOKS
+from snapshot import load_season
+from api import add_cli_flags
+
+# Line-movement history.
+# A poller snapshots /lines for open games and appends only the rows that
+# changed since the last poll, keyed by (game_id, provider, ts). Each poll
+# writes one small zstd Parquet segment under line_history/{season}/; once
+# enough segments pile up they are merged into history.parquet, sorted by
+# (game_id, provider, ts) so per-game reads prune down to a row group or two.
+# latest.parquet keeps the last values per (game_id, provider), so a poll
+# diffs against that instead of re-reading the whole season.
+LINES_DIR = os.getenv("CFB_LINES_DIR", "line_history")
+VALUE_FIELDS = ['spread', 'overUnder', 'homeMoneyline', 'awayMoneyline']
+COMPACT_SEGMENTS = 96      # ~1 day of 15-minute polls
+ROW_GROUP_SIZE = 20_000
+LOOKAHEAD_DAYS = 10        # only poll weeks with a kickoff in the next N days
+
+SCHEMA = pa.schema([
+    ('game_id', pa.int64()),
+    ('provider', pa.string()),
+    ('ts', pa.int64()),  # unix seconds of the poll
+    *[(f, pa.float32()) for f in VALUE_FIELDS],
+])
+
+
+def _season_dir(year):
+    return os.path.join(LINES_DIR, str(year))
+
+
+def _segments(year):
+    return sorted(glob.glob(os.path.join(_season_dir(year), "segments", "*.parquet")))
+
+
+def _files(year):
+    history = os.path.join(_season_dir(year), "history.parquet")
+    return ([history] if os.path.exists(history) else []) + _segments(year)
+
+
+def _empty():
+    return SCHEMA.empty_table().to_pandas()
+
+
+# --- READS ---
+def read_history(year, game_ids=None, start=None, end=None):
+    """
+    Line snapshots for a season, optionally for some games and a ts range
+    [start, end]. Row-group statistics skip everything outside the filter.
+    """
+    filters = []
+    if game_ids is not None:
+        filters.append(('game_id', 'in', [int(g) for g in game_ids]))
+    if start is not None:
+        filters.append(('ts', '>=', int(start)))
+    if end is not None:
+        filters.append(('ts', '<=', int(end)))
+    frames = [pq.read_table(f, schema=SCHEMA, filters=filters or None).to_pandas() for f in _files(year)]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return _empty()
+    return pd.concat(frames, ignore_index=True).sort_values(['game_id', 'provider', 'ts'], kind='stable').reset_index(drop=True)
+
+
+def game_history(year, game_id, start=None, end=None):
+    """Every recorded line for one game, oldest first."""
+    return read_history(year, [game_id], start, end)
+
+
+def _latest_path(year):
+    return os.path.join(_season_dir(year), "latest.parquet")
+
+
+def _write_latest(year, state):
+    path = _latest_path(year)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(state, schema=SCHEMA, preserve_index=False)
+    pq.write_table(table, f"{path}.tmp", compression="zstd")
+    os.replace(f"{path}.tmp", path)
+
+
+def latest_state(year):
+    """
+    Last recorded values per (game_id, provider), from latest.parquet. It is
+    rebuilt from the full history when missing or older than the newest
+    segment (e.g. a poll died between writing the two).
+    """
+    path = _latest_path(year)
+    segments = _segments(year)
+    newest = int(os.path.basename(segments[-1])[:-len(".parquet")]) if segments else None
+    if os.path.exists(path):
+        state = pq.read_table(path, schema=SCHEMA).to_pandas()
+        if newest is None or (not state.empty and state['ts'].max() >= newest):
+            return state
+    hist = read_history(year)
+    state = hist.drop_duplicates(['game_id', 'provider'], keep='last').reset_index(drop=True)
+    if not state.empty:
+        _write_latest(year, state)
+    return state
+
+
+# --- WRITES ---
+def line_deltas(current, state):
+    """Rows of `current` whose values differ from the last recorded state (NaN == NaN)."""
+    merged = current.merge(state[['game_id', 'provider'] + VALUE_FIELDS], on=['game_id', 'provider'],
+                           how='left', suffixes=('', '_prev'), indicator=True)
+    changed = merged['_merge'] == 'left_only'
+    for f in VALUE_FIELDS:
+        new, old = merged[f].astype('float32'), merged[f'{f}_prev'].astype('float32')
+        changed |= ~((new == old) | (new.isna() & old.isna()))
+    return current[changed.to_numpy()]
+
+
+def append_snapshot(year, lines, ts=None):
+    """
+    Append the changed rows of a /lines snapshot (normalize_lines frame) as a
+    new segment. Returns the number of rows written.
+    """
+    ts = int(ts if ts is not None else time.time())
+    current = pd.DataFrame({
+        'game_id': lines['game_id'].astype('int64').to_numpy(),
+        'provider': lines['provider'].astype(str).to_numpy(),
+        'ts': ts,
+        **{f: pd.to_numeric(lines[f], errors='coerce').astype('float32').to_numpy() for f in VALUE_FIELDS},
+    }).drop_duplicates(['game_id', 'provider'], keep='last')
+
+    state = latest_state(year)
+    deltas = line_deltas(current, state)
+    if deltas.empty:
+        return 0
+    seg_dir = os.path.join(_season_dir(year), "segments")
+    os.makedirs(seg_dir, exist_ok=True)
+    path = os.path.join(seg_dir, f"{ts}.parquet")
+    deltas = deltas.sort_values(['game_id', 'provider'])
+    table = pa.Table.from_pandas(deltas, schema=SCHEMA, preserve_index=False)
+    pq.write_table(table, f"{path}.tmp", compression="zstd")
+    os.replace(f"{path}.tmp", path)
+
+    # Fold the deltas into the latest state (O(open lines), not O(season))
+    keys = pd.MultiIndex.from_frame(deltas[['game_id', 'provider']])
+    kept = state[~pd.MultiIndex.from_frame(state[['game_id', 'provider']]).isin(keys)]
+    _write_latest(year, pd.concat([t for t in (kept, deltas) if not t.empty], ignore_index=True))
+    return len(deltas)
+
+
+def compact(year):
+    """Merge all segments into history.parquet (sorted, zstd), then drop them."""
+    segments = _segments(year)
+    if not segments:
+        return 0
+    hist = read_history(year)
+    path = os.path.join(_season_dir(year), "history.parquet")
+    table = pa.Table.from_pandas(hist, schema=SCHEMA, preserve_index=False)
+    pq.write_table(table, f"{path}.tmp", compression="zstd", row_group_size=ROW_GROUP_SIZE,
+                   use_dictionary=['provider'], write_statistics=True)
+    os.replace(f"{path}.tmp", path)
+    _write_latest(year, hist.drop_duplicates(['game_id', 'provider'], keep='last'))
+    for seg in segments:
+        os.remove(seg)
+    return len(segments)
+
+
+# --- OPEN / CLOSE ---
+def open_close(hist, kickoffs=None):
+    """
+    Opening (first recorded) and closing (last recorded before kickoff) line
+    per (game_id, provider). `kickoffs` maps game_id -> unix kickoff time;
+    without it the closing line is simply the last one recorded.
+    """
+    if hist.empty:
+        return pd.DataFrame(columns=['game_id', 'provider'] + [f'open_{f}' for f in VALUE_FIELDS]
+                            + [f'close_{f}' for f in VALUE_FIELDS])
+    if kickoffs is not None:
+        kick = hist['game_id'].map(kickoffs).astype(float)
+        pre = hist[kick.isna().to_numpy() | (hist['ts'] <= kick).to_numpy()]
+    else:
+        pre = hist
+    keys = ['game_id', 'provider']
+    opening = hist.drop_duplicates(keys, keep='first')[keys + VALUE_FIELDS]
+    closing = pre.drop_duplicates(keys, keep='last')[keys + VALUE_FIELDS]
+    return (opening.rename(columns={f: f'open_{f}' for f in VALUE_FIELDS})
+            .merge(closing.rename(columns={f: f'close_{f}' for f in VALUE_FIELDS}), on=keys, how='left')
+            .reset_index(drop=True))
+
+
+def consensus_close(year, game_ids, kickoffs=None, books=VALID_BOOKS):
+    """Median closing spread / total per game across the given books."""
+    oc = open_close(read_history(year, game_ids), kickoffs)
+    oc = oc[oc['provider'].isin(books)]
+    return oc.groupby('game_id').agg(close_spread=('close_spread', 'median'),
+                                     close_total=('close_overUnder', 'median')).reset_index()
+
+
+def clv(picks, close):
+    """
+    Closing-line value in points for graded picks (CSV layout) against
+    consensus closes: positive means the pick beat the closing number.
+    Spread: pick-side line minus the pick side's closing line.
+    Total: closing total above (OVER) / below (UNDER) the number taken.
+    """
+    ids = pd.to_numeric(picks['GameID'], errors='coerce')
+    close = close.set_index('game_id').reindex(ids)
+    close_spread = close['close_spread'].to_numpy(dtype=float)
+    close_total = close['close_total'].to_numpy(dtype=float)
+
+    home_pick = (picks['Pick_Team'] == picks['HomeTeam']).to_numpy()
+    pick_close = np.where(home_pick, close_spread, -close_spread)
+    side = np.where(picks['Pick_Side'] == "OVER", 1.0, np.where(picks['Pick_Side'] == "UNDER", -1.0, np.nan))
+    return pd.DataFrame({
+        'GameID': ids.to_numpy(),
+        'Close_Spread': close_spread,
+        'Close_Total': close_total,
+        'CLV_Spread': picks['Pick_Line'].to_numpy(dtype=float) - pick_close,
+        'CLV_Total': side * (close_total - picks['Pick_Total'].to_numpy(dtype=float)),
+    })
+
+
+# --- POLLER ---
+def kickoff_times(games):
+    """game_id -> unix kickoff seconds (NaN when unknown)."""
+    start = pd.to_datetime(games['start_date'], errors='coerce', utc=True)
+    seconds = (start - pd.Timestamp(0, tz='UTC')).dt.total_seconds()
+    return dict(zip(games['id'].astype('int64'), seconds))
+
+
+def poll(year, now=None):
+    """
+    One poll: update the season snapshot with /lines fetched live (other
+    endpoints keep their cache TTLs), then append the open games' deltas.
+    """
+    now = int(now if now is not None else time.time())
+    snap = load_season(year, live=("/lines",))
+    games = snap['games']
+    kick = pd.Series(kickoff_times(games))
+    soon = games['id'].map(kick).to_numpy() <= now + LOOKAHEAD_DAYS * 86400
+    open_games = games[~games['completed'] & soon]
+    if open_games.empty:
+        return 0, 0
+    lines = snap['lines'][snap['lines']['game_id'].isin(set(open_games['id']))]
+    return append_snapshot(year, lines, now), len(open_games)
+
+
+def storage_report(year):
+    files = _files(year)
+    size = sum(os.path.getsize(f) for f in files)
+    rows = sum(pq.ParquetFile(f).metadata.num_rows for f in files)
+    return f"{rows:,} line snapshots in {len(files)} files, {size / 1024:,.1f} KB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll /lines into the line-movement history.")
+    add_cli_flags(parser)
+    parser.add_argument("--year", type=int, default=CURRENT_SEASON)
+    parser.add_argument("--interval", type=float, default=15.0, help="Minutes between polls")
+    parser.add_argument("--once", action="store_true", help="Poll once and exit")
+    args = parser.parse_args()
+
+    print("--- 📈 LINE HISTORY POLLER ---")
+    while True:
+        try:
+            written, n_open = poll(args.year)
+            print(f"   -> {time.strftime('%H:%M:%S')}: {n_open} open games, {written} changed lines")
+            if len(_segments(args.year)) >= COMPACT_SEGMENTS:
+                print(f"   -> Compacted {compact(args.year)} segments")
+        except Exception as e:
+            # Keep polling; a missed snapshot only loses resolution
+            print(f"   ⚠️ Poll failed: {e}")
+        print(f"   -> {storage_report(args.year)}")
+        if args.once:
+            break
+        time.sleep(args.interval * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import warnings
+import numpy as np
+import pandas as pd
+from strategy import american_payout, STANDARD_ODDS
+
+# Dense game x book line arrays.
+# /lines (or a snapshot's normalized lines table) is scattered once into
+# (n_games, n_books) float arrays; consensus numbers, best available prices
+# and the book offering them are then plain reductions along axis 1, so a
+# full season is one pass instead of a loop per game.
+#
+# CFBD's /lines carries no spread/total juice, so those price arrays are
+# filled from optional columns when a feed has them and default to -110.
+# Best-number shopping still breaks ties on price.
+FIELDS = {
+    'spread': 'spread',            # home spread
+    'total': 'overUnder',
+    'home_ml': 'homeMoneyline',
+    'away_ml': 'awayMoneyline',
+}
+PRICE_FIELDS = {
+    'home_spread_price': 'homeSpreadPrice',
+    'away_spread_price': 'awaySpreadPrice',
+    'over_price': 'overPrice',
+    'under_price': 'underPrice',
+}
+
+
+def board(lines, books=None):
+    """
+    Scatter a lines table (one row per game x provider, e.g. snap['lines'])
+    into dense arrays. `books` restricts and orders the columns; otherwise
+    every provider seen is used. Duplicate (game, provider) rows keep the
+    first one in table order (provider rank order for snapshots and /lines).
+    Returns {'game_ids', 'books', <field>: (n_games, n_books) array, ...},
+    plus boolean has_<price field> arrays for prices the feed actually quoted.
+    """
+    provider = lines['provider'].astype(str).to_numpy()
+    gi, game_ids = pd.factorize(lines['game_id'].to_numpy(), sort=True)
+    if books is not None:
+        book_list = list(books)
+        bi = pd.Index(book_list).get_indexer(provider)
+    else:
+        bi, book_list = pd.factorize(provider, sort=True)
+        book_list = list(book_list)
+    shape = (len(game_ids), len(book_list))
+
+    # First row per (game, book) cell, in table (= provider rank) order
+    keep = np.flatnonzero(bi >= 0)
+    _, first = np.unique(gi[keep] * max(shape[1], 1) + bi[keep], return_index=True)
+    rows = keep[first]
+    gi, bi = gi[rows], bi[rows]
+
+    out = {'game_ids': np.asarray(game_ids), 'books': np.array(book_list, dtype=object)}
+    for name, col in {**FIELDS, **PRICE_FIELDS}.items():
+        arr = np.full(shape, np.nan)
+        if col in lines.columns:
+            arr[gi, bi] = pd.to_numeric(lines[col], errors='coerce').to_numpy(dtype=float)[rows]
+        if name in PRICE_FIELDS:
+            # Quoted lines without a price are taken at the standard -110;
+            # has_<price> marks the cells where the feed gave a real one
+            out[f'has_{name}'] = ~np.isnan(arr)
+            arr[gi, bi] = np.where(np.isnan(arr[gi, bi]), STANDARD_ODDS, arr[gi, bi])
+        out[name] = arr
+    # A 0 moneyline means "not offered"
+    for name in ['home_ml', 'away_ml']:
+        out[name][out[name] == 0] = np.nan
+    return out
+
+
+def board_from_json(payload, books=None):
+    """Same as board() but straight from a raw /lines response."""
+    rows = [{'game_id': g.get('id'), 'book_rank': rank, 'provider': line.get('provider'),
+             **{col: line.get(col) for col in {**FIELDS, **PRICE_FIELDS}.values()}}
+            for g in payload if isinstance(g, dict)
+            for rank, line in enumerate(g.get('lines') or [])]
+    cols = ['game_id', 'book_rank', 'provider'] + list({**FIELDS, **PRICE_FIELDS}.values())
+    return board(pd.DataFrame(rows, columns=cols), books)
+
+
+def _best(number, price, books, higher=True):
+    """
+    Best number per game (highest when `higher`), ties broken by the better
+    price. Returns (number, price, book); all-NaN rows give NaN / None.
+    """
+    n = len(number)
+    if number.shape[1] == 0:
+        return np.full(n, np.nan), np.full(n, np.nan), np.full(n, None, dtype=object)
+    sign = 1.0 if higher else -1.0
+    # Lines move in half points and payouts stay well under 1 for spread/total
+    # juice, so the number dominates and price only breaks ties
+    key = sign * number * 100 + american_payout(price)
+    idx = np.where(np.isnan(number), -np.inf, key).argmax(axis=1)
+    rows = np.arange(n)
+    has = ~np.isnan(number).all(axis=1)
+    return (np.where(has, number[rows, idx], np.nan), np.where(has, price[rows, idx], np.nan),
+            np.where(has, books[idx], None))
+
+
+def _nanmedian(a):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows -> NaN
+        return np.nanmedian(a, axis=1) if a.shape[1] else np.full(len(a), np.nan)
+
+
+def market(b):
+    """
+    Consensus and best-price table, one row per game:
+    median spread / total, book counts, and for each side the best number
+    (or moneyline), its price and the book offering it.
+    """
+    books = b['books']
+    best_home, home_price, home_book = _best(b['spread'], b['home_spread_price'], books, higher=True)
+    best_away, away_price, away_book = _best(-b['spread'], b['away_spread_price'], books, higher=True)
+    best_over, over_price, over_book = _best(b['total'], b['over_price'], books, higher=False)
+    best_under, under_price, under_book = _best(b['total'], b['under_price'], books, higher=True)
+    # Moneylines: the highest American price is the best payout on either side
+    home_ml, _, home_ml_book = _best(b['home_ml'], b['home_ml'], books, higher=True)
+    away_ml, _, away_ml_book = _best(b['away_ml'], b['away_ml'], books, higher=True)
+
+    return pd.DataFrame({
+        'game_id': b['game_ids'],
+        'spread': _nanmedian(b['spread']),
+        'overUnder': _nanmedian(b['total']),
+        'n_books': (~np.isnan(b['spread'])).sum(axis=1),
+        'best_home_spread': best_home, 'best_home_spread_price': home_price, 'best_home_spread_book': home_book,
+        'best_away_spread': best_away, 'best_away_spread_price': away_price, 'best_away_spread_book': away_book,
+        'best_over': best_over, 'best_over_price': over_price, 'best_over_book': over_book,
+        'best_under': best_under, 'best_under_price': under_price, 'best_under_book': under_book,
+        'best_home_ml': home_ml, 'best_home_ml_book': home_ml_book,
+        'best_away_ml': away_ml, 'best_away_ml_book': away_ml_book,
+    })
+
+
+def consensus(lines, books=None):
+    """market(board(lines, books)): the per-game consensus table."""
+    return market(board(lines, books))
@@ -0,0 +1,74 @@
+"""
+Load test for service.py: hammers /predict with single-matchup queries from
+several keep-alive clients and reports latency percentiles and throughput.
+
+    python service.py --port 8700 &
+    python loadtest.py --requests 5000 --clients 8
+"""
+import argparse
+import http.client
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlparse
+
+import numpy as np
+
+
+def client(host, port, paths, results):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    for path in paths:
+        start = time.perf_counter()
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        resp.read()
+        results.append((time.perf_counter() - start, resp.status))
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the local prediction service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8700")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    conn.request("GET", "/slate")
+    slate = json.loads(conn.getresponse().read())
+    conn.close()
+
+    # Slate games use their consensus lines; if there is no slate, ad-hoc games with explicit lines
+    rng = random.Random(args.seed)
+    if slate:
+        queries = [{'home': g['HomeTeam'], 'away': g['AwayTeam']} for g in slate]
+    else:
+        queries = [{'home': f"Team {rng.randrange(100):04d}", 'away': f"Team {rng.randrange(100, 200):04d}",
+                    'spread': rng.choice([-7.5, -3, 2.5, 10]), 'total': rng.choice([44.5, 51, 58.5])}
+                   for _ in range(100)]
+    paths = [f"/predict?{urlencode(rng.choice(queries))}" for _ in range(args.requests)]
+
+    print("--- 🔥 PREDICTION SERVICE LOAD TEST ---")
+    print(f"{args.requests} requests | {args.clients} clients | {len(queries)} distinct matchups")
+
+    per_client = [paths[i::args.clients] for i in range(args.clients)]
+    results = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        for chunk in per_client:
+            pool.submit(client, url.hostname, url.port, chunk, results)
+    elapsed = time.perf_counter() - start
+
+    lat = np.array([r[0] for r in results]) * 1000
+    errors = sum(1 for r in results if r[1] != 200)
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+    print("-" * 60)
+    print(f"Throughput: {len(results) / elapsed:,.0f} req/s | Errors: {errors}")
+    print(f"Latency: p50 {p50:.2f}ms | p95 {p95:.2f}ms | p99 {p99:.2f}ms | max {lat.max():.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from api import get_data
 from utils import normalize_game_columns
+from storage import write_table
 
 def fetch_season_data(years):
     all_games = []
@@ -34,6 +35,8 @@ def fetch_season_data(years):
                     df_games = df_games[df_games['completed'] == True]
                 
                 df_games = df_games[required_cols].copy()
+                # Bowls are "week 1" of the postseason; keep the type so time order is recoverable
+                df_games['season_type'] = season_type
                 all_games.append(df_games)
 
             # --- 2. FETCH BETTING LINES ---
@@ -132,8 +135,15 @@ if __name__ == "__main__":
         cols_to_show = [c for c in cols_to_show if c in df_clean.columns]
         print(df_clean[cols_to_show].tail())
         
-        filename = "cfb_training_data_24_25.csv"
-        df_clean.to_csv(filename, index=False)
+        key_cols = ['id', 'season', 'week', 'season_type', 'home_team', 'away_team', 'home_points', 'away_points']
+        target_cols = [c for c in df_clean.columns if c.startswith('target_')]
+        groups = {
+            'keys': key_cols,
+            'market': ['spread', 'overUnder'],
+            'season_stats': [c for c in df_clean.columns if c.startswith(('home_', 'away_')) and c not in key_cols],
+            'targets': target_cols,
+        }
+        filename = write_table(df_clean, "cfb_training_data_24_25", groups=groups)
         print(f"\nSUCCESS: Saved {len(df_clean)} games to {filename}")
     else:
         print("Failed to acquire data.")
\ No newline at end of file
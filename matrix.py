@@ -0,0 +1,101 @@
+import os
+import sys
+import glob
+import atexit
+import numpy as np
+
+# Training matrices as float32 memory-mapped .npy files.
+# The matrix is written once; joblib/loky workers receive np.memmap arrays
+# by file reference and map the same pages instead of unpickling a copy.
+MATRIX_DIR = os.getenv("CFB_MATRIX_DIR", ".cfb_matrix")
+_CREATED = []
+
+
+def shared_matrix(data, name, columns=None):
+    """
+    Materialize `data` (DataFrame + columns, or array) as a C-contiguous
+    float32 .npy file and return a read-only memmap of it.
+    """
+    os.makedirs(MATRIX_DIR, exist_ok=True)
+    path = os.path.join(MATRIX_DIR, f"{name}_{os.getpid()}.npy")
+
+    if columns is not None:
+        shape = (len(data), len(columns))
+    else:
+        data = np.asarray(data)
+        shape = data.shape
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=shape)
+    if columns is not None:
+        # Column by column so we never hold a second full copy in RAM
+        for j, col in enumerate(columns):
+            out[:, j] = data[col].to_numpy(dtype=np.float32)
+    else:
+        out[:] = data
+    out.flush()
+    del out
+
+    if not _CREATED:
+        atexit.register(_cleanup)
+    _CREATED.append(path)
+    return np.load(path, mmap_mode='r')
+
+
+def _cleanup():
+    for path in _CREATED:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def rows(X, idx):
+    """X[idx], but a zero-copy view when idx is a contiguous ascending range."""
+    idx = np.asarray(idx)
+    if len(idx) and idx[-1] - idx[0] == len(idx) - 1 and (len(idx) == 1 or (np.diff(idx) == 1).all()):
+        return X[idx[0]:idx[-1] + 1]
+    return X[idx]
+
+
+# --- MEMORY REPORT ---
+def _peak_mb(pid="self"):
+    """VmHWM (peak resident set) of a process in MB, from /proc."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _children(pid):
+    kids = []
+    for path in glob.glob(f"/proc/{pid}/task/*/children"):
+        try:
+            with open(path) as f:
+                kids += [int(p) for p in f.read().split()]
+        except OSError:
+            pass
+    return kids + [g for k in kids for g in _children(k)]
+
+
+def memory_report(label):
+    """Print peak RSS of this process and of any live child (worker) processes."""
+    main_mb = _peak_mb()
+    if main_mb is None:
+        try:
+            import resource
+        except ImportError:
+            print(f"   -> 🧮 Memory ({label}): not available on this platform")
+            return
+        # ru_maxrss is KB on Linux, bytes on macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        main_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+    children = [mb for mb in (_peak_mb(p) for p in _children(os.getpid())) if mb is not None]
+    line = f"   -> 🧮 Memory ({label}): peak RSS {main_mb:.0f} MB main"
+    if children:
+        line += f", {len(children)} child processes (largest {max(children):.0f} MB, sum {sum(children):.0f} MB)"
+    print(line)
+    return {'main_mb': main_mb, 'children': len(children), 'child_peak_mb': max(children, default=0.0)}
@@ -0,0 +1,303 @@
+"""
+Local stand-in for api.collegefootballdata.com, for load-testing the fetch path.
+
+Serves deterministic synthetic data for any number of seasons and teams, with
+configurable latency, payload padding and 429 rate limiting. Point the
+pipeline at it with CFBD_BASE_URL:
+
+    python mock_server.py --port 8765 --teams 700 --rate-limit 20
+    CFBD_BASE_URL=http://127.0.0.1:8765 CFBD_API_KEY=mock python retrain.py --refresh
+"""
+import argparse
+import gzip
+import json
+import math
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from config import VALID_BOOKS
+
+CONFERENCES = ['SEC', 'Big Ten', 'Big 12', 'ACC', 'American Athletic', 'Mountain West',
+               'Sun Belt', 'Mid-American', 'Conference USA', 'FCS Independents']
+
+SETTINGS = {
+    "teams": 260,
+    "weeks": 15,
+    "seed": 7,
+    "latency_ms": 0.0,
+    "jitter_ms": 0.0,
+    "pad": 0,
+    "current_season": None,
+    "completed_through": None,
+}
+
+
+# --- SYNTHETIC DATA ---
+def _teams():
+    rng = random.Random(f"{SETTINGS['seed']}-teams")
+    teams = []
+    for i in range(SETTINGS["teams"]):
+        conf = CONFERENCES[i % len(CONFERENCES)]
+        teams.append({
+            "id": 1000 + i,
+            "team": f"Team {i:04d}",
+            "conference": conf,
+            "classification": "fcs" if conf == 'FCS Independents' else "fbs",
+            "base": rng.gauss(0, 12),
+        })
+    return teams
+
+
+def _american_odds(win_prob):
+    win_prob = min(max(win_prob, 0.02), 0.98)
+    if win_prob >= 0.5:
+        return int(round(-100 * win_prob / (1 - win_prob)))
+    return int(round(100 * (1 - win_prob) / win_prob))
+
+
+def _stat_block(rng, strength, sign):
+    ppa = 0.15 + sign * strength / 80 + rng.gauss(0, 0.05)
+    return {
+        "ppa": round(ppa, 4),
+        "successRate": round(0.42 + sign * strength / 300 + rng.gauss(0, 0.02), 4),
+        "explosiveness": round(1.2 + rng.gauss(0, 0.08), 4),
+        "rushing": {"ppa": round(ppa + rng.gauss(0, 0.04), 4),
+                    "successRate": round(0.42 + rng.gauss(0, 0.03), 4)},
+        "passing": {"ppa": round(ppa + rng.gauss(0, 0.06), 4),
+                    "successRate": round(0.42 + rng.gauss(0, 0.03), 4)},
+    }
+
+
+@lru_cache(maxsize=None)
+def build_season(year):
+    """Generate one season: games, lines, ratings, talent, weather and stats."""
+    rng = random.Random(f"{SETTINGS['seed']}-{year}")
+    teams = _teams()
+    strength = {t["team"]: t["base"] + rng.gauss(0, 4) for t in teams}
+    pad = "x" * SETTINGS["pad"] if SETTINGS["pad"] else None
+    current = SETTINGS["current_season"] == year
+    completed_through = SETTINGS["completed_through"] if current else None
+
+    games, lines, weather, game_stats = [], [], [], []
+    game_id = year * 100000
+
+    schedule = []
+    for week in range(1, SETTINGS["weeks"] + 1):
+        order = teams[:]
+        rng.shuffle(order)
+        for i in range(0, len(order) - 1, 2):
+            schedule.append(("regular", week, order[i], order[i + 1]))
+    ranked = sorted(teams, key=lambda t: -strength[t["team"]])[:max(2, len(teams) // 3)]
+    for i in range(0, len(ranked) - 1, 2):
+        schedule.append(("postseason", 1, ranked[i], ranked[i + 1]))
+
+    for stype, week, home, away in schedule:
+        game_id += 1
+        h, a = home["team"], away["team"]
+        edge = strength[h] - strength[a] + 2.5
+        completed = completed_through is None or (stype == "regular" and week <= completed_through)
+        total_mean = 52 + rng.gauss(0, 6)
+        margin = edge + rng.gauss(0, 14)
+        h_pts = max(0, int(round((total_mean + margin) / 2))) if completed else None
+        a_pts = max(0, int(round((total_mean - margin) / 2))) if completed else None
+        month = 8 + (week + 1) // 4 if stype == "regular" else 12
+        start = f"{year}-{month:02d}-{min(28, 1 + (week * 7) % 28):02d}T19:00:00.000Z"
+
+        game = {
+            "id": game_id, "season": year, "week": week, "seasonType": stype,
+            "startDate": start, "completed": completed, "neutralSite": stype == "postseason",
+            "conferenceGame": home["conference"] == away["conference"],
+            "homeId": home["id"], "homeTeam": h, "homeConference": home["conference"],
+            "homeClassification": home["classification"], "homePoints": h_pts,
+            "awayId": away["id"], "awayTeam": a, "awayConference": away["conference"],
+            "awayClassification": away["classification"], "awayPoints": a_pts,
+        }
+        if pad:
+            game["notes"] = pad
+        games.append(game)
+
+        market_spread = -round((edge + rng.gauss(0, 2)) * 2) / 2
+        market_total = round((total_mean + rng.gauss(0, 2)) * 2) / 2
+        home_prob = 1 / (1 + math.exp(market_spread / 7.5))
+        book_lines = []
+        for book in rng.sample(VALID_BOOKS, rng.randint(3, len(VALID_BOOKS))):
+            spread = market_spread + rng.choice([-0.5, 0, 0, 0.5])
+            ou = market_total + rng.choice([-0.5, 0, 0, 0.5])
+            vig = rng.uniform(0.02, 0.05)
+            book_lines.append({
+                "provider": book, "spread": spread,
+                "formattedSpread": f"{h if spread <= 0 else a} {-abs(spread)}",
+                "spreadOpen": market_spread, "overUnder": ou, "overUnderOpen": market_total,
+                "homeMoneyline": _american_odds(home_prob + vig / 2),
+                "awayMoneyline": _american_odds(1 - home_prob + vig / 2),
+            })
+        lines.append({
+            "id": game_id, "season": year, "seasonType": stype, "week": week, "startDate": start,
+            "homeTeam": h, "homeConference": home["conference"], "homeClassification": home["classification"],
+            "homeScore": h_pts, "awayTeam": a, "awayConference": away["conference"],
+            "awayClassification": away["classification"], "awayScore": a_pts, "lines": book_lines,
+        })
+
+        weather.append({
+            "id": game_id, "season": year, "week": week, "seasonType": stype, "startTime": start,
+            "gameIndoors": False, "homeTeam": h, "awayTeam": a,
+            "temperature": round(rng.uniform(25, 95), 1), "windSpeed": round(abs(rng.gauss(7, 5)), 1),
+            "weatherConditionCode": rng.randint(1, 8),
+        })
+
+        if completed:
+            for team, opp, sign in [(h, a, 1), (a, h, -1)]:
+                game_stats.append({
+                    "gameId": game_id, "season": year, "week": week, "team": team, "opponent": opp,
+                    "offense": _stat_block(rng, strength[team] - strength[opp], 1),
+                    "defense": _stat_block(rng, strength[team] - strength[opp], -1),
+                })
+
+    srs = [{"year": year, "team": t["team"], "conference": t["conference"], "division": None,
+            "rating": round(strength[t["team"]], 1)} for t in teams]
+    talent = [{"year": year, "team": t["team"],
+               "talent": round(max(10.0, 650 + strength[t["team"]] * 12 + rng.gauss(0, 40)), 2)} for t in teams]
+    season_stats = [{"season": year, "team": t["team"], "conference": t["conference"],
+                     "offense": _stat_block(rng, strength[t["team"]], 1),
+                     "defense": _stat_block(rng, strength[t["team"]], -1)} for t in teams]
+
+    return {"games": games, "lines": lines, "weather": weather, "srs": srs,
+            "talent": talent, "season_stats": season_stats, "game_stats": game_stats}
+
+
+def _filter(rows, params):
+    stype = params.get("seasonType", "regular")
+    if stype != "both":
+        rows = [r for r in rows if r.get("seasonType", stype) == stype]
+    if "week" in params:
+        rows = [r for r in rows if str(r.get("week")) == params["week"]]
+    if "team" in params:
+        rows = [r for r in rows if params["team"] in (r.get("homeTeam"), r.get("awayTeam"), r.get("team"))]
+    return rows
+
+
+ROUTES = {
+    "/games": lambda s, p: _filter(s["games"], p),
+    "/lines": lambda s, p: _filter(s["lines"], p),
+    "/games/weather": lambda s, p: _filter(s["weather"], p),
+    "/ratings/srs": lambda s, p: s["srs"],
+    "/talent": lambda s, p: s["talent"],
+    "/stats/season/advanced": lambda s, p: s["season_stats"],
+    "/stats/game/advanced": lambda s, p: _filter(s["game_stats"], {k: v for k, v in p.items() if k != "seasonType"}),
+}
+
+
+# --- RATE LIMITING ---
+class ServerBucket:
+    """Non-blocking token bucket: requests over the limit get a 429."""
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Returns 0 if allowed, otherwise the seconds until a token is free."""
+        if self.rate <= 0:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+BUCKET = ServerBucket(0, 1)
+STATS = {"ok": 0, "throttled": 0, "not_found": 0}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body, extra_headers=None):
+        raw = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            raw = gzip.compress(raw, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        headers.update(extra_headers or {})
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        wait = BUCKET.take()
+        if wait:
+            STATS["throttled"] += 1
+            self._send(429, {"message": "Too many requests"}, {"Retry-After": str(max(1, math.ceil(wait)))})
+            return
+
+        if SETTINGS["latency_ms"] or SETTINGS["jitter_ms"]:
+            delay = SETTINGS["latency_ms"] + random.uniform(0, SETTINGS["jitter_ms"])
+            time.sleep(delay / 1000.0)
+
+        route = ROUTES.get(url.path)
+        if route is None or "year" not in params:
+            STATS["not_found"] += 1
+            self._send(404, {"message": f"Unknown endpoint or missing year: {url.path}"})
+            return
+
+        STATS["ok"] += 1
+        self._send(200, route(build_season(int(params["year"])), params))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock CFBD API server with synthetic data.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--teams", type=int, default=SETTINGS["teams"], help="Teams per season")
+    parser.add_argument("--weeks", type=int, default=SETTINGS["weeks"], help="Regular-season weeks")
+    parser.add_argument("--seed", type=int, default=SETTINGS["seed"])
+    parser.add_argument("--latency", type=float, default=0.0, help="Base latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency (ms)")
+    parser.add_argument("--pad", type=int, default=0, help="Filler bytes added to every game record")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Allowed requests/sec (0 = unlimited)")
+    parser.add_argument("--burst", type=int, default=10, help="Rate-limit burst size")
+    parser.add_argument("--current-season", type=int, default=None, help="Season that is still in progress")
+    parser.add_argument("--completed-through", type=int, default=None, help="Last completed week of the current season")
+    args = parser.parse_args()
+
+    global BUCKET
+    SETTINGS.update({
+        "teams": args.teams, "weeks": args.weeks, "seed": args.seed,
+        "latency_ms": args.latency, "jitter_ms": args.jitter, "pad": args.pad,
+        "current_season": args.current_season, "completed_through": args.completed_through,
+    })
+    BUCKET = ServerBucket(args.rate_limit, args.burst)
+
+    server = ThreadingHTTPServer((args.host, args.port), MockHandler)
+    print(f"--- 🧪 MOCK CFBD API on http://{args.host}:{args.port} ---")
+    print(f"Teams: {args.teams} | Weeks: {args.weeks} | Latency: {args.latency}ms | Rate limit: {args.rate_limit or 'off'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\nServed {STATS['ok']} OK, {STATS['throttled']} throttled, {STATS['not_found']} not found.")
+
+
+if __name__ == "__main__":
+    main()
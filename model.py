@@ -1,24 +1,20 @@
+import os
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
-import joblib 
+import time
+from storage import read_table
+from matrix import shared_matrix, memory_report
+from registry import save_model
+
+N_JOBS = int(os.getenv("CFB_WORKERS", -1))
 
 def train_models():
     print("--- 🧠 RESTORING LEAK-PROOF MODEL (56% Accuracy) 🧠 ---")
     
-    # 1. Load Data
-    try:
-        # We use the 'smart' dataset which we know has the correct Total Offense/Defense stats
-        df = pd.read_csv("cfb_training_data_smart.csv")
-        df = df.drop_duplicates(subset=['id'])
-        print(f"Loaded {len(df)} games.")
-    except FileNotFoundError:
-        print("Error: cfb_training_data_smart.csv not found.")
-        return
-    
-    # 2. FEATURE LIST (The proven winners)
+    # 1. FEATURE LIST (The proven winners)
     features = [
         'spread', 'overUnder',
         'home_talent_score', 'away_talent_score',
@@ -31,42 +27,71 @@ def train_models():
         'away_decay_defense.ppa', 'away_decay_defense.successRate', 'away_decay_defense.explosiveness'
     ]
     
+    # 2. Load Data (only the columns the models use)
+    try:
+        # We use the 'smart' dataset which we know has the correct Total Offense/Defense stats
+        targets = ['target_home_cover', 'target_home_win', 'target_over']
+        df = read_table("cfb_training_data_smart", columns=['id'] + features + targets)
+        df = df.drop_duplicates(subset=['id'])
+        print(f"Loaded {len(df)} games.")
+    except FileNotFoundError:
+        print("Error: cfb_training_data_smart not found.")
+        return
+    
     # Drop NaNs
     df_clean = df.dropna(subset=features + ['target_home_cover', 'target_home_win', 'target_over']).copy()
-    X = df_clean[features]
+    
+    # One 80/20 split shared by all three models (the same rows train_test_split(random_state=42) picks).
+    # Rows are laid out train-then-test in one float32 memmap, so both halves are views.
+    idx_train, idx_test = train_test_split(np.arange(len(df_clean)), test_size=0.2, random_state=42)
+    df_clean = df_clean.iloc[np.concatenate([idx_train, idx_test])]
+    X = shared_matrix(df_clean, "model_X", features)
+    X_train, X_test = X[:len(idx_train)], X[len(idx_train):]
+    
+    def split(target):
+        y = df_clean[target].to_numpy()
+        return y[:len(idx_train)], y[len(idx_train):]
     
     # --- TRAIN WINNER ---
     print("\nTraining Game Winner Model...")
-    y_win = df_clean['target_home_win']
-    X_train, X_test, y_train, y_test = train_test_split(X, y_win, test_size=0.2, random_state=42)
-    model_win = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42)
+    y_train, y_test = split('target_home_win')
+    model_win = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42, n_jobs=N_JOBS)
+    start = time.time()
     model_win.fit(X_train, y_train)
-    print(f"Winner Accuracy: {accuracy_score(y_test, model_win.predict(X_test)):.1%}")
+    secs_win = time.time() - start
+    acc_win = accuracy_score(y_test, model_win.predict(X_test))
+    print(f"Winner Accuracy: {acc_win:.1%}")
     
     # --- TRAIN SPREAD ---
     print("Training Spread Model...")
-    y_cover = df_clean['target_home_cover']
-    X_train, X_test, y_train, y_test = train_test_split(X, y_cover, test_size=0.2, random_state=42)
-    model_cover = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42)
+    y_train, y_test = split('target_home_cover')
+    model_cover = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42, n_jobs=N_JOBS)
+    start = time.time()
     model_cover.fit(X_train, y_train)
-    print(f"Spread Accuracy: {accuracy_score(y_test, model_cover.predict(X_test)):.1%} (Target: >52.4%)")
+    secs_cover = time.time() - start
+    acc_cover = accuracy_score(y_test, model_cover.predict(X_test))
+    print(f"Spread Accuracy: {acc_cover:.1%} (Target: >52.4%)")
     
     # --- TRAIN TOTALS ---
     print("Training Totals Model...")
-    y_total = df_clean['target_over']
-    X_train, X_test, y_train, y_test = train_test_split(X, y_total, test_size=0.2, random_state=42)
-    model_total = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42)
+    y_train, y_test = split('target_over')
+    model_total = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42, n_jobs=N_JOBS)
+    start = time.time()
     model_total.fit(X_train, y_train)
-    print(f"Totals Accuracy: {accuracy_score(y_test, model_total.predict(X_test)):.1%}")
+    secs_total = time.time() - start
+    acc_total = accuracy_score(y_test, model_total.predict(X_test))
+    print(f"Totals Accuracy: {acc_total:.1%}")
 
     # --- SAVE ---
-    # Store feature names to prevent crashes
-    model_cover.feature_names = features
-    
-    joblib.dump(model_win, "model_winner.pkl")
-    joblib.dump(model_cover, "model_spread_tuned.pkl") 
-    joblib.dump(model_total, "model_total.pkl")
+    # Each model becomes a new registry version (feature list, data hash, metrics, train time)
+    for name, model, target, acc, secs in [("winner", model_win, 'target_home_win', acc_win, secs_win),
+                                           ("spread", model_cover, 'target_home_cover', acc_cover, secs_cover),
+                                           ("total", model_total, 'target_over', acc_total, secs_total)]:
+        version = save_model(name, model, features, data=(X_train, split(target)[0]),
+                             metrics={'test_accuracy': acc}, train_seconds=secs, source="model.py")
+        print(f"   -> {name}: {version}")
     print("\nModels saved.")
+    memory_report("train_models")
 
 if __name__ == "__main__":
     train_models()
\ No newline at end of file
@@ -1,33 +1,16 @@
-import os
-import requests
 import pandas as pd
-import time
-from dotenv import load_dotenv
-
-load_dotenv()
-API_KEY = os.getenv("CFBD_API_KEY")
-HEADERS = {"Authorization": f"Bearer {API_KEY}", "Accept": "application/json"}
-
-def get_data(endpoint, params):
-    url = f"https://api.collegefootballdata.com{endpoint}"
-    try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        time.sleep(0.5)
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return []
+from api import get_data
+from storage import read_table, write_table
 
 def main():
     print("--- 🔋 INJECTING POWER RANKINGS (SRS) 🔋 ---")
     
     # 1. Load your Momentum Data (The most recent version)
     try:
-        df = pd.read_csv("cfb_training_data_with_momentum.csv")
+        df = read_table("cfb_training_data_with_momentum")
         print(f"Loaded {len(df)} games.")
     except FileNotFoundError:
-        print("Error: cfb_training_data_with_momentum.csv not found. Run features.py first!")
+        print("Error: cfb_training_data_with_momentum not found. Run features.py first!")
         return
 
     # 2. Fetch SRS Ratings for all years in the data
@@ -81,8 +64,9 @@ def main():
     df['away_srs_rating'] = df['away_srs_rating'].fillna(-10.0)
     
     # 4. Save
-    output_filename = "cfb_training_data_final.csv"
-    df.to_csv(output_filename, index=False)
+    output_filename = write_table(df, "cfb_training_data_final",
+                                  groups={'srs': ['home_srs_rating', 'away_srs_rating']},
+                                  parent="cfb_training_data_with_momentum")
     print(f"\nSUCCESS: Saved final dataset to {output_filename}")
     print("New Columns: ['home_srs_rating', 'away_srs_rating']")
 
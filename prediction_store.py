@@ -0,0 +1,279 @@
+import os
+import sqlite3
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import PREDICTIONS_DB, HISTORY_FILE
+from grading import grade_history
+
+# Transactional prediction store (SQLite, WAL mode).
+# One row per game with typed columns: integer GameIDs, confidences as
+# probabilities (0-1), integer scores. Writers upsert pending picks and grade
+# rows in place; readers (app, kelly, rollup) can query while predict.py is
+# writing. live_predictions.csv is kept as an export with the old layout.
+
+# (CSV column, DB column, SQL type)
+COLUMNS = [
+    ('GameID', 'game_id', 'INTEGER PRIMARY KEY'),
+    ('HomeTeam', 'home_team', 'TEXT'),
+    ('AwayTeam', 'away_team', 'TEXT'),
+    ('Game', 'game', 'TEXT'),
+    ('StartDate', 'start_date', 'TEXT'),
+    ('Moneyline Pick', 'ml_pick', 'TEXT'),
+    ('Moneyline Conf', 'ml_conf', 'REAL'),
+    ('Spread Pick', 'spread_pick', 'TEXT'),
+    ('Spread Conf', 'spread_conf', 'REAL'),
+    ('Total Pick', 'total_pick', 'TEXT'),
+    ('Total Conf', 'total_conf', 'REAL'),
+    ('Pick_Team', 'pick_team', 'TEXT'),
+    ('Pick_Line', 'pick_line', 'REAL'),
+    ('Pick_Side', 'pick_side', 'TEXT'),
+    ('Pick_Total', 'pick_total', 'REAL'),
+    ('Pick_ML_Odds', 'pick_ml_odds', 'REAL'),
+    ('Manual_HomeScore', 'home_score', 'INTEGER'),
+    ('Manual_AwayScore', 'away_score', 'INTEGER'),
+    ('Spread_Result', 'spread_result', 'TEXT'),
+    ('Total_Result', 'total_result', 'TEXT'),
+    ('ML_Result', 'ml_result', 'TEXT'),
+    # Closing consensus and closing-line value, filled in from line_history
+    ('Close_Spread', 'close_spread', 'REAL'),
+    ('Close_Total', 'close_total', 'REAL'),
+    ('CLV_Spread', 'clv_spread', 'REAL'),
+    ('CLV_Total', 'clv_total', 'REAL'),
+]
+CSV_TO_DB = {c: d for c, d, _ in COLUMNS}
+CONF_COLUMNS = ['Moneyline Conf', 'Spread Conf', 'Total Conf']
+CLV_COLUMNS = ['Close_Spread', 'Close_Total', 'CLV_Spread', 'CLV_Total']
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS predictions (
+    {', '.join(f'{d} {t}' for _, d, t in COLUMNS)},
+    graded INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_start ON predictions (start_date);
+CREATE INDEX IF NOT EXISTS idx_predictions_graded ON predictions (graded, start_date);
+CREATE INDEX IF NOT EXISTS idx_predictions_updated ON predictions (graded, updated_at);
+"""
+
+
+def connect(path=PREDICTIONS_DB, readonly=False):
+    """
+    Open the store. Writers create the schema (and import the legacy CSV
+    the first time); read-only connections never block the writer.
+    """
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30, check_same_thread=False)
+        return conn
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    _migrate(conn)
+    if path == PREDICTIONS_DB and _count(conn) == 0 and os.path.exists(HISTORY_FILE):
+        imported = import_csv(conn, HISTORY_FILE)
+        print(f"   -> Imported {imported} rows from {HISTORY_FILE} into {path}")
+    return conn
+
+
+def _migrate(conn):
+    """Add columns introduced after a store was created."""
+    have = {r[1] for r in conn.execute("PRAGMA table_info(predictions)")}
+    with conn:
+        for _, d, t in COLUMNS:
+            if d not in have:
+                conn.execute(f"ALTER TABLE predictions ADD COLUMN {d} {t}")
+
+
+def _count(conn):
+    return conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+# --- TYPE CONVERSION ---
+def parse_conf(values):
+    """'58.4%' strings or 0-1 probabilities -> float probabilities ('N/A' -> NaN)."""
+    s = pd.Series(np.ravel(values), dtype=object)
+    is_pct = s.astype(str).str.endswith('%')
+    num = pd.to_numeric(s.astype(str).str.rstrip('%'), errors='coerce')
+    return np.where(is_pct, num / 100, num).astype(float)
+
+
+def parse_game_id(values):
+    """GameIDs from CSV round-trips ('401778332', 401778332.0, '401778332.0') -> Int64."""
+    return pd.to_numeric(pd.Series(np.ravel(values), dtype=object), errors='coerce').round().astype('Int64')
+
+
+def _db_frame(df):
+    """CSV-layout frame -> DB-typed frame (only the columns present)."""
+    df = df[[c for c in CSV_TO_DB if c in df.columns]].copy()
+    df['GameID'] = parse_game_id(df['GameID']).to_numpy()
+    df = df[df['GameID'].notna()].drop_duplicates('GameID', keep='first')
+    for col in CONF_COLUMNS:
+        if col in df:
+            df[col] = parse_conf(df[col])
+    for col in ['Manual_HomeScore', 'Manual_AwayScore']:
+        if col in df:
+            df[col] = pd.to_numeric(df[col], errors='coerce').round().astype('Int64')
+    return df.rename(columns=CSV_TO_DB)
+
+
+def _records(df):
+    """Rows as tuples of plain Python values (NaN/NA -> NULL)."""
+    out = df.astype(object).where(df.notna(), None)
+    return [tuple(v.item() if isinstance(v, np.generic) else v for v in row) for row in out.itertuples(index=False)]
+
+
+# --- WRITERS ---
+def upsert_predictions(conn, df):
+    """
+    Insert or update rows from a CSV-layout frame (score_slate output, or
+    backfilled history with scores). Rows with scores are graded first.
+    A pending prediction never overwrites a graded game, and rows whose
+    values are unchanged are left untouched. Returns rows written.
+    """
+    if df.empty:
+        return 0
+    if 'Manual_HomeScore' in df.columns:
+        df = grade_history(df)
+    data = _db_frame(df)
+    has_scores = 'home_score' in data.columns
+    data['graded'] = (data['home_score'].notna() & data['away_score'].notna()).astype(int) if has_scores else 0
+    data['updated_at'] = _now()
+
+    cols = list(data.columns)
+    changed = [c for c in cols if c not in ('game_id', 'updated_at')]
+    sql = (f"INSERT INTO predictions ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+           f"ON CONFLICT(game_id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in cols if c != 'game_id')} "
+           f"WHERE (predictions.graded = 0 OR excluded.graded = 1) "
+           f"AND ({' OR '.join(f'predictions.{c} IS NOT excluded.{c}' for c in changed)})")
+    with conn:
+        before = conn.total_changes
+        conn.executemany(sql, _records(data))
+        return conn.total_changes - before
+
+
+def delete_pending(conn, keep_ids=()):
+    """Drop ungraded predictions that weren't re-issued (games that left the slate)."""
+    keep = [int(i) for i in parse_game_id(list(keep_ids)).dropna()]
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (game_id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM keep_ids")
+        conn.executemany("INSERT OR IGNORE INTO keep_ids VALUES (?)", [(i,) for i in keep])
+        cur = conn.execute("DELETE FROM predictions WHERE graded = 0 AND game_id NOT IN (SELECT game_id FROM keep_ids)")
+        return cur.rowcount
+
+
+def game_ids(conn, graded):
+    """GameIDs of graded (True) or pending (False) rows, straight off the index."""
+    return [r[0] for r in conn.execute("SELECT game_id FROM predictions WHERE graded = ?", (int(graded),))]
+
+
+def graded_since(conn, since=None):
+    """
+    {GameID: updated_at} of graded rows written at or after `since` (an
+    updated_at stamp; None for all), straight off the (graded, updated_at) index.
+    """
+    if since is None:
+        rows = conn.execute("SELECT game_id, updated_at FROM predictions WHERE graded = 1")
+    else:
+        rows = conn.execute("SELECT game_id, updated_at FROM predictions WHERE graded = 1 AND updated_at >= ?", (since,))
+    return dict(rows.fetchall())
+
+
+def record_scores(conn, scores):
+    """
+    Write final scores {GameID: (home, away)} onto pending rows and grade
+    just those rows in place. Returns the newly graded rows (CSV layout).
+    """
+    pending = set(game_ids(conn, graded=False))
+    scores = {int(gid): s for gid, s in scores.items() if int(gid) in pending}
+    if not scores:
+        return read_predictions(conn, ids=[])
+    now = _now()
+    rows = [(int(h), int(a), now, gid) for gid, (h, a) in scores.items()]
+    with conn:
+        conn.executemany("UPDATE predictions SET home_score = ?, away_score = ?, graded = 1, updated_at = ? "
+                         "WHERE game_id = ? AND graded = 0", rows)
+        ids = [r[3] for r in rows]
+        graded = grade_history(read_predictions(conn, ids=ids))
+        results = graded[['Spread_Result', 'Total_Result', 'ML_Result']]
+        conn.executemany("UPDATE predictions SET spread_result = ?, total_result = ?, ml_result = ? WHERE game_id = ?",
+                         [r + (int(gid),) for r, gid in zip(_records(results), graded['GameID'])])
+    return graded
+
+
+def missing_clv_ids(conn, game_ids):
+    """
+    Graded games among `game_ids` (e.g. the snapshot season's games, whose
+    closes line_history can have) that don't have closing-line value yet.
+    """
+    ids = [int(i) for i in parse_game_id(list(game_ids)).dropna()]
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS season_ids (game_id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM season_ids")
+        conn.executemany("INSERT OR IGNORE INTO season_ids VALUES (?)", [(i,) for i in ids])
+    return [r[0] for r in conn.execute("SELECT game_id FROM predictions WHERE graded = 1 AND close_spread IS NULL "
+                                       "AND game_id IN (SELECT game_id FROM season_ids)")]
+
+
+def record_clv(conn, clv):
+    """Write Close_* / CLV_* columns (a line_history.clv frame); rows without a close are skipped."""
+    clv = clv[pd.notna(clv['Close_Spread']) | pd.notna(clv['Close_Total'])]
+    rows = [r[1:] + (int(r[0]),) for r in _records(clv[['GameID'] + CLV_COLUMNS])]
+    with conn:
+        conn.executemany(f"UPDATE predictions SET {', '.join(f'{CSV_TO_DB[c]} = ?' for c in CLV_COLUMNS)} "
+                         "WHERE game_id = ?", rows)
+    return len(rows)
+
+
+def import_csv(conn, path=HISTORY_FILE):
+    """Load a legacy live_predictions.csv into the store."""
+    try:
+        df = pd.read_csv(path)
+    except pd.errors.EmptyDataError:
+        return 0
+    return upsert_predictions(conn, df)
+
+
+# --- READERS ---
+def read_predictions(conn, graded=None, ids=None, formatted=False):
+    """
+    Predictions in the CSV column layout, pending first, by start date.
+    graded=True/False filters on graded status; `ids` selects games.
+    Typed by default (int GameID, 0-1 confidences); formatted=True gives
+    the exact CSV strings (GameID text, '58.4%').
+    """
+    where, params = [], []
+    if graded is not None:
+        where.append("graded = ?")
+        params.append(int(graded))
+    if ids is not None:
+        ids = [int(i) for i in ids]
+        where.append(f"game_id IN ({', '.join('?' * len(ids))})" if ids else "0")
+        params += ids
+    sql = (f"SELECT {', '.join(d for _, d, _ in COLUMNS)} FROM predictions"
+           f"{' WHERE ' + ' AND '.join(where) if where else ''} ORDER BY graded, start_date, game_id")
+    df = pd.read_sql_query(sql, conn, params=params)
+    df.columns = [c for c, _, _ in COLUMNS]
+    for col in ['GameID', 'Manual_HomeScore', 'Manual_AwayScore']:
+        df[col] = df[col].astype('Int64')
+    for col in CONF_COLUMNS:
+        df[col] = df[col].astype(float)
+    if formatted:
+        df['GameID'] = df['GameID'].astype(str)
+        for col in CONF_COLUMNS:
+            df[col] = np.where(df[col].notna(), df[col].map('{:.1%}'.format), None)
+    return df
+
+
+def export_csv(conn, path=HISTORY_FILE):
+    """Rewrite the compatibility CSV from the store (atomically)."""
+    df = read_predictions(conn, formatted=True)
+    tmp = f"{path}.tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return len(df)
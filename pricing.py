@@ -0,0 +1,252 @@
+import os
+import argparse
+import numpy as np
+import pandas as pd
+from config import VALID_BOOKS, PREDICTIONS_DB
+from strategy import american_payout, result_codes, simulate, STANDARD_ODDS
+from lines import board, market
+from snapshot import load_seasons
+import prediction_store as store
+from api import add_cli_flags
+
+# No-vig fair prices and expected value.
+# Each book's two-way prices (lines.board arrays) become implied
+# probabilities that are scaled to sum to 1 (proportional de-vig); the
+# consensus fair probability is their mean across books. Picks are then
+# priced at the best available odds: EV per $1 = p * payout - (1 - p),
+# edge = p - fair probability of the picked side. Everything is array math
+# over the whole slate or graded history.
+#
+# CFBD spreads/totals carry no juice, so a book only counts towards a
+# no-vig spread/total price where the feed quoted real prices on both sides;
+# otherwise the fair probability is the assumed -110/-110 coin flip and is
+# labelled that way. The model's probability is for the pick's own number
+# (the consensus line it was scored on), so spread/total picks are priced
+# only at books hanging that number, never at a better one.
+FAIR_NO_VIG = "no-vig"
+FAIR_ASSUMED = "assumed -110"
+
+# market -> (number field or None, side A price, side B price) in the board arrays
+TWO_WAY = {
+    'spread': ('spread', 'home_spread_price', 'away_spread_price'),   # A = home
+    'total': ('total', 'over_price', 'under_price'),                  # A = over
+    'ml': (None, 'home_ml', 'away_ml'),                               # A = home
+}
+
+
+def no_vig(price_a, price_b):
+    """
+    Fair probability of side A and the book's hold (overround) from two
+    American prices. NaN where either side is missing.
+    """
+    imp_a = 1.0 / (1.0 + american_payout(price_a, default=np.nan))
+    imp_b = 1.0 / (1.0 + american_payout(price_b, default=np.nan))
+    book = imp_a + imp_b
+    return imp_a / book, book - 1.0
+
+
+def _real_prices(b, mkt):
+    """Cells where a book quoted real prices on both sides of a market (and its number)."""
+    number, a, c = TWO_WAY[mkt]
+    if number is None:
+        return ~np.isnan(b[a]) & ~np.isnan(b[c])
+    return ~np.isnan(b[number]) & b[f'has_{a}'] & b[f'has_{c}']
+
+
+def fair_board(b):
+    """
+    Per-book fair side-A probability and hold, {market: (fair, hold)} of
+    (n_games, n_books) arrays; NaN where the book has no real two-sided price.
+    """
+    out = {}
+    for mkt, (number, a, c) in TWO_WAY.items():
+        fair, hold = no_vig(b[a], b[c])
+        real = _real_prices(b, mkt)
+        out[mkt] = (np.where(real, fair, np.nan), np.where(real, hold, np.nan))
+    return out
+
+
+def _nanmean(a):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        n = (~np.isnan(a)).sum(axis=1)
+        return np.where(n > 0, np.nansum(a, axis=1) / np.maximum(n, 1), np.nan)
+
+
+def fair_market(b):
+    """
+    One row per game: consensus fair probabilities (home spread, over, home
+    ML), mean hold and how many books had real two-sided prices.
+    """
+    fb = fair_board(b)
+    return pd.DataFrame({
+        'game_id': b['game_ids'],
+        'fair_home_spread': _nanmean(fb['spread'][0]), 'hold_spread': _nanmean(fb['spread'][1]),
+        'fair_over': _nanmean(fb['total'][0]), 'hold_total': _nanmean(fb['total'][1]),
+        'fair_home_ml': _nanmean(fb['ml'][0]), 'hold_ml': _nanmean(fb['ml'][1]),
+        'n_spread_books': (~np.isnan(fb['spread'][0])).sum(axis=1),
+        'n_total_books': (~np.isnan(fb['total'][0])).sum(axis=1),
+        'n_ml_books': (~np.isnan(fb['ml'][0])).sum(axis=1),
+    })
+
+
+def price_table(lines, books=VALID_BOOKS):
+    """lines.market() plus the fair_market() columns, one row per game."""
+    b = board(lines, books)
+    return pd.concat([market(b), fair_market(b).drop(columns='game_id')], axis=1)
+
+
+def pick_seasons(picks):
+    """CFB seasons of a picks frame from StartDate (January bowls belong to the prior season)."""
+    start = pd.to_datetime(picks['StartDate'], errors='coerce', utc=True).dropna()
+    return sorted(set(np.where(start.dt.month >= 8, start.dt.year, start.dt.year - 1).tolist()))
+
+
+def board_prices(picks, books=VALID_BOOKS):
+    """
+    lines.board for the seasons the picks belong to, from the season
+    snapshots (None if there are no lines). Warns when the board covers none
+    (or only part) of the picks, since pick_ev then falls back to -110 /
+    recorded odds.
+    """
+    if picks.empty:
+        return None
+    seasons = pick_seasons(picks)
+    snaps = load_seasons(seasons).values() if seasons else []
+    lines = [snap['lines'] for snap in snaps if not snap['lines'].empty]
+    b = board(pd.concat(lines, ignore_index=True), books) if lines else None
+
+    ids = store.parse_game_id(picks['GameID'])
+    quoted = b['game_ids'][(~np.isnan(b['spread'])).any(axis=1)] if b is not None else []
+    covered = ids.isin(set(quoted)).sum()
+    if covered == 0:
+        print(f"⚠️ No lines on the board for these picks (seasons {seasons}); using -110 and recorded odds.")
+    elif covered < len(picks):
+        print(f"⚠️ Lines found for {covered}/{len(picks)} picks; the rest use -110 and recorded odds.")
+    return b
+
+
+def pick_ev(picks, b=None):
+    """
+    EV of every pick in every market for a CSV-layout frame (score_slate
+    output, or pending/graded rows from the prediction store).
+    With a board (board_prices) each pick takes the best price among the
+    books quoting its own number (Pick_Line / Pick_Total; any book for the
+    moneyline), and its fair probability is the no-vig consensus of those
+    books' real two-sided prices. Without one, or where no book qualifies,
+    spread/total fall back to -110 and the moneyline to the recorded
+    Pick_ML_Odds; spread/total without real prices get the assumed -110 fair
+    probability. Returns {Spread,Total,ML}_{Prob,Odds,Book,Fair,Basis,Edge,EV},
+    Basis being "no-vig", "assumed -110" or None (no fair price).
+    """
+    ids = store.parse_game_id(picks['GameID'])
+    n = len(picks)
+    if b is not None and len(b['game_ids']):
+        rows = pd.Index(b['game_ids']).get_indexer(ids.to_numpy(dtype=float, na_value=np.nan))
+        # Each pick's game row of a board array; NaN / False where the board doesn't have it
+        take = lambda arr: np.where((rows >= 0)[:, None], arr[np.maximum(rows, 0)], np.nan if arr.dtype.kind == 'f' else False)
+        books = b['books']
+    else:
+        take, books = None, np.array([], dtype=object)
+
+    home = picks['HomeTeam'].to_numpy(dtype=object)
+    recorded_ml = pd.to_numeric(picks.get('Pick_ML_Odds', pd.Series(np.nan, index=picks.index)), errors='coerce')
+    number = lambda c: pd.to_numeric(picks[c], errors='coerce').to_numpy(dtype=float) if c in picks else np.full(n, np.nan)
+    # name -> (confidence column, market, picked side A, pick's number as side A's number, fallback odds)
+    legs = {
+        'Spread': ('Spread Conf', 'spread', picks['Pick_Team'].to_numpy(dtype=object) == home, STANDARD_ODDS),
+        'Total': ('Total Conf', 'total', (picks['Pick_Side'] == "OVER").to_numpy(), STANDARD_ODDS),
+        'ML': ('Moneyline Conf', 'ml', picks['Moneyline Pick'].to_numpy(dtype=object) == home,
+               recorded_ml.to_numpy(dtype=float)),
+    }
+    # The number each pick was scored on, in the board's side-A terms (home spread / total)
+    target = {'spread': np.where(legs['Spread'][2], number('Pick_Line'), -number('Pick_Line')),
+              'total': number('Pick_Total')}
+
+    out = {'GameID': ids.to_numpy()}
+    for name, (conf_col, mkt, side_a, fallback) in legs.items():
+        field, price_a, price_b = TWO_WAY[mkt]
+        prob = store.parse_conf(picks[conf_col])
+        if take is not None:
+            at_number = np.ones((n, len(books)), dtype=bool) if field is None else \
+                np.isclose(take(b[field]), target[mkt][:, None])
+            price = np.where(side_a[:, None], take(b[price_a]), take(b[price_b]))
+            offered = at_number & ~np.isnan(price)
+            payout = np.where(offered, american_payout(price, default=np.nan), -np.inf)
+            idx = payout.argmax(axis=1) if len(books) else np.zeros(n, dtype=int)
+            has = offered.any(axis=1)
+            best = np.where(has, price[np.arange(n), idx] if len(books) else np.nan, np.nan)
+            book = np.where(has, books[idx] if len(books) else None, None)
+            fair_cells = np.where(at_number & take(_real_prices(b, mkt)), no_vig(take(b[price_a]), take(b[price_b]))[0], np.nan)
+            fair_a = _nanmean(fair_cells)
+        else:
+            best, book, fair_a = np.full(n, np.nan), np.full(n, None, dtype=object), np.full(n, np.nan)
+
+        odds = np.where(np.isnan(best), fallback, best)
+        fair = np.where(side_a, fair_a, 1 - fair_a)
+        basis = np.where(np.isnan(fair), None, FAIR_NO_VIG).astype(object)
+        if field is not None:
+            # No real two-sided price: the market is taken as the standard -110 both ways
+            basis = np.where(np.isnan(fair), FAIR_ASSUMED, basis)
+            fair = np.where(np.isnan(fair), 0.5, fair)
+        out[f'{name}_Prob'] = prob
+        out[f'{name}_Odds'] = odds
+        out[f'{name}_Book'] = book
+        out[f'{name}_Fair'] = fair
+        out[f'{name}_Basis'] = basis
+        out[f'{name}_Edge'] = prob - fair
+        out[f'{name}_EV'] = prob * american_payout(odds, default=np.nan) - (1 - prob)
+    return pd.DataFrame(out)
+
+
+def ev_backtest(history, min_ev=0.0):
+    """Flat-stake results of graded picks whose EV clears `min_ev`, per market."""
+    ev = pick_ev(history)
+    rows = []
+    for name, result_col in [('Spread', 'Spread_Result'), ('Total', 'Total_Result'), ('ML', 'ML_Result')]:
+        sim = simulate(ev[f'{name}_EV'].to_numpy() > min_ev, result_codes(history[result_col]),
+                       odds=ev[f'{name}_Odds'].to_numpy())
+        rows.append({'market': name, 'bets': int(sim['bets']), 'win_rate': float(sim['win_rate']),
+                     'profit': float(sim['profit']), 'roi': float(sim['roi'])})
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank pending picks by EV and backtest EV > 0 on graded history.")
+    add_cli_flags(parser)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    print("--- 💵 NO-VIG PRICING & EV ---")
+    if not os.path.exists(PREDICTIONS_DB):
+        print(f"Error: {PREDICTIONS_DB} not found. Run predict.py first!")
+        return
+    conn = store.connect(readonly=True)
+    pending = store.read_predictions(conn, graded=False)
+    history = store.read_predictions(conn, graded=True)
+    conn.close()
+
+    if not pending.empty:
+        ev = pick_ev(pending, board_prices(pending))
+        legs = pd.concat([
+            pd.DataFrame({'Game': pending['Game'].to_numpy(), 'Pick': pending[pick].to_numpy(),
+                          'Prob': ev[f'{name}_Prob'], 'Odds': ev[f'{name}_Odds'], 'Book': ev[f'{name}_Book'],
+                          'Fair': ev[f'{name}_Fair'], 'Basis': ev[f'{name}_Basis'], 'EV': ev[f'{name}_EV']})
+            for name, pick in [('Spread', 'Spread Pick'), ('Total', 'Total Pick'), ('ML', 'Moneyline Pick')]
+        ], ignore_index=True).dropna(subset=['EV']).sort_values('EV', ascending=False)
+        print(f"{'GAME':<30} | {'PICK':<22} | {'PROB':<6} | {'ODDS':>5} | {'BOOK':<12} | {'FAIR':<6} | EV")
+        for _, r in legs.head(args.top).iterrows():
+            book = r['Book'] if isinstance(r['Book'], str) else "-"
+            fair = f"{r['Fair']:.1%}" + ("*" if r['Basis'] == FAIR_ASSUMED else "") if pd.notna(r['Fair']) else "-"
+            print(f"{r['Game']:<30} | {r['Pick']:<22} | {r['Prob']:<6.1%} | {r['Odds']:>+5.0f} | {book:<12} | "
+                  f"{fair:<6} | {r['EV']:+.3f}")
+        print(f"   * {FAIR_ASSUMED}: no book quoted real prices on both sides")
+    else:
+        print("   -> No pending picks.")
+
+    if not history.empty:
+        print("\n--- Graded history, EV > 0 at recorded odds (flat stakes) ---")
+        print(ev_backtest(history).to_string(index=False, float_format=lambda x: f"{x:.1f}"))
+
+
+if __name__ == "__main__":
+    main()
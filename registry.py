@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import hashlib
+import joblib
+import numpy as np
+from functools import lru_cache
+from datetime import datetime
+from forest import export_forest, save_packed, load_packed
+
+# Versioned model registry.
+# models/{name}/v0001/model.joblib  (uncompressed, so it can be memory-mapped)
+# models/{name}/v0001/meta.json     (features, data hash, metrics, train time, ...)
+# models/{name}/v0001/packed/       (forests only: flat arrays for forest.PackedForest)
+# models/{name}/LATEST              (the version consumers get by default)
+# Writers never overwrite an old version; readers load lazily and share one
+# in-process copy per version through an LRU.
+REGISTRY_DIR = os.getenv("CFB_MODEL_REGISTRY", "models")
+CACHE_SIZE = int(os.getenv("CFB_MODEL_CACHE", 8))
+
+# Pre-registry pickles, used when a model has never been registered
+LEGACY_FILES = {
+    'spread': "model_spread_tuned.pkl",
+    'total': "model_total.pkl",
+    'winner': "model_winner.pkl",
+}
+
+
+def data_hash(*arrays):
+    """Short sha256 of the training data (features + targets)."""
+    h = hashlib.sha256()
+    for arr in arrays:
+        arr = np.ascontiguousarray(np.asarray(arr))
+        h.update(str((arr.dtype, arr.shape)).encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()[:16]
+
+
+def _model_dir(name):
+    return os.path.join(REGISTRY_DIR, name)
+
+
+def versions(name):
+    """All registered versions of a model, oldest first."""
+    try:
+        return sorted(v for v in os.listdir(_model_dir(name)) if v.startswith("v"))
+    except FileNotFoundError:
+        return []
+
+
+def latest(name):
+    try:
+        with open(os.path.join(_model_dir(name), "LATEST")) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        found = versions(name)
+        return found[-1] if found else None
+
+
+def save_model(name, model, features, data=None, metrics=None, train_seconds=None, source=None):
+    """
+    Register a fitted model as a new version and point LATEST at it.
+    `data` is a tuple of arrays hashed into the metadata (e.g. (X, y)).
+    Returns the version string.
+    """
+    features = [str(f) for f in features]
+    # One convention for every writer: feature_names_in_ holds the column order
+    model.feature_names_in_ = np.array(features, dtype=object)
+
+    existing = versions(name)
+    version = f"v{int(existing[-1][1:]) + 1 if existing else 1:04d}"
+    path = os.path.join(_model_dir(name), version)
+    os.makedirs(path)
+
+    joblib.dump(model, os.path.join(path, "model.joblib"))  # uncompressed -> mmap-able
+    if hasattr(model, 'estimators_') and hasattr(model.estimators_[0], 'tree_'):
+        save_packed(export_forest(model), os.path.join(path, "packed"))
+    meta = {
+        'name': name,
+        'version': version,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        'estimator': type(model).__name__,
+        'params': {k: v for k, v in model.get_params().items() if isinstance(v, (int, float, str, bool, type(None)))},
+        'features': features,
+        'data_hash': data_hash(*data) if data is not None else None,
+        'n_rows': int(len(data[0])) if data is not None else None,
+        'metrics': {k: float(v) for k, v in (metrics or {}).items()},
+        'train_seconds': round(train_seconds, 3) if train_seconds is not None else None,
+    }
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    tmp = os.path.join(_model_dir(name), "LATEST.tmp")
+    with open(tmp, "w") as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(_model_dir(name), "LATEST"))
+    return version
+
+
+def read_meta(name, version=None):
+    version = version or latest(name)
+    with open(os.path.join(_model_dir(name), version, "meta.json")) as f:
+        return json.load(f)
+
+
+def find_version(name, features):
+    """Newest version trained on exactly this feature list (or None)."""
+    for version in reversed(versions(name)):
+        if read_meta(name, version)['features'] == list(features):
+            return version
+    return None
+
+
+class ModelHandle:
+    """
+    Registry entry whose estimator is only unpickled on first use.
+    Exposes the metadata right away and forwards predict/predict_proba,
+    scoring through the packed forest arrays when the version has them.
+    """
+    def __init__(self, name, version, meta, path):
+        self.name = name
+        self.version = version
+        self.meta = meta
+        self.path = path
+        self._model = None
+        self._packed = None
+
+    @property
+    def features(self):
+        return self.meta['features']
+
+    @property
+    def model(self):
+        if self._model is None:
+            start = time.perf_counter()
+            # Node/value arrays are memory-mapped straight from the file
+            self._model = joblib.load(self.path, mmap_mode='r' if self.version else None)
+            self.meta['load_seconds'] = time.perf_counter() - start
+            if not self.meta.get('features'):
+                self.meta['features'] = list(getattr(self._model, 'feature_names_in_', []))
+        return self._model
+
+    @property
+    def packed(self):
+        """The mmap-backed PackedForest for this version, or None."""
+        if self._packed is None and self.version:
+            path = os.path.join(os.path.dirname(self.path), "packed")
+            self._packed = load_packed(path) if os.path.isdir(path) else False
+        return self._packed or None
+
+    def predict_proba(self, X):
+        if self.packed is not None:
+            return self.packed.predict_proba(X)
+        return self.model.predict_proba(X)
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _handle(name, version):
+    if version is None:
+        # Legacy single-file pickle; metadata comes from the model itself on load
+        path = LEGACY_FILES.get(name, f"{name}.pkl")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No registered versions of '{name}' and no {path}")
+        handle = ModelHandle(name, None, {'name': name, 'version': None, 'features': []}, path)
+        handle.model  # features are only known after loading
+        return handle
+    return ModelHandle(name, version, read_meta(name, version),
+                       os.path.join(_model_dir(name), version, "model.joblib"))
+
+
+def load_model(name, version=None):
+    """
+    Lazy handle for a registered model (LATEST by default). Repeated calls in
+    one process return the same handle, so consumers share a single copy.
+    Falls back to the pre-registry pickle when nothing is registered.
+    """
+    return _handle(name, version or latest(name))
@@ -1,14 +1,12 @@
 import os
-import time
 import pandas as pd
-import requests
-import joblib
+import time
 from sklearn.ensemble import RandomForestClassifier
-from dotenv import load_dotenv
+from snapshot import load_seasons, game_records, srs_lookup, talent_lookup, first_line_lookup
+from matrix import shared_matrix, memory_report
+from registry import save_model
 
-load_dotenv()
-API_KEY = os.getenv("CFBD_API_KEY")
-HEADERS = {"Authorization": f"Bearer {API_KEY}", "Accept": "application/json"}
+N_JOBS = int(os.getenv("CFB_WORKERS", -1))
 
 # V1 FEATURES (The Winning Formula)
 FEATURES = [
@@ -17,34 +15,18 @@ FEATURES = [
     'home_srs_rating', 'away_srs_rating'
 ]
 
-def fetch_with_retry(endpoint, params):
-    url = f"https://api.collegefootballdata.com{endpoint}"
-    for attempt in range(1, 4):
-        try:
-            res = requests.get(url, headers=HEADERS, params=params)
-            if res.status_code == 200: return res.json()
-            elif res.status_code == 429: time.sleep(10 * attempt)
-        except: time.sleep(5)
-    return []
-
 def main():
     print("--- 🧠 RESTORING V1 BRAIN (TALENT + SRS) ---")
     
     all_games = []
+    # Season snapshots (built once, then loaded from disk)
+    snaps = load_seasons([2024, 2025])
     
-    for year in [2024, 2025]:
-        games = fetch_with_retry("/games", {"year": year, "seasonType": "both"})
-        lines = fetch_with_retry("/lines", {"year": year, "seasonType": "both"})
-        srs = fetch_with_retry("/ratings/srs", {"year": year})
-        talent = fetch_with_retry("/talent", {"year": year})
-        
-        line_map = {}
-        if isinstance(lines, list):
-            for g in lines:
-                if g.get('lines'): line_map[str(g['id'])] = g['lines'][0]
-        
-        srs_map = {x['team']: x['rating'] for x in srs} if isinstance(srs, list) else {}
-        tal_map = {x.get('school', x.get('team')): x['talent'] for x in talent} if isinstance(talent, list) else {}
+    for year, snap in snaps.items():
+        games = game_records(snap)
+        srs_map = srs_lookup(snap)
+        tal_map = talent_lookup(snap)
+        line_map = first_line_lookup(snap)
 
         if isinstance(games, list):
             for g in games:
@@ -53,8 +35,8 @@ def main():
                 
                 home = g.get('home_team') or g.get('homeTeam')
                 away = g.get('away_team') or g.get('awayTeam')
-                h_pts = g.get('home_points') or g.get('homePoints')
-                a_pts = g.get('away_points') or g.get('awayPoints')
+                h_pts = g['home_points']
+                a_pts = g['away_points']
                 
                 if not home or not away or h_pts is None or a_pts is None: continue
 
@@ -77,31 +59,38 @@ def main():
 
     if not all_games: return
     df = pd.DataFrame(all_games)
-    X = df[FEATURES]
+    # One float32 memmap shared by all three fits (and any worker processes)
+    X = shared_matrix(df, "retrain_X", FEATURES)
     
     # Train Spread
     y_cover = ((df['home_points'] + df['spread']) > df['away_points']).astype(int)
-    model_spread = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42)
+    model_spread = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42, n_jobs=N_JOBS)
+    start = time.time()
     model_spread.fit(X, y_cover)
+    model_spread_secs = time.time() - start
     
     # Train Winner
     y_win = (df['home_points'] > df['away_points']).astype(int)
-    model_win = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42)
+    model_win = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42, n_jobs=N_JOBS)
+    start = time.time()
     model_win.fit(X, y_win)
+    model_win_secs = time.time() - start
     
     # Train Total
     y_total = ((df['home_points'] + df['away_points']) > df['overUnder']).astype(int)
-    model_total = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42)
+    model_total = RandomForestClassifier(n_estimators=100, max_depth=5, random_state=42, n_jobs=N_JOBS)
+    start = time.time()
     model_total.fit(X, y_total)
+    model_total_secs = time.time() - start
     
-    for m in [model_spread, model_win, model_total]:
-        m.feature_names_in_ = FEATURES
-    
-    joblib.dump(model_spread, "model_spread_tuned.pkl")
-    joblib.dump(model_win, "model_winner.pkl")
-    joblib.dump(model_total, "model_total.pkl")
+    for name, model, y, secs in [("spread", model_spread, y_cover, model_spread_secs),
+                                 ("winner", model_win, y_win, model_win_secs),
+                                 ("total", model_total, y_total, model_total_secs)]:
+        version = save_model(name, model, FEATURES, data=(X, y.to_numpy()), train_seconds=secs, source="retrain.py")
+        print(f"   -> {name}: {version}")
     
     print("✅ SUCCESS: V1 Models Restored.")
+    memory_report("retrain")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
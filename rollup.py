@@ -0,0 +1,258 @@
+import os
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from config import ROLLUP_FILE
+from strategy import american_payout, result_codes
+import prediction_store as store
+from prediction_store import parse_conf
+from snapshot import load_seasons
+from api import add_cli_flags
+
+# Materialized performance rollup.
+# One row per (season, season_type, week, market, conf_bucket, conference, book)
+# holding bets / wins / losses / pushes / units (profit in 1-unit stakes).
+# The grading step folds in each newly graded game exactly once (the file keeps
+# a ledger of rolled-up GameIDs with their store updated_at stamp and a hash of
+# their bets, so only rows written since the last sync are read and regraded
+# games trigger a rebuild), and readers slice records and ROI in O(rollup size)
+# however long the pick history gets.
+KEYS = ['season', 'season_type', 'week', 'market', 'conf_bucket', 'conference', 'book']
+METRICS = ['bets', 'wins', 'losses', 'pushes', 'units']
+
+# market -> (result column, confidence column, odds column or None for standard -110)
+MARKETS = {
+    'spread': ('Spread_Result', 'Spread Conf', None),
+    'total': ('Total_Result', 'Total Conf', None),
+    'ml': ('ML_Result', 'Moneyline Conf', 'Pick_ML_Odds'),
+}
+CONF_EDGES = [55, 60, 65, 70]
+CONF_LABELS = np.array(["50-55%", "55-60%", "60-65%", "65-70%", "70%+"], dtype=object)
+CONSENSUS_BOOK = "consensus"
+# Bumped when rolled-up keys change meaning; older files are rebuilt
+LEDGER_VERSION = 2
+
+
+def conf_bucket(conf):
+    """'57.3%' strings or 0-1 probabilities -> bucket labels; unparseable -> None."""
+    pct = parse_conf(conf) * 100
+    out = CONF_LABELS[np.digitize(np.nan_to_num(pct), CONF_EDGES)]
+    return np.where(np.isnan(pct), None, out)
+
+
+def game_info(snap):
+    """Season / week / conference per GameID from a season snapshot."""
+    g = snap['games']
+    home, away = g['home_conference'].astype(object), g['away_conference'].astype(object)
+    # Conference games roll up under their conference; everything else is non-conference
+    conference = np.where(pd.notna(home) & (home == away), home, "Non-conference")
+    return pd.DataFrame({
+        'season': g['season'].astype(float).to_numpy(),
+        'season_type': g['season_type'].astype(object).to_numpy(),
+        'week': g['week'].astype(float).to_numpy(),
+        'conference': conference,
+    }, index=pd.Index(g['id'].astype(str), name='GameID'))
+
+
+def game_seasons(history):
+    """CFB season of each row from its StartDate (January bowls belong to the prior season)."""
+    start = pd.to_datetime(history['StartDate'], errors='coerce', utc=True)
+    return np.where(start.dt.month >= 8, start.dt.year, start.dt.year - 1)
+
+
+def season_info(history, snaps=None):
+    """
+    game_info for every row from its own season's snapshot. `snaps`
+    ({season: snapshot}) are used as given; other seasons are loaded.
+    """
+    seasons = {int(s) for s in game_seasons(history) if not np.isnan(s)}
+    snaps = dict(snaps or {})
+    missing = sorted(seasons - set(snaps))
+    if missing:
+        snaps.update(load_seasons(missing))
+    infos = [game_info(snaps[s]) for s in sorted(seasons) if not snaps[s]['games'].empty]
+    return pd.concat(infos) if infos else None
+
+
+def bet_rows(history, info=None):
+    """
+    Graded history -> one row per (game, market) bet with its rollup keys.
+    Games missing from `info` fall back to the StartDate's season and week 0.
+    """
+    graded = history[history['Manual_HomeScore'].notna()]
+    if graded.empty:
+        return pd.DataFrame(columns=['GameID'] + KEYS + METRICS)
+
+    ids = graded['GameID'].astype(str)
+    info = (info if info is not None else pd.DataFrame(columns=['season', 'season_type', 'week', 'conference'])).reindex(ids)
+    fallback_season = game_seasons(graded)
+    season = pd.to_numeric(info['season'], errors='coerce').to_numpy(dtype=float)
+    base = {
+        'GameID': ids.to_numpy(),
+        'season': np.where(np.isnan(season), fallback_season, season).astype(float),
+        'season_type': info['season_type'].fillna("unknown").to_numpy(dtype=object),
+        'week': pd.to_numeric(info['week'], errors='coerce').fillna(0).to_numpy(dtype=float),
+        'conference': info['conference'].fillna("Unknown").to_numpy(dtype=object),
+        'book': graded['Book'].fillna(CONSENSUS_BOOK).to_numpy(dtype=object) if 'Book' in graded else CONSENSUS_BOOK,
+    }
+
+    frames = []
+    for market, (res_col, conf_col, odds_col) in MARKETS.items():
+        if res_col not in graded:
+            continue
+        code = result_codes(graded[res_col])
+        payout = american_payout(graded[odds_col] if odds_col in graded else np.nan)
+        frame = pd.DataFrame({**base, 'market': market,
+                              'conf_bucket': conf_bucket(graded[conf_col]) if conf_col in graded else None,
+                              'bets': 1, 'wins': (code > 0).astype(int), 'losses': (code < 0).astype(int),
+                              'pushes': (code == 0).astype(int),
+                              'units': np.where(code > 0, payout, np.where(code < 0, -1.0, 0.0))})
+        frames.append(frame[~np.isnan(code)])
+    bets = pd.concat(frames, ignore_index=True)
+    bets['conf_bucket'] = bets['conf_bucket'].fillna("unknown")
+    bets[['season', 'week']] = bets[['season', 'week']].astype(int)
+    return bets[['GameID'] + KEYS + METRICS]
+
+
+def aggregate(bets):
+    """Sum bet rows (or rollup rows) by the rollup keys."""
+    if bets.empty:
+        return pd.DataFrame(columns=KEYS + METRICS)
+    return bets.groupby(KEYS, as_index=False, sort=True)[METRICS].sum()
+
+
+def game_signatures(bets):
+    """
+    GameID -> hash of that game's bets (market, confidence, book, result,
+    units), used to spot regraded games. The `info` keys are left out so a
+    different snapshot season doesn't look like a regrade.
+    """
+    if bets.empty:
+        return {}
+    rows = pd.util.hash_pandas_object(bets[['market', 'conf_bucket', 'book'] + METRICS], index=False)
+    sig = rows.groupby(bets['GameID'].to_numpy()).sum()
+    return {gid: f"{h:016x}" for gid, h in sig.items()}
+
+
+# --- STORAGE ---
+def load_rollup(path=ROLLUP_FILE):
+    """(rollup table, {GameID: [updated_at, signature]} of the games already rolled up)."""
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=KEYS + METRICS), {}
+    with open(path) as f:
+        data = json.load(f)
+    # Older files folded other seasons' games in as week 0 / "Unknown" and
+    # have no stamps: treat them as empty so the next sync rebuilds them
+    if data.get('version') != LEDGER_VERSION:
+        return pd.DataFrame(columns=KEYS + METRICS), {}
+    return pd.DataFrame(data['rows'], columns=KEYS + METRICS), data['games']
+
+
+def save_rollup(table, games, path=ROLLUP_FILE):
+    data = {'version': LEDGER_VERSION, 'rows': table.to_dict('records'), 'games': dict(sorted(games.items()))}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, default=lambda v: v.item())
+    os.replace(tmp, path)
+
+
+def update_rollup(history, info=None, path=ROLLUP_FILE, stamps=None):
+    """
+    Fold graded games that aren't in the rollup yet into it. Games already
+    rolled up are skipped, so this is safe to run after every grading pass.
+    If a rolled-up game comes back with different scores or results (e.g.
+    re-upserted by backfill.py), the rollup is rebuilt from `history`, which
+    must then be the full graded history (sync_rollup takes care of that).
+    `stamps` ({GameID: updated_at}) are kept in the ledger for sync_rollup.
+    Returns (rollup table, number of games added or revised).
+    """
+    table, games = load_rollup(path)
+    stamps = {str(g): t for g, t in (stamps or {}).items()}
+    bets = bet_rows(history, info)
+    sigs = game_signatures(bets)
+    entries = {g: [stamps.get(g, games.get(g, [None])[0]), sig] for g, sig in sigs.items()}
+    new_ids = set(sigs) - set(games)
+    revised = {g for g in set(sigs) & set(games) if games[g][1] is not None and games[g][1] != sigs[g]}
+    if revised:
+        table = aggregate(bets[KEYS + METRICS])
+        save_rollup(table, {**games, **entries}, path)
+        return table, len(new_ids) + len(revised)
+
+    # Nothing new, and no signatures or stamps to record for games already rolled up
+    if not new_ids and all(games[g] == e for g, e in entries.items()) and os.path.exists(path):
+        return table, 0
+
+    new = bets[bets['GameID'].isin(new_ids)]
+    parts = [t for t in (table, new[KEYS + METRICS]) if not t.empty]
+    table = aggregate(pd.concat(parts, ignore_index=True)) if parts else table
+    save_rollup(table, {**games, **entries}, path)
+    return table, len(new_ids)
+
+
+def sync_rollup(conn, snaps=None, path=ROLLUP_FILE):
+    """
+    Bring the rollup up to date with the prediction store, reading only the
+    graded rows written since the newest stamp in the ledger (new grades and
+    backfill re-upserts) rather than the whole history. The full graded
+    history is read only when one of them turns out to be a regrade.
+    Week and conference come from each game's own season snapshot
+    (`snaps` {season: snapshot} are reused, other seasons are loaded).
+    Returns (rollup table, number of games added or revised).
+    """
+    table, games = load_rollup(path)
+    ledger_stamps = [v[0] for v in games.values()]
+    since = max(ledger_stamps) if ledger_stamps and None not in ledger_stamps else None
+    stamps = {str(g): t for g, t in store.graded_since(conn, since).items()}
+    changed = {g: t for g, t in stamps.items() if games.get(g, [None])[0] != t}
+    if not changed and os.path.exists(path):
+        return table, 0
+
+    part = store.read_predictions(conn, ids=list(changed)) if since is not None else store.read_predictions(conn, graded=True)
+    info = season_info(part, snaps)
+    sigs = game_signatures(bet_rows(part, info))
+    if any(games.get(g, [None, None])[1] not in (None, sig) for g, sig in sigs.items()):
+        history = store.read_predictions(conn, graded=True)
+        return update_rollup(history, season_info(history, snaps), path, store.graded_since(conn))
+    return update_rollup(part, info, path, changed)
+
+
+# --- READERS ---
+def summarize(table, by=('market',), **filters):
+    """
+    Records and ROI from the rollup, grouped by `by` after equality filters
+    (e.g. summarize(t, by=['week'], season=2025, market='spread')).
+    """
+    for col, value in filters.items():
+        if value is not None:
+            table = table[table[col] == value]
+    out = table.groupby(list(by), as_index=False, sort=True)[METRICS].sum()
+    decided = out['wins'] + out['losses']
+    out['win_pct'] = np.where(decided > 0, out['wins'] / decided.where(decided > 0, 1) * 100, 0.0)
+    out['roi'] = np.where(out['bets'] > 0, out['units'] / out['bets'].where(out['bets'] > 0, 1) * 100, 0.0)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or inspect the performance rollup.")
+    add_cli_flags(parser)
+    parser.add_argument("--rebuild", action="store_true", help="Recompute from the full prediction history")
+    args = parser.parse_args()
+
+    print("--- 📊 PERFORMANCE ROLLUP ---")
+    if args.rebuild:
+        conn = store.connect(readonly=True)
+        if os.path.exists(ROLLUP_FILE):
+            os.remove(ROLLUP_FILE)
+        table, added = sync_rollup(conn)
+        conn.close()
+        print(f"   -> Rolled up {added} graded games into {len(table)} rows")
+
+    table, games = load_rollup()
+    print(f"   -> {len(games)} games, {len(table)} rollup rows")
+    if not table.empty:
+        print(summarize(table, by=['market']).round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,14 +15,14 @@ source "$VENV_PATH"
 cd "$PROJECT_DIR"
 
 echo "Step 1: Updating Data & Calculating Decay..."
-python3 features.py
+python3 features.py "$@"
 
 echo "Step 2: Retraining Leak-Proof Models..."
 python3 model.py
 
 echo "Step 3: Generating Live Predictions..."
 # Capture output to file AND print to screen
-python3 predict.py | tee "$OUTPUT_FILE"
+python3 predict.py "$@" | tee "$OUTPUT_FILE"
 
 echo ""
 echo "✅ Pipeline Complete."
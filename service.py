@@ -0,0 +1,249 @@
+"""
+Local prediction service: keeps models, SRS/talent maps and consensus lines
+warm in memory and answers matchup queries over HTTP.
+
+    python service.py --port 8700 --year 2025 --refresh-minutes 15
+    curl 'http://127.0.0.1:8700/predict?home=Ohio%20State&away=Michigan'
+    curl 'http://127.0.0.1:8700/predict?home=Texas&away=Rice&spread=-27.5&total=51.5'
+    curl 'http://127.0.0.1:8700/slate'
+    curl -X POST -d '{"games": [{"home": "Texas", "away": "Rice"}]}' http://127.0.0.1:8700/predict
+
+Endpoints:
+    GET  /health    model versions, last refresh, games on the slate
+    GET  /slate     the scored upcoming slate (same columns as live_predictions.csv)
+    GET  /predict   one matchup (home, away; optional spread, total)
+    POST /predict   a batch: {"games": [{"home", "away", "spread", "total"}, ...]}
+    POST /refresh   reload the snapshot and models now
+"""
+import argparse
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+import requests
+
+from config import CURRENT_SEASON
+from predict import build_slate, score_slate, pick_columns, SCENARIOS
+from registry import load_model
+from snapshot import load_season, srs_lookup, talent_lookup
+from api import add_cli_flags
+
+MODEL_NAMES = ['spread', 'total', 'winner']
+GAME_FIELDS = ['id', 'start_date', 'home_team', 'away_team', 'spread', 'overUnder', 'best_home_ml', 'best_away_ml']
+SERVICE_URL = "http://127.0.0.1:8700"
+
+
+# --- WARM STATE ---
+class Engine:
+    """Everything a prediction needs, rebuilt off to the side and swapped in whole."""
+    def __init__(self, year, scenarios=SCENARIOS):
+        self.year = year
+        self.scenarios = scenarios
+        self.state = None
+        self.lock = threading.Lock()  # one refresh at a time; readers never wait
+
+    def refresh(self):
+        start = time.time()
+        with self.lock:
+            snap = load_season(self.year)
+            models = {name: load_model(name) for name in MODEL_NAMES}
+            feat_cols = list(models['spread'].features)
+            slate = build_slate(snap, self.scenarios)
+            scored = score_slate(slate, models['spread'], models['total'], models['winner'], feat_cols)
+
+            self.state = {
+                'models': models,
+                'feat_cols': feat_cols,
+                'srs': srs_lookup(snap),
+                'talent': talent_lookup(snap),
+                # Upcoming games by (home, away), with consensus lines
+                'games': {(r['home_team'], r['away_team']): r for r in slate[GAME_FIELDS].to_dict('records')},
+                'scored': _records(scored),
+                'refreshed': datetime.now().isoformat(timespec='seconds'),
+                'refresh_seconds': round(time.time() - start, 3),
+            }
+        return self.state
+
+    def matchups(self, games):
+        """
+        Score ad-hoc matchups. Lines come from the request, else the slate's consensus.
+        Plain dicts and numpy only (no DataFrames), so one game costs well under a millisecond.
+        """
+        state = self.state
+        rows = []
+        for g in games:
+            home, away = str(g['home']), str(g['away'])
+            row = dict(state['games'].get((home, away)) or
+                       {'id': None, 'start_date': None, 'home_team': home, 'away_team': away, 'spread': np.nan,
+                        'overUnder': np.nan, 'best_home_ml': np.nan, 'best_away_ml': np.nan})
+            for param, col in [('spread', 'spread'), ('total', 'overUnder')]:
+                if g.get(param) not in (None, ""):
+                    row[col] = float(g[param])
+            if pd.isna(row['spread']) or pd.isna(row['overUnder']):
+                raise ValueError(f"No line for {away} @ {home}; pass spread and total")
+            row['home_talent_score'] = state['talent'].get(home, 10)
+            row['away_talent_score'] = state['talent'].get(away, 10)
+            row['home_srs_rating'] = state['srs'].get(home, 0)
+            row['away_srs_rating'] = state['srs'].get(away, 0)
+            rows.append(row)
+
+        X = np.array([[float(r[c]) for c in state['feat_cols']] for r in rows])
+        probs = [_proba(state['models'][name], X, state['feat_cols']) for name in ['spread', 'total', 'winner']]
+        col = lambda k: [r[k] for r in rows]
+        cols = pick_columns([None if i is None else str(i) for i in col('id')], col('home_team'), col('away_team'),
+                            col('start_date'), col('spread'), col('overUnder'),
+                            col('best_home_ml'), col('best_away_ml'), *probs)
+        return [{k: _plain(v[i]) for k, v in cols.items()} for i in range(len(rows))]
+
+
+def _proba(handle, X, feat_cols):
+    """P(class 1) through the packed forest when the model has one, else sklearn."""
+    if handle.packed is not None:
+        return handle.packed.predict_proba(X)[:, 1]
+    return handle.predict_proba(pd.DataFrame(X, columns=feat_cols))[:, 1]
+
+
+def _plain(value):
+    """numpy scalar -> JSON-safe Python value (NaN -> null)."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _records(df):
+    """DataFrame -> JSON-safe list of dicts (NaN -> null)."""
+    if df.empty:
+        return []
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def refresh_loop(engine, minutes):
+    while True:
+        time.sleep(minutes * 60)
+        try:
+            state = engine.refresh()
+            print(f"   -> Refreshed {len(state['scored'])} slate games in {state['refresh_seconds']}s")
+        except Exception as e:
+            # Keep serving the last good state
+            print(f"   ⚠️ Refresh failed: {e}")
+
+
+# --- HTTP ---
+ENGINE = None
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body):
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        state = ENGINE.state
+
+        if url.path == "/health":
+            self._send(200, {
+                "status": "ok", "season": ENGINE.year, "refreshed": state['refreshed'],
+                "refresh_seconds": state['refresh_seconds'], "slate_games": len(state['scored']),
+                "models": {name: h.version for name, h in state['models'].items()},
+            })
+        elif url.path == "/slate":
+            self._send(200, state['scored'])
+        elif url.path == "/predict":
+            if "home" not in params or "away" not in params:
+                self._send(400, {"message": "home and away are required"})
+                return
+            self._predict([params], single=True)
+        else:
+            self._send(404, {"message": f"Unknown endpoint: {url.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send(400, {"message": "Body must be JSON"})
+            return
+
+        if url.path == "/predict":
+            self._predict(body.get("games", []), single=False)
+        elif url.path == "/refresh":
+            state = ENGINE.refresh()
+            self._send(200, {"refreshed": state['refreshed'], "slate_games": len(state['scored'])})
+        else:
+            self._send(404, {"message": f"Unknown endpoint: {url.path}"})
+
+    def _predict(self, games, single):
+        try:
+            picks = ENGINE.matchups(games) if games else []
+        except (ValueError, KeyError) as e:
+            self._send(400, {"message": str(e)})
+            return
+        self._send(200, picks[0] if single else picks)
+
+
+# --- CLIENT ---
+def query(path, params=None, games=None, url=SERVICE_URL, timeout=2.0, session=None):
+    """
+    Call a running service. Returns parsed JSON, or None if it isn't reachable.
+    Pass a requests.Session to reuse one keep-alive connection across calls.
+    """
+    http = session or requests
+    try:
+        if games is not None:
+            r = http.post(f"{url}{path}", json={"games": games}, timeout=timeout)
+        else:
+            r = http.get(f"{url}{path}", params=params, timeout=timeout)
+    except requests.exceptions.RequestException:
+        return None
+    return r.json() if r.ok else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local CFB prediction service.")
+    add_cli_flags(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--year", type=int, default=CURRENT_SEASON)
+    parser.add_argument("--refresh-minutes", type=float, default=15.0, help="Snapshot/model reload interval")
+    args = parser.parse_args()
+
+    global ENGINE
+    print("--- 🛰️ CFB PREDICTION SERVICE ---")
+    ENGINE = Engine(args.year)
+    state = ENGINE.refresh()
+    print(f"   -> Season {args.year}: {len(state['scored'])} slate games, "
+          f"models {', '.join(f'{n} {h.version}' for n, h in state['models'].items())}")
+    threading.Thread(target=refresh_loop, args=(ENGINE, args.refresh_minutes), daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+    print(f"   -> Listening on http://{args.host}:{args.port} (refresh every {args.refresh_minutes:g} min)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+import os
+import json
+import time
+import pandas as pd
+from api import fetch_many, REFRESH
+from config import CURRENT_SEASON
+
+# Season snapshots: one normalized, columnar copy of a season's games, lines,
+# SRS and talent per (year, seasonType), shared by every script.
+SNAPSHOT_DIR = os.getenv("CFBD_SNAPSHOT_DIR", "snapshots")
+TABLES = ["games", "lines", "srs", "talent"]
+
+GAME_COLUMNS = {
+    'id': ['id'],
+    'season': ['season'],
+    'week': ['week'],
+    'season_type': ['seasonType', 'season_type'],
+    'start_date': ['startDate', 'start_date'],
+    'completed': ['completed'],
+    'neutral_site': ['neutralSite', 'neutral_site'],
+    'home_team': ['homeTeam', 'home_team'],
+    'away_team': ['awayTeam', 'away_team'],
+    'home_conference': ['homeConference', 'home_conference'],
+    'away_conference': ['awayConference', 'away_conference'],
+    'home_points': ['homePoints', 'home_points'],
+    'away_points': ['awayPoints', 'away_points'],
+}
+LINE_FIELDS = ['provider', 'spread', 'overUnder', 'homeMoneyline', 'awayMoneyline', 'spreadOpen', 'overUnderOpen']
+
+
+def _pick(d, keys):
+    for k in keys:
+        if d.get(k) is not None:
+            return d[k]
+    return None
+
+
+def normalize_games(games):
+    rows = [{col: _pick(g, keys) for col, keys in GAME_COLUMNS.items()} for g in games if isinstance(g, dict)]
+    df = pd.DataFrame(rows, columns=list(GAME_COLUMNS))
+    df['id'] = df['id'].astype('int64')
+    for col in ['season', 'week', 'home_points', 'away_points']:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+    df['completed'] = df['completed'].eq(True)
+    df['neutral_site'] = df['neutral_site'].eq(True)
+    for col in ['season_type', 'start_date', 'home_team', 'away_team', 'home_conference', 'away_conference']:
+        df[col] = df[col].astype('string')
+    return df.drop_duplicates(subset=['id'], keep='last').reset_index(drop=True)
+
+
+def normalize_lines(lines):
+    """Flatten /lines into one row per (game, provider), keeping provider order."""
+    rows = []
+    for g in lines:
+        if not isinstance(g, dict):
+            continue
+        for rank, line in enumerate(g.get('lines') or []):
+            row = {'game_id': g.get('id'), 'season_type': g.get('seasonType'), 'week': g.get('week'), 'book_rank': rank}
+            row.update({f: line.get(f) for f in LINE_FIELDS})
+            rows.append(row)
+    df = pd.DataFrame(rows, columns=['game_id', 'season_type', 'week', 'book_rank'] + LINE_FIELDS)
+    df['game_id'] = df['game_id'].astype('int64')
+    df['week'] = pd.to_numeric(df['week'], errors='coerce').astype('Int64')
+    df['book_rank'] = df['book_rank'].astype('int16')
+    df['season_type'] = df['season_type'].astype('string')
+    df['provider'] = df['provider'].astype('category')
+    for f in LINE_FIELDS[1:]:
+        df[f] = pd.to_numeric(df[f], errors='coerce').astype('float64')
+    return df
+
+
+def normalize_srs(srs):
+    rows = [{'team': x.get('team'), 'rating': x.get('rating')} for x in srs if isinstance(x, dict)]
+    return pd.DataFrame(rows, columns=['team', 'rating']).astype({'team': 'string', 'rating': 'float64'})
+
+
+def normalize_talent(talent):
+    rows = [{'team': x.get('school', x.get('team')), 'talent': x.get('talent')} for x in talent if isinstance(x, dict)]
+    return pd.DataFrame(rows, columns=['team', 'talent']).astype({'team': 'string', 'talent': 'float64'})
+
+
+def _snapshot_path(year, season_type):
+    return os.path.join(SNAPSHOT_DIR, f"{year}_{season_type}")
+
+
+def _read(year, season_type):
+    path = _snapshot_path(year, season_type)
+    try:
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        snap = {t: pd.read_parquet(os.path.join(path, f"{t}.parquet")) for t in TABLES}
+    except (OSError, ValueError):
+        return None
+    snap['manifest'] = manifest
+    return snap
+
+
+def _write(year, season_type, snap):
+    path = _snapshot_path(year, season_type)
+    os.makedirs(path, exist_ok=True)
+    for t in TABLES:
+        tmp_path = os.path.join(path, f"{t}.parquet.tmp")
+        snap[t].to_parquet(tmp_path, index=False, compression="zstd")
+        os.replace(tmp_path, os.path.join(path, f"{t}.parquet"))
+    manifest = {
+        "year": year,
+        "season_type": season_type,
+        "built_at": time.time(),
+        "games": len(snap['games']),
+        "pending_weeks": [list(w) for w in _pending_weeks(year, season_type, snap['games'])],
+    }
+    with open(os.path.join(path, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    snap['manifest'] = manifest
+
+
+def _pending_weeks(year, season_type, games):
+    """
+    (seasonType, week) pairs that still have games to be played, from the
+    games' own completed flags, so a past season with postponed games or
+    late bowls keeps being refetched until they are final.
+    """
+    open_games = games[~games['completed']]
+    pending = set(zip(open_games['season_type'].astype(str), open_games['week'].astype(int)))
+    # Bowl matchups are announced late, so keep polling postseason until it is final
+    post = games[games['season_type'] == 'postseason']
+    if season_type in ("both", "postseason") and (year >= CURRENT_SEASON or pending) and (post.empty or not post['completed'].all()):
+        pending.add(('postseason', 1))
+    return sorted(pending)
+
+
+def _full_requests(year, season_type):
+    return [
+        ("/games", {"year": year, "seasonType": season_type}),
+        ("/lines", {"year": year, "seasonType": season_type}),
+        ("/ratings/srs", {"year": year}),
+        ("/talent", {"year": year}),
+    ]
+
+
+def _week_requests(year, pending):
+    batch = []
+    for stype, week in pending:
+        batch += [("/games", {"year": year, "seasonType": stype, "week": week}),
+                  ("/lines", {"year": year, "seasonType": stype, "week": week})]
+    return batch + [("/ratings/srs", {"year": year}), ("/talent", {"year": year})]
+
+
+def _apply_week_update(snap, pending, results):
+    """
+    Replace the pending weeks with their refetched games and lines. A week
+    whose /games call failed or came back empty keeps its stored games and
+    lines (and stays pending); its lines are likewise kept if /lines failed.
+    """
+    games, lines = snap['games'], snap['lines']
+    new_games, new_lines = [], []
+    stale_games = pd.Series(False, index=games.index)
+    stale_lines = pd.Series(False, index=games.index)
+    for i, (stype, week) in enumerate(pending):
+        week_games, week_lines = results[2 * i], results[2 * i + 1]
+        if not (isinstance(week_games, list) and week_games):
+            print(f"      ⚠️ No games returned for {stype} week {week}; keeping stored data.")
+            continue
+        in_week = (games['season_type'] == stype) & (games['week'] == week)
+        new_games += week_games
+        stale_games |= in_week
+        if isinstance(week_lines, list):
+            new_lines += week_lines
+            stale_lines |= in_week
+    srs, talent = results[-2], results[-1]
+
+    fresh_games = normalize_games(new_games)
+    fresh_lines = normalize_lines(new_lines)
+    game_ids = set(games.loc[stale_games, 'id']) | set(fresh_games['id'])
+    line_ids = set(games.loc[stale_lines, 'id']) | set(fresh_lines['game_id'])
+
+    snap['games'] = pd.concat([games[~games['id'].isin(game_ids)], fresh_games], ignore_index=True)
+    kept_lines = lines[~lines['game_id'].isin(line_ids)]
+    snap['lines'] = pd.concat([kept_lines, fresh_lines], ignore_index=True) if len(fresh_lines) else kept_lines.reset_index(drop=True)
+    snap['lines']['provider'] = snap['lines']['provider'].astype('category')
+    if isinstance(srs, list) and srs:
+        snap['srs'] = normalize_srs(srs)
+    if isinstance(talent, list) and talent:
+        snap['talent'] = normalize_talent(talent)
+    return snap
+
+
+def load_seasons(years, season_type="both", refresh=REFRESH, live=()):
+    """
+    Load snapshots for several seasons. Missing snapshots are built and
+    in-progress seasons are updated week-by-week, all in one concurrent batch.
+    Endpoints in `live` (e.g. ("/lines",)) skip the response cache.
+    Returns {year: snapshot}.
+    """
+    snaps, plans, batch = {}, [], []
+    for year in years:
+        year = int(year)
+        snap = None if refresh else _read(year, season_type)
+        if snap is None:
+            reqs = _full_requests(year, season_type)
+            plans.append((year, "full", None, len(reqs)))
+        else:
+            pending = [tuple(w) for w in _pending_weeks(year, season_type, snap['games'])]
+            snaps[year] = snap
+            if not pending:
+                continue
+            reqs = _week_requests(year, pending)
+            plans.append((year, "weeks", pending, len(reqs)))
+        batch += reqs
+
+    results = fetch_many(batch, refresh=set(live)) if batch else []
+    pos = 0
+    for year, kind, pending, n in plans:
+        chunk = results[pos:pos + n]
+        pos += n
+        if kind == "full":
+            games, lines, srs, talent = [c if isinstance(c, list) else [] for c in chunk]
+            if not games:
+                print(f"      ⚠️ No games returned for {year}; snapshot not saved.")
+                snaps[year] = {'games': normalize_games([]), 'lines': normalize_lines([]),
+                               'srs': normalize_srs([]), 'talent': normalize_talent([]), 'manifest': {}}
+                continue
+            snap = {'games': normalize_games(games), 'lines': normalize_lines(lines),
+                    'srs': normalize_srs(srs), 'talent': normalize_talent(talent)}
+        else:
+            snap = _apply_week_update(snaps[year], pending, chunk)
+        _write(year, season_type, snap)
+        snaps[year] = snap
+    return snaps
+
+
+def load_season(year, season_type="both", refresh=REFRESH, live=()):
+    return load_seasons([year], season_type, refresh, live)[int(year)]
+
+
+# --- LOOKUP HELPERS ---
+# These rebuild the dicts the scripts used to construct from raw JSON.
+def srs_lookup(snap):
+    return dict(zip(snap['srs']['team'].astype(str), snap['srs']['rating']))
+
+
+def talent_lookup(snap):
+    return dict(zip(snap['talent']['team'].astype(str), snap['talent']['talent']))
+
+
+def _line_records(df):
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict('records')
+
+
+def lines_lookup(snap, books=None):
+    """{game_id (str): [line dicts in provider order]}, optionally filtered to books."""
+    lines = snap['lines']
+    if books is not None:
+        lines = lines[lines['provider'].isin(books)]
+    lines = lines.sort_values(['game_id', 'book_rank'])
+    out = {}
+    for gid, group in lines.groupby('game_id', sort=False):
+        out[str(gid)] = _line_records(group[LINE_FIELDS])
+    return out
+
+
+def first_line_lookup(snap, books=None):
+    """{game_id (str): first available line}, same as taking valid[0] from /lines."""
+    lines = snap['lines']
+    if books is not None:
+        lines = lines[lines['provider'].isin(books)]
+    first = lines.sort_values(['game_id', 'book_rank']).drop_duplicates('game_id')
+    return dict(zip(first['game_id'].astype(str), _line_records(first[LINE_FIELDS])))
+
+
+def game_records(snap, completed=None):
+    """Games as plain dicts (ints/None instead of NA), optionally filtered on completion."""
+    games = snap['games']
+    if completed is not None:
+        games = games[games['completed'] == completed]
+    games = games.astype(object).where(games.notna(), None)
+    return games.to_dict('records')
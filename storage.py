@@ -0,0 +1,103 @@
+import os
+import json
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Columnar storage for the cfb_training_data_* chain.
+# Tables are zstd Parquet with a metadata block describing which columns
+# belong to which feature group, so readers ask for "srs" or "decay"
+# columns instead of guessing from column names.
+SCHEMA_VERSION = 1
+META_KEY = b"cfb_analytics"
+
+
+def table_path(name):
+    return name if name.endswith(".parquet") else f"{name}.parquet"
+
+
+def _csv_path(name):
+    return name[:-len(".parquet")] + ".csv" if name.endswith(".parquet") else f"{name}.csv"
+
+
+def write_table(df, name, groups=None, parent=None):
+    """
+    Write a stage's output. `groups` maps group name -> column list for the
+    columns this stage adds; groups from `parent` (the stage's input table)
+    are carried forward so the full lineage stays in the metadata.
+    """
+    all_groups = {}
+    if parent is not None:
+        all_groups.update(read_metadata(parent).get("groups", {}))
+    all_groups.update(groups or {})
+    # Drop columns that no longer exist (e.g. removed by a merge)
+    all_groups = {g: [c for c in cols if c in df.columns] for g, cols in all_groups.items()}
+
+    meta = {
+        "schema_version": SCHEMA_VERSION,
+        "name": os.path.basename(name),
+        "parent": parent,
+        "written_at": time.time(),
+        "rows": len(df),
+        "groups": all_groups,
+    }
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), META_KEY: json.dumps(meta).encode("utf-8")})
+
+    path = table_path(name)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_metadata(name):
+    """Metadata block of a stored table ({} for legacy CSVs)."""
+    path = table_path(name)
+    if not os.path.exists(path):
+        if os.path.exists(_csv_path(name)):
+            return {}
+        raise FileNotFoundError(path)
+    raw = (pq.read_schema(path).metadata or {}).get(META_KEY)
+    meta = json.loads(raw) if raw else {}
+    if meta.get("schema_version", SCHEMA_VERSION) > SCHEMA_VERSION:
+        raise ValueError(f"{path} was written with schema v{meta['schema_version']}; "
+                         f"this code reads up to v{SCHEMA_VERSION}.")
+    return meta
+
+
+def table_columns(name):
+    path = table_path(name)
+    if os.path.exists(path):
+        return pq.read_schema(path).names
+    return pd.read_csv(_csv_path(name), nrows=0).columns.tolist()
+
+
+def read_table(name, columns=None, groups=None):
+    """
+    Load a stage table, reading only the requested columns and/or groups.
+    Falls back to the old CSV if the Parquet file has not been written yet.
+    Raises FileNotFoundError if neither exists, and KeyError for columns or
+    groups the table doesn't have (legacy CSVs have no groups at all).
+    """
+    wanted = None
+    if columns is not None or groups is not None:
+        wanted = list(columns or [])
+        if groups:
+            meta_groups = read_metadata(name).get("groups", {})
+            unknown = [g for g in groups if g not in meta_groups]
+            if unknown:
+                raise KeyError(f"Groups not in {name} metadata: {unknown}")
+            for g in groups:
+                wanted += meta_groups[g]
+        wanted = list(dict.fromkeys(wanted))
+        have = set(table_columns(name))
+        missing = [c for c in wanted if c not in have]
+        if missing:
+            raise KeyError(f"Columns not in {name}: {missing}")
+
+    path = table_path(name)
+    if os.path.exists(path):
+        return pq.read_table(path, columns=wanted).to_pandas()
+    return pd.read_csv(_csv_path(name), usecols=wanted)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# Vectorized betting-strategy simulator.
+# Takes model probabilities and outcomes as arrays and returns bet masks,
+# per-bet P&L, cumulative equity, drawdown and ROI without any row loops.
+# Masks may be 2-D (one row per strategy) to simulate many strategies at once.
+
+STANDARD_ODDS = -110
+STAKE = 100.0
+_CODES = {"WIN": 1.0, "LOSS": -1.0, "PUSH": 0.0}
+
+
+def american_payout(odds, default=STANDARD_ODDS):
+    """Profit per $1 staked at American odds. Missing/zero odds use `default` (-110)."""
+    odds = pd.to_numeric(pd.Series(np.ravel(odds)), errors='coerce').to_numpy(dtype=float).reshape(np.shape(odds))
+    odds = np.where(np.isnan(odds) | (odds == 0), default, odds)
+    return np.where(odds > 0, odds / 100.0, 100.0 / np.abs(odds))
+
+
+def bet_mask(prob, threshold=0.55, inclusive=False):
+    """Bet whenever the model's confidence max(p, 1-p) clears the threshold."""
+    prob = np.asarray(prob, dtype=float)
+    conf = np.maximum(prob, 1 - prob)
+    threshold = np.asarray(threshold, dtype=float)
+    if threshold.ndim == 1:
+        threshold = threshold[:, None]
+    return conf >= threshold if inclusive else conf > threshold
+
+
+def side_outcome(prob, home_outcome):
+    """+1 / -1 for the side the model picked (home if p > 0.5), given 1/0 home outcomes. NaN stays NaN."""
+    home_outcome = np.asarray(home_outcome, dtype=float)
+    pick_home = np.asarray(prob, dtype=float) > 0.5
+    won = np.where(pick_home, home_outcome, 1 - home_outcome)
+    return np.where(np.isnan(home_outcome), np.nan, 2 * won - 1)
+
+
+def result_codes(results):
+    """WIN / LOSS / PUSH strings -> +1 / -1 / 0 (anything else is NaN = ungraded)."""
+    return pd.Series(np.ravel(results), dtype=object).map(_CODES).to_numpy(dtype=float)
+
+
+def simulate(mask, outcome, odds=None, stake=STAKE):
+    """
+    Settle every bet in `mask` (shape (n,) or (k, n)) against `outcome`
+    (+1 win, -1 loss, 0 push, NaN ungraded), in row order.
+    Wins pay `stake` at `odds` (American; -110 where missing), losses cost `stake`.
+    `stake` may be a scalar or an array broadcastable to the mask (e.g. Kelly sizing).
+    """
+    outcome = np.asarray(outcome, dtype=float)
+    placed = np.asarray(mask, dtype=bool) & ~np.isnan(outcome)
+    payout = american_payout(STANDARD_ODDS if odds is None else odds)
+
+    pnl = np.where(outcome > 0, stake * payout, np.where(outcome < 0, -stake, 0.0))
+    pnl = np.where(placed, pnl, 0.0)
+    wagered = np.where(placed, stake, 0.0).sum(axis=-1)
+    equity = np.cumsum(pnl, axis=-1)
+    drawdown = equity - np.maximum(np.maximum.accumulate(equity, axis=-1), 0.0)
+
+    bets = placed.sum(axis=-1)
+    wins = (placed & (outcome > 0)).sum(axis=-1)
+    losses = (placed & (outcome < 0)).sum(axis=-1)
+    profit = pnl.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        roi = np.where(wagered > 0, profit / wagered * 100, 0.0)
+        win_rate = np.where(wins + losses > 0, wins / (wins + losses) * 100, 0.0)
+
+    return {
+        'placed': placed, 'pnl': pnl, 'equity': equity, 'drawdown': drawdown,
+        'bets': bets, 'wins': wins, 'losses': losses, 'pushes': bets - wins - losses,
+        'wagered': wagered, 'profit': profit, 'roi': roi, 'win_rate': win_rate,
+        'max_drawdown': -drawdown.min(axis=-1) if pnl.shape[-1] else np.zeros(pnl.shape[:-1]),
+    }
+
+
+def bet_equity(sim):
+    """Equity after each placed bet, starting at 0 (1-D simulations only)."""
+    return np.concatenate([[0.0], sim['equity'][sim['placed']]])
+
+
+def implied_prob(odds=None, default=STANDARD_ODDS):
+    """Break-even win probability at American odds (vig included)."""
+    return 1.0 / (1.0 + american_payout(odds, default))
+
+
+def kelly_fraction(prob, odds=None):
+    """Full-Kelly bankroll fraction f* = (b*p - q) / b at the given odds (never negative)."""
+    b = american_payout(STANDARD_ODDS if odds is None else odds)
+    prob = np.asarray(prob, dtype=float)
+    return np.maximum((b * prob - (1 - prob)) / b, 0.0)
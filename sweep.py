@@ -0,0 +1,108 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+from strategy import result_codes, implied_prob, kelly_fraction, simulate
+
+# Strategy parameter sweep over a graded history file.
+# Every (threshold x market x Kelly fraction x min edge) variant is simulated
+# in one broadcast numpy pass per market; no per-variant or per-row loops.
+
+# --- CONFIG ---
+DEFAULT_FILE = "backtest_2025.csv"
+THRESHOLDS = np.round(np.arange(0.50, 0.705, 0.005), 3)
+KELLY_FRACTIONS = np.array([0.0, 0.1, 0.25, 0.5, 1.0])  # 0.0 = flat BET_SIZE stakes
+MIN_EDGES = np.round(np.arange(0.0, 0.105, 0.01), 2)
+BANKROLL = 1000
+BET_SIZE = 100
+MIN_BETS = 20  # variants with fewer bets are left out of the Pareto table
+
+# market -> (confidence column, result column, odds column or None for -110)
+MARKETS = {
+    'spread': ('Spread Conf', 'Spread_Result', None),
+    'total': ('Total Conf', 'Total_Result', None),
+    'moneyline': ('Moneyline Conf', 'ML_Result', 'Pick_ML_Odds'),
+}
+
+
+def _pct(col):
+    """'58.4%' strings -> 0.584 (N/A / missing -> NaN)."""
+    return pd.to_numeric(col.astype(str).str.rstrip('%'), errors='coerce').to_numpy(dtype=float) / 100.0
+
+
+def sweep_market(df, market, thresholds=THRESHOLDS, fractions=KELLY_FRACTIONS, min_edges=MIN_EDGES):
+    """Simulate the full parameter grid for one market. Returns one row per variant."""
+    conf_col, result_col, odds_col = MARKETS[market]
+    if conf_col not in df.columns or result_col not in df.columns:
+        return pd.DataFrame()
+
+    prob = _pct(df[conf_col])
+    outcome = result_codes(df[result_col])
+    odds = df[odds_col].to_numpy(dtype=float) if odds_col and odds_col in df.columns else None
+    edge = prob - implied_prob(odds)
+
+    # Grid axes: (threshold, kelly fraction, min edge, game)
+    T, F, E = np.ix_(thresholds, fractions, min_edges)
+    mask = (prob > T[..., None]) & (edge >= E[..., None])
+    kelly = BANKROLL * F[..., None] * kelly_fraction(prob, odds)
+    stake = np.where(F[..., None] > 0, kelly, float(BET_SIZE))
+    mask = mask & (stake > 0)
+    sim = simulate(mask, outcome, odds=odds, stake=stake)
+
+    grid = np.stack(np.meshgrid(thresholds, fractions, min_edges, indexing='ij'), axis=-1).reshape(-1, 3)
+    out = pd.DataFrame(grid, columns=['threshold', 'kelly_fraction', 'min_edge'])
+    out.insert(1, 'market', market)
+    for key in ['bets', 'wins', 'losses', 'pushes', 'wagered', 'profit', 'roi', 'win_rate', 'max_drawdown']:
+        out[key] = np.asarray(sim[key]).reshape(-1)
+    return out
+
+
+def pareto_front(cube, min_bets=MIN_BETS):
+    """Variants not beaten on both ROI (higher) and max drawdown (lower)."""
+    c = cube[cube['bets'] >= min_bets].sort_values(['max_drawdown', 'roi'], ascending=[True, False])
+    # Walking up the drawdown axis, keep only strictly better ROI
+    best = np.maximum.accumulate(c['roi'].to_numpy())
+    keep = np.r_[True, c['roi'].to_numpy()[1:] > best[:-1]] if len(c) else np.array([], dtype=bool)
+    return c[keep].reset_index(drop=True)
+
+
+def main():
+    # api.py's --refresh/--record/--replay flags aren't file names
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    path = args[0] if args else DEFAULT_FILE
+    print("--- 🧪 STRATEGY PARAMETER SWEEP ---")
+    try:
+        df = pd.read_csv(path)
+    except FileNotFoundError:
+        print(f"Error: {path} not found. Run honest_backfill.py or predict.py first!")
+        return
+
+    # Equity/drawdown follow the order bets were actually placed
+    if 'StartDate' in df.columns:
+        df = df.sort_values('StartDate', kind='mergesort').reset_index(drop=True)
+
+    start = time.time()
+    cube = pd.concat([sweep_market(df, m) for m in MARKETS], ignore_index=True)
+    elapsed = time.time() - start
+    if cube.empty:
+        print("❌ No graded picks with confidence values found.")
+        return
+
+    base = path.rsplit('.', 1)[0]
+    cube.to_csv(f"{base}_sweep.csv", index=False)
+    front = pareto_front(cube)
+    front.to_csv(f"{base}_pareto.csv", index=False)
+
+    print(f"   -> {len(cube):,} variants over {len(df)} picks in {elapsed:.2f}s")
+    print(f"\n--- 🏆 PARETO FRONT: ROI vs MAX DRAWDOWN (min {MIN_BETS} bets) ---")
+    print(f"{'MARKET':<10} | {'THRESH':<6} | {'KELLY':<5} | {'EDGE':<5} | {'BETS':<5} | {'WIN %':<6} | {'ROI':<7} | {'MAX DD':<9}")
+    print("-" * 75)
+    for _, r in front.iterrows():
+        print(f"{r['market']:<10} | {r['threshold']:<6.3f} | {r['kelly_fraction']:<5.2f} | {r['min_edge']:<5.2f} | "
+              f"{int(r['bets']):<5} | {r['win_rate']:>5.1f}% | {r['roi']:>6.1f}% | ${r['max_drawdown']:.2f}")
+
+    print(f"\n✅ SUCCESS: Results cube saved to {base}_sweep.csv, Pareto table to {base}_pareto.csv")
+
+
+if __name__ == "__main__":
+    main()
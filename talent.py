@@ -1,33 +1,16 @@
-import os
-import requests
 import pandas as pd
-import time
-from dotenv import load_dotenv
-
-load_dotenv()
-API_KEY = os.getenv("CFBD_API_KEY")
-HEADERS = {"Authorization": f"Bearer {API_KEY}", "Accept": "application/json"}
-
-def get_data(endpoint, params):
-    url = f"https://api.collegefootballdata.com{endpoint}"
-    try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        time.sleep(0.5)
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return []
+from api import get_data
+from storage import read_table, write_table
 
 def main():
     print("--- 🌟 INJECTING TEAM TALENT COMPOSITE 🌟 ---")
     
     # 1. Load Data
     try:
-        df = pd.read_csv("cfb_training_data_final.csv")
+        df = read_table("cfb_training_data_final")
         print(f"Loaded {len(df)} games.")
     except FileNotFoundError:
-        print("Error: cfb_training_data_final.csv not found. Run power.py first!")
+        print("Error: cfb_training_data_final not found. Run power.py first!")
         return
 
     # 2. Fetch Talent
@@ -88,8 +71,9 @@ def main():
     df['away_talent_score'] = df['away_talent_score'].fillna(10.0)
     
     # 4. Save
-    output_filename = "cfb_training_data_ultimate.csv"
-    df.to_csv(output_filename, index=False)
+    output_filename = write_table(df, "cfb_training_data_ultimate",
+                                  groups={'talent': ['home_talent_score', 'away_talent_score']},
+                                  parent="cfb_training_data_final")
     print(f"\nSUCCESS: Saved ultimate dataset to {output_filename}")
     print("New Columns: ['home_talent_score', 'away_talent_score']")
 
@@ -0,0 +1,136 @@
+import os
+import gzip
+import json
+import time
+import tempfile
+import threading
+from email.utils import formatdate
+import pytest
+import api
+
+def _age(endpoint, params, seconds):
+    """Backdate a cache entry's fetched_at."""
+    path = api._cache_path(api.cache_key(endpoint, params))
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        entry = json.load(f)
+    entry["fetched_at"] -= seconds
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(entry, f)
+    return entry
+
+def test_response_cache():
+    print("Testing on-disk response cache...")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(api, "CACHE_DIR", tempfile.mkdtemp())
+        mp.setattr(api, "CACHE_ENABLED", True)
+        mp.setattr(api, "REFRESH", False)
+        mp.setattr(api, "CURRENT_SEASON", 2025)
+        mp.setattr(api, "CACHE_STATS", {"hits": 0, "misses": 0, "expired": 0, "bypassed": 0})
+
+        # Atomic write round-trips, leaving no temp files behind
+        data = [{"id": 1, "homeTeam": "Texas", "completed": True}]
+        assert api.cache_get("/games", {"year": 2024}) is None
+        api.cache_put("/games", {"year": 2024}, data)
+        assert api.cache_get("/games", {"year": 2024}) == data
+        files = [f for _, _, fs in os.walk(api.CACHE_DIR) for f in fs]
+        assert len(files) == 1 and files[0].endswith(".json.gz")
+
+        # Past seasons never expire; current-season data expires after its TTL
+        api.cache_put("/ratings/srs", {"year": 2024}, [{"team": "Texas"}])
+        api.cache_put("/ratings/srs", {"year": 2025}, [{"team": "Texas"}])
+        week = 7 * 24 * 60 * 60
+        _age("/ratings/srs", {"year": 2024}, week)
+        _age("/ratings/srs", {"year": 2025}, week)
+        assert api.cache_get("/ratings/srs", {"year": 2024}) == [{"team": "Texas"}]
+        assert api.cache_get("/ratings/srs", {"year": 2025}) is None
+        ttl = api.CACHE_TTL["/lines"]
+        api.cache_put("/lines", {"year": 2025, "week": 3}, [{"id": 1, "homeScore": None, "awayScore": None}])
+        _age("/lines", {"year": 2025, "week": 3}, ttl - 60)
+        assert api.cache_get("/lines", {"year": 2025, "week": 3}) is not None
+        _age("/lines", {"year": 2025, "week": 3}, 120)
+        assert api.cache_get("/lines", {"year": 2025, "week": 3}) is None
+
+        # Current-season /games is frozen only once every game in it is completed
+        open_week = [{"id": 1, "completed": True}, {"id": 2, "completed": False}]
+        api.cache_put("/games", {"year": 2025, "week": 3}, open_week)
+        assert not _age("/games", {"year": 2025, "week": 3}, week)["immutable"]
+        assert api.cache_get("/games", {"year": 2025, "week": 3}) is None
+        final_week = [{"id": 1, "completed": True}, {"id": 2, "completed": True}]
+        api.cache_put("/games", {"year": 2025, "week": 3}, final_week)
+        assert _age("/games", {"year": 2025, "week": 3}, week)["immutable"]
+        assert api.cache_get("/games", {"year": 2025, "week": 3}) == final_week
+
+        # refresh=True (or --refresh) skips the read but still stores the new response
+        calls = []
+        def fake_request(endpoint, params):
+            calls.append(endpoint)
+            return api.cassette.ReplayResponse(200, json.dumps([{"id": 1, "completed": True, "fresh": True}]))
+        mp.setattr(api, "_request", fake_request)
+        mp.setattr(api, "API_KEY", "x")
+        assert api.fetch_with_retry("/games", {"year": 2024}) == data and calls == []
+        assert api.fetch_with_retry("/games", {"year": 2024}, refresh=True)[0]["fresh"] and calls == ["/games"]
+        assert api.cache_get("/games", {"year": 2024})[0]["fresh"]
+        mp.setattr(api, "REFRESH", True)
+        assert api.cache_get("/games", {"year": 2024}) is None
+        assert api.CACHE_STATS["bypassed"] == 2 and api.CACHE_STATS["expired"] == 3
+
+    print("✅ Response Cache Verified.")
+
+def test_concurrent_fetch():
+    print("Testing token bucket, Retry-After and fetch_many...")
+    # Retry-After as delta-seconds or an HTTP date; missing or garbage -> default
+    headers = lambda value: api.cassette.ReplayResponse(429, "", {"Retry-After": value} if value else {})
+    assert api._retry_after(headers("7"), default=10) == 7.0
+    assert 28 <= api._retry_after(headers(formatdate(time.time() + 30, usegmt=True)), default=10) <= 30
+    assert api._retry_after(headers(formatdate(time.time() - 30, usegmt=True)), default=10) == 0.0
+    assert api._retry_after(headers(None), default=10) == 10
+    assert api._retry_after(headers("soon"), default=10) == 10
+
+    # A pause (a 429 seen by one thread) holds back every thread, even with tokens to spare
+    bucket = api.TokenBucket(rate=1000, capacity=5)
+    start = time.monotonic()
+    bucket.pause(0.3)
+    done = []
+    threads = [threading.Thread(target=lambda: (bucket.wait(), done.append(time.monotonic() - start))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(done) == 4 and min(done) >= 0.29
+
+    with pytest.MonkeyPatch.context() as mp:
+        calls = []
+        lock = threading.Lock()
+        def fake_request(endpoint, params):
+            with lock:
+                calls.append((endpoint, params["week"]))
+            time.sleep(0.01 * (5 - params["week"]))  # later requests finish first
+            return api.cassette.ReplayResponse(200, json.dumps({"endpoint": endpoint, "week": params["week"]}))
+        mp.setattr(api, "_request", fake_request)
+        mp.setattr(api, "API_KEY", "x")
+        mp.setattr(api, "REFRESH", False)
+        mp.setattr(api, "CACHE_ENABLED", False)
+        mp.setattr(api, "CACHE_STATS", {"hits": 0, "misses": 0, "expired": 0, "bypassed": 0})
+
+        # Results come back in input order; duplicates are sent once
+        batch = [("/games", {"year": 2025, "week": w}) for w in [1, 2, 3, 2, 4, 1]]
+        results = api.fetch_many(batch, max_workers=4)
+        assert [r["week"] for r in results] == [1, 2, 3, 2, 4, 1]
+        assert sorted(calls) == [("/games", w) for w in [1, 2, 3, 4]]
+
+        # refresh as a collection of endpoints bypasses the cache for just those
+        mp.setattr(api, "CACHE_ENABLED", True)
+        mp.setattr(api, "CACHE_DIR", tempfile.mkdtemp())
+        api.cache_put("/games", {"year": 2024, "week": 1}, {"cached": True})
+        api.cache_put("/lines", {"year": 2024, "week": 1}, {"cached": True})
+        calls.clear()
+        games, lines = api.fetch_many([("/games", {"year": 2024, "week": 1}), ("/lines", {"year": 2024, "week": 1})],
+                                      refresh={"/lines"})
+        assert games == {"cached": True} and lines == {"endpoint": "/lines", "week": 1}
+        assert calls == [("/lines", 1)]
+
+    print("✅ Concurrent Fetch Verified.")
+
+if __name__ == "__main__":
+    test_response_cache()
+    test_concurrent_fetch()
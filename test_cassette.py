@@ -0,0 +1,33 @@
+import time
+import tempfile
+import pytest
+import api
+import cassette
+
+def test_replay_miss_fails_fast():
+    print("Testing cassette replay...")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(cassette, "CASSETTE_DIR", tempfile.mkdtemp())
+        mp.setattr(cassette, "STATS", {"recorded": 0, "replayed": 0, "missing": 0})
+        mp.setattr(api, "MODE", "replay")
+        mp.setattr(api, "CACHE_ENABLED", False)
+
+        # A recorded request replays as-is
+        key = api.cache_key("/games", {"year": 2025})
+        cassette.record(key, "/games", {"year": "2025"}, cassette.ReplayResponse(200, '[{"id": 1}]'))
+        assert api.fetch_with_retry("/games", {"year": 2025}) == [{"id": 1}]
+
+        # A missing one raises with its key straight away, no retry backoff
+        start = time.time()
+        try:
+            api.fetch_many([("/lines", {"year": 2025})])
+            assert False, "expected CassetteMiss"
+        except cassette.CassetteMiss as e:
+            assert e.key == api.cache_key("/lines", {"year": 2025}) and e.endpoint == "/lines"
+        assert time.time() - start < 1.0
+        assert cassette.STATS == {"recorded": 1, "replayed": 1, "missing": 1}
+
+    print("✅ Cassette Replay Verified.")
+
+if __name__ == "__main__":
+    test_replay_miss_fails_fast()
@@ -1,4 +1,6 @@
-import statistics
+import numpy as np
+import pandas as pd
+from lines import board, board_from_json, market
 
 def test_consensus():
     print("Testing Consensus Logic...")
@@ -13,29 +15,42 @@ def test_consensus():
     # MGM: -1.5
     
     game_lines = [
-        {'provider': 'DraftKings', 'spread': -2.5, 'overUnder': 55.0},
-        {'provider': 'FanDuel', 'spread': -1.5, 'overUnder': 55.5},
-        {'provider': 'Bovada', 'spread': -1.5, 'overUnder': 54.5},
-        {'provider': 'ESPN Bet', 'spread': -1.0, 'overUnder': 55.0},
-        {'provider': 'BetMGM', 'spread': -1.5, 'overUnder': 55.0},
+        {'provider': 'DraftKings', 'spread': -2.5, 'overUnder': 55.0, 'homeMoneyline': -140, 'awayMoneyline': 118},
+        {'provider': 'FanDuel', 'spread': -1.5, 'overUnder': 55.5, 'homeMoneyline': -125, 'awayMoneyline': 105},
+        {'provider': 'Bovada', 'spread': -1.5, 'overUnder': 54.5, 'homeMoneyline': -130, 'awayMoneyline': 110},
+        {'provider': 'ESPN Bet', 'spread': -1.0, 'overUnder': 55.0, 'homeMoneyline': 0, 'awayMoneyline': 0},
+        {'provider': 'BetMGM', 'spread': -1.5, 'overUnder': 55.0, 'homeMoneyline': -130, 'awayMoneyline': None},
     ]
-    
-    spreads = [l.get('spread') for l in game_lines if l.get('spread') is not None]
-    totals = [l.get('overUnder') for l in game_lines if l.get('overUnder') is not None]
-    
-    print(f"Spreads: {spreads}")
-    
-    median_spread = statistics.median(spreads)
-    print(f"Median Spread: {median_spread}")
-    
-    assert median_spread == -1.5, f"Expected -1.5, got {median_spread}"
-    
-    print(f"Totals: {totals}")
-    median_total = statistics.median(totals)
-    print(f"Median Total: {median_total}")
-    
-    assert median_total == 55.0, f"Expected 55.0, got {median_total}"
-    
+    payload = [{'id': 1, 'lines': game_lines}, {'id': 2, 'lines': [{'provider': 'DraftKings', 'spread': None}]}]
+    m = market(board_from_json(payload)).set_index('game_id')
+    oregon = m.loc[1]
+
+    print(f"Median Spread: {oregon['spread']}")
+    assert oregon['spread'] == -1.5, f"Expected -1.5, got {oregon['spread']}"
+    print(f"Median Total: {oregon['overUnder']}")
+    assert oregon['overUnder'] == 55.0, f"Expected 55.0, got {oregon['overUnder']}"
+    assert oregon['n_books'] == 5
+
+    # Best number per side and the book offering it
+    assert (oregon['best_home_spread'], oregon['best_home_spread_book']) == (-1.0, 'ESPN Bet')
+    assert (oregon['best_away_spread'], oregon['best_away_spread_book']) == (2.5, 'DraftKings')
+    assert (oregon['best_over'], oregon['best_over_book']) == (54.5, 'Bovada')
+    assert (oregon['best_under'], oregon['best_under_book']) == (55.5, 'FanDuel')
+    assert oregon['best_home_spread_price'] == -110  # CFBD has no juice: standard price
+    # Moneylines: 0 means "not offered"
+    assert (oregon['best_home_ml'], oregon['best_home_ml_book']) == (-125, 'FanDuel')
+    assert (oregon['best_away_ml'], oregon['best_away_ml_book']) == (118, 'DraftKings')
+
+    # A game with no usable numbers stays NaN with no book
+    assert np.isnan(m.loc[2, 'spread']) and m.loc[2, 'n_books'] == 0 and m.loc[2, 'best_home_spread_book'] is None
+
+    # Equal numbers: the better price wins; `books` restricts the columns
+    lines = pd.DataFrame({'game_id': [7, 7, 7], 'provider': ['A', 'B', 'C'], 'spread': [3.5, 3.5, 4.0],
+                          'overUnder': 50.0, 'homeMoneyline': np.nan, 'awayMoneyline': np.nan,
+                          'homeSpreadPrice': [-115, -105, -110]})
+    row = market(board(lines, books=['A', 'B'])).iloc[0]
+    assert (row['best_home_spread'], row['best_home_spread_price'], row['best_home_spread_book']) == (3.5, -105, 'B')
+
     print("✅ Consensus Logic Verified.")
 
 if __name__ == "__main__":
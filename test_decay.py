@@ -0,0 +1,31 @@
+import numpy as np
+from decay import decay_bank
+from test_feature_store import make_stats
+
+METRICS = ['offense.ppa', 'defense.ppa', 'offense.passing.successRate']
+
+def test_decay_bank_matches_pandas():
+    print("Testing vectorized decay bank against pandas groupby...")
+    stats = make_stats(seed=3)[['team', 'season', 'week'] + METRICS]
+
+    bank = decay_bank(stats, METRICS, spans=(3, 6), windows=(4,), season_to_date=True)
+    ref = stats.sort_values(['team', 'season', 'week'], kind='mergesort').reset_index(drop=True)
+    grouped = ref.groupby(['team', 'season'])
+
+    for m in METRICS:
+        ewm3 = grouped[m].transform(lambda x: x.ewm(span=3, adjust=False).mean().shift(1))
+        ewm6 = grouped[m].transform(lambda x: x.ewm(span=6, adjust=False).mean().shift(1))
+        roll4 = grouped[m].transform(lambda x: x.rolling(4, min_periods=1).mean().shift(1))
+        season = grouped[m].transform(lambda x: x.expanding().mean().shift(1))
+
+        # EWMA uses pandas' exact recursion, so it must match bit-for-bit
+        assert np.array_equal(bank[f"decay_{m}"].to_numpy(), ewm3.to_numpy(), equal_nan=True)
+        assert np.array_equal(bank[f"decay_ewm6_{m}"].to_numpy(), ewm6.to_numpy(), equal_nan=True)
+        # Cumulative-sum windows only need to agree to float tolerance
+        assert np.allclose(bank[f"decay_roll4_{m}"], roll4, equal_nan=True)
+        assert np.allclose(bank[f"decay_season_{m}"], season, equal_nan=True)
+
+    print("✅ Decay bank matches pandas.")
+
+if __name__ == "__main__":
+    test_decay_bank_matches_pandas()
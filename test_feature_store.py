@@ -0,0 +1,91 @@
+import tempfile
+import numpy as np
+import pandas as pd
+from features import calculate_weighted_decay, DECAY_METRICS, DECAY_SPAN, DECAY_BANK
+from feature_store import DecayFeatureStore
+
+def make_stats(seed=0, teams=12, seasons=(2024, 2025), weeks=14):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for season in seasons:
+        for t in range(teams):
+            # Bye weeks: each team skips a couple of random weeks
+            played = sorted(rng.choice(np.arange(1, weeks + 1), size=weeks - 2, replace=False))
+            for week in played:
+                row = {'team': f"Team {t}", 'season': season, 'week': int(week)}
+                row.update({m: rng.normal(0.1, 0.2) for m in DECAY_METRICS})
+                rows.append(row)
+    return pd.DataFrame(rows)
+
+def test_incremental_matches_full_recompute():
+    print("Testing incremental EWMA feature store...")
+    stats = make_stats()
+
+    expected = calculate_weighted_decay(stats.copy())
+    decay_cols = [f"decay_{m}" for m in DECAY_METRICS]
+    expected = expected.sort_values(['team', 'season', 'week'])[['team', 'season', 'week'] + decay_cols].reset_index(drop=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Seed with the first half of the season, then add one week per "night"
+        store = DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, path=tmp)
+        store.update(stats[stats['week'] <= 7])
+        store.save()
+        for week in range(8, 15):
+            store = DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, path=tmp).load()
+            store.update(stats[stats['week'] <= week])  # re-sent old weeks must be skipped
+            store.save()
+
+        got = store.features.sort_values(['team', 'season', 'week']).reset_index(drop=True)
+
+    assert len(got) == len(expected), f"Expected {len(expected)} rows, got {len(got)}"
+    assert (got[['team', 'season', 'week']].values == expected[['team', 'season', 'week']].values).all()
+    assert np.array_equal(got[decay_cols].to_numpy(dtype=float), expected[decay_cols].to_numpy(dtype=float), equal_nan=True)
+
+    # Full builds go through the vectorized bank; update() can continue from their state
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, path=tmp, **DECAY_BANK)
+        rebuilt = store.rebuild(stats[stats['week'] <= 7])
+        assert set(store.bank_cols) <= set(rebuilt.columns) and len(store.bank_cols) == 6 * len(DECAY_METRICS)
+        store.save()
+        store = DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, path=tmp, **DECAY_BANK).load()
+        store.update(stats)
+        got = store.features.sort_values(['team', 'season', 'week']).reset_index(drop=True)
+        assert np.array_equal(got[decay_cols].to_numpy(dtype=float), expected[decay_cols].to_numpy(dtype=float), equal_nan=True)
+
+        # update() keeps the whole bank (slower EWMAs, rolling and season-to-date
+        # means) in step with a full recompute, week by week after a rebuild
+        full = calculate_weighted_decay(stats.copy()).sort_values(['team', 'season', 'week']).reset_index(drop=True)
+        got = store.features.sort_values(['team', 'season', 'week']).reset_index(drop=True)
+        assert np.allclose(got[store.bank_cols].to_numpy(dtype=float), full[store.bank_cols].to_numpy(dtype=float), equal_nan=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, path=tmp, **DECAY_BANK)
+        store.rebuild(stats[stats['week'] <= 4])
+        store.save()
+        for week in range(5, 15):
+            store = DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, path=tmp, **DECAY_BANK).load()
+            assert store.seasons() == {2024, 2025}
+            store.update(stats[stats['week'] <= week])
+            store.save()
+        got = store.features.sort_values(['team', 'season', 'week']).reset_index(drop=True)
+        assert np.array_equal(got[decay_cols].to_numpy(dtype=float), full[decay_cols].to_numpy(dtype=float), equal_nan=True)
+        assert np.allclose(got[store.bank_cols].to_numpy(dtype=float), full[store.bank_cols].to_numpy(dtype=float), equal_nan=True)
+
+        # A store saved with only the base columns loads as empty under the full bank
+        base = DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, path=tmp)
+        base.update(stats)
+        base.save()
+        assert DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, path=tmp).load().seasons() == {2024, 2025}
+        assert DecayFeatureStore(DECAY_METRICS, span=DECAY_SPAN, path=tmp, **DECAY_BANK).load().seasons() == set()
+
+        # Rebuilding a whole season reproduces the full bank for it
+        store.rebuild(stats[stats['season'] == 2025])
+        full = calculate_weighted_decay(stats.copy())
+        got = store.features[store.features['season'] == 2025].sort_values(['team', 'week']).reset_index(drop=True)
+        want = full[full['season'] == 2025].sort_values(['team', 'week']).reset_index(drop=True)
+        assert np.allclose(got[store.bank_cols].to_numpy(dtype=float), want[store.bank_cols].to_numpy(dtype=float), equal_nan=True)
+
+    print("✅ Incremental decay features match the full recompute.")
+
+if __name__ == "__main__":
+    test_incremental_matches_full_recompute()
@@ -0,0 +1,35 @@
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from forest import export_forest, PackedForest, save_packed, load_packed
+
+def test_packed_forest():
+    print("Testing packed random-forest evaluator...")
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 6))
+    y = (X[:, 0] + 0.5 * X[:, 1] + rng.normal(scale=0.5, size=600) > 0).astype(int)
+    X_new = rng.normal(size=(300, 6))
+
+    # Shallow forest, unlimited-depth forest and a 3-class forest
+    for depth, target in [(5, y), (None, y), (4, np.digitize(X[:, 2], [-0.5, 0.5]))]:
+        model = RandomForestClassifier(n_estimators=25, max_depth=depth, random_state=42).fit(X, target)
+        packed = PackedForest(export_forest(model))
+        assert np.allclose(packed.predict_proba(X_new), model.predict_proba(X_new), atol=1e-12)
+        assert np.array_equal(packed.predict(X_new), model.predict(X_new))
+
+    # Named columns are picked in training order; single rows work too
+    cols = ['a', 'b', 'c', 'd', 'e', 'f']
+    model = RandomForestClassifier(n_estimators=20, max_depth=5, random_state=42).fit(pd.DataFrame(X, columns=cols), y)
+    frame = pd.DataFrame(X_new, columns=cols)
+    path = tempfile.mkdtemp()
+    save_packed(export_forest(model), path)
+    loaded = load_packed(path)
+    assert np.allclose(loaded.predict_proba(frame[cols[::-1]]), model.predict_proba(frame), atol=1e-12)
+    assert loaded.predict_proba(X_new[0]).shape == (1, 2)
+
+    print("✅ Packed Forest Verified.")
+
+if __name__ == "__main__":
+    test_packed_forest()
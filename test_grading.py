@@ -0,0 +1,37 @@
+import pandas as pd
+from grading import grade_history, record
+
+def test_grading():
+    print("Testing shared grading engine...")
+
+    history = pd.DataFrame([
+        # Home favorite covers, over hits, home wins
+        {'HomeTeam': 'Oregon', 'AwayTeam': 'Utah', 'Manual_HomeScore': 31, 'Manual_AwayScore': 20,
+         'Pick_Team': 'Oregon', 'Pick_Line': -7.5, 'Pick_Side': 'OVER', 'Pick_Total': 48.5, 'Moneyline Pick': 'Oregon'},
+        # Away dog +3 loses by exactly 3 -> spread PUSH, total lands on the number -> PUSH
+        {'HomeTeam': 'Iowa', 'AwayTeam': 'Navy', 'Manual_HomeScore': 20, 'Manual_AwayScore': 17,
+         'Pick_Team': 'Navy', 'Pick_Line': 3.0, 'Pick_Side': 'UNDER', 'Pick_Total': 37.0, 'Moneyline Pick': 'Navy'},
+        # Away pick covers, under hits, ML pick wins on the road
+        {'HomeTeam': 'Texas', 'AwayTeam': 'Rice', 'Manual_HomeScore': 10, 'Manual_AwayScore': 14,
+         'Pick_Team': 'Rice', 'Pick_Line': 20.5, 'Pick_Side': 'UNDER', 'Pick_Total': 50.0, 'Moneyline Pick': 'Rice'},
+        # No total line -> total stays ungraded
+        {'HomeTeam': 'Army', 'AwayTeam': 'Tulane', 'Manual_HomeScore': 24, 'Manual_AwayScore': 21,
+         'Pick_Team': 'Army', 'Pick_Line': -1.0, 'Pick_Side': 'OVER', 'Pick_Total': None, 'Moneyline Pick': 'Tulane'},
+        # Not played yet -> nothing graded
+        {'HomeTeam': 'Ohio', 'AwayTeam': 'Kent State', 'Manual_HomeScore': None, 'Manual_AwayScore': None,
+         'Pick_Team': 'Ohio', 'Pick_Line': -14.0, 'Pick_Side': 'OVER', 'Pick_Total': 50.0, 'Moneyline Pick': 'Ohio'},
+    ])
+
+    graded = grade_history(history)
+
+    assert list(graded['Spread_Result']) == ['WIN', 'PUSH', 'WIN', 'WIN', None]
+    assert list(graded['Total_Result']) == ['WIN', 'PUSH', 'WIN', None, None]
+    assert list(graded['ML_Result']) == ['WIN', 'LOSS', 'WIN', 'LOSS', None]
+
+    wins, losses, pushes, pct = record(graded['Spread_Result'])
+    assert (wins, losses, pushes) == (3, 0, 1) and pct == 100.0
+
+    print("✅ Grading Logic Verified.")
+
+if __name__ == "__main__":
+    test_grading()
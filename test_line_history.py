@@ -0,0 +1,68 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import line_history as lh
+
+def _snapshot(spreads, total=50.5):
+    """normalize_lines-style frame: {game_id: {provider: spread}}."""
+    rows = [{'game_id': gid, 'provider': book, 'spread': s, 'overUnder': total,
+             'homeMoneyline': -150.0, 'awayMoneyline': 130.0}
+            for gid, books in spreads.items() for book, s in books.items()]
+    return pd.DataFrame(rows)
+
+def test_line_history():
+    print("Testing line-movement history...")
+    lh.LINES_DIR = tempfile.mkdtemp()
+    year = 2025
+
+    # Only changed (game, provider) rows are stored on each poll
+    assert lh.append_snapshot(year, _snapshot({1: {'DraftKings': -3.0, 'FanDuel': -3.0}, 2: {'DraftKings': 7.0}}), ts=100) == 3
+    assert lh.append_snapshot(year, _snapshot({1: {'DraftKings': -3.0, 'FanDuel': -3.0}, 2: {'DraftKings': 7.0}}), ts=200) == 0
+    assert lh.append_snapshot(year, _snapshot({1: {'DraftKings': -4.5, 'FanDuel': -3.0}, 2: {'DraftKings': 7.0}}), ts=300) == 1
+    assert lh.append_snapshot(year, _snapshot({1: {'DraftKings': -5.0, 'FanDuel': -5.5}}, total=52.0), ts=400) == 2
+
+    # Polls diff against latest.parquet, not the segment history
+    latest = lh.latest_state(year).set_index(['game_id', 'provider'])
+    assert len(latest) == 3 and latest.loc[(1, 'DraftKings'), 'spread'] == -5.0 and latest.loc[(2, 'DraftKings'), 'ts'] == 100
+    real_read = lh.read_history
+    lh.read_history = lambda *a, **k: (_ for _ in ()).throw(AssertionError("full history read"))
+    try:
+        assert lh.append_snapshot(year, _snapshot({1: {'DraftKings': -5.0, 'FanDuel': -5.5}}, total=52.0), ts=450) == 0
+    finally:
+        lh.read_history = real_read
+
+    # A missing or stale latest file is rebuilt from the history
+    os.remove(lh._latest_path(year))
+    pd.testing.assert_frame_equal(lh.latest_state(year).set_index(['game_id', 'provider']).sort_index(), latest.sort_index())
+    stale = lh.latest_state(year)
+    assert lh.append_snapshot(year, _snapshot({2: {'DraftKings': 6.5}}), ts=500) == 1
+    lh._write_latest(year, stale)  # as if the poll died before updating latest.parquet
+    assert lh.latest_state(year).set_index(['game_id', 'provider']).loc[(2, 'DraftKings'), 'spread'] == 6.5
+
+    # Compaction keeps every row and the per-game range query
+    before = lh.read_history(year)
+    assert lh.compact(year) == 4 and len(lh._segments(year)) == 0
+    pd.testing.assert_frame_equal(lh.read_history(year), before)
+    assert len(lh.latest_state(year)) == 3
+    game = lh.game_history(year, 1)
+    assert game['ts'].tolist() == [100, 300, 400, 100, 400] and set(game['game_id']) == {1}
+    assert lh.game_history(year, 1, start=150, end=350)['spread'].tolist() == [-4.5]
+
+    # Open/close: the ts=400 move came after kickoff, so DraftKings closed at -4.5
+    oc = lh.open_close(game, kickoffs={1: 350}).set_index('provider')
+    assert oc.loc['DraftKings', 'open_spread'] == -3.0 and oc.loc['DraftKings', 'close_spread'] == -4.5
+    assert oc.loc['FanDuel', 'close_spread'] == -3.0
+    close = lh.consensus_close(year, [1, 2], kickoffs={1: 350, 2: 350})
+    assert close.set_index('game_id').loc[1, 'close_spread'] == -3.75
+
+    # CLV: home -3 beat a -3.75 close; the away -7 favorite matched the close; OVER 49.5 beat 50.5
+    picks = pd.DataFrame({'GameID': ['1', '2'], 'HomeTeam': ['A', 'C'], 'Pick_Team': ['A', 'D'],
+                          'Pick_Line': [-3.0, -7.0], 'Pick_Side': ['OVER', 'UNDER'], 'Pick_Total': [49.5, 50.5]})
+    out = lh.clv(picks, close)
+    assert np.allclose(out['CLV_Spread'], [0.75, 0.0]) and np.allclose(out['CLV_Total'], [1.0, 0.0])
+
+    print("✅ Line History Verified.")
+
+if __name__ == "__main__":
+    test_line_history()
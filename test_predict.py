@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from predict import score_slate, pick_columns
+
+class _Fixed:
+    """Stand-in model returning preset home-side probabilities."""
+    def __init__(self, p):
+        self.p = np.asarray(p, dtype=float)
+
+    def predict_proba(self, X):
+        return np.column_stack([1 - self.p, self.p])
+
+def _per_row(slate, p_spread, p_total, p_win):
+    """The per-game loop predict.py used before batch scoring."""
+    rows = []
+    for i, g in slate.iterrows():
+        home, away = g['home_team'], g['away_team']
+        median_spread, median_total = float(g['spread']), float(g['overUnder'])
+        prob = p_spread[i]
+        p_spread_team = home if prob > 0.5 else away
+        p_spread_line = median_spread if prob > 0.5 else -median_spread
+        conf_spread = max(prob, 1 - prob)
+        prob = p_total[i]
+        p_total_side = "OVER" if prob > 0.5 else "UNDER"
+        conf_total = max(prob, 1 - prob)
+        prob = p_win[i]
+        p_ml_team = home if prob > 0.5 else away
+        conf_ml = max(prob, 1 - prob)
+        rows.append({
+            "GameID": str(g['id']), "HomeTeam": home, "AwayTeam": away, "Game": f"{away} @ {home}",
+            "Moneyline Pick": p_ml_team, "Moneyline Conf": f"{conf_ml:.1%}",
+            "Spread Pick": f"{p_spread_team} ({p_spread_line})", "Spread Conf": f"{conf_spread:.1%}",
+            "Total Pick": f"{p_total_side} {median_total}", "Total Conf": f"{conf_total:.1%}",
+            "Pick_Team": p_spread_team, "Pick_Line": p_spread_line,
+            "Pick_Side": p_total_side, "Pick_Total": median_total,
+        })
+    return pd.DataFrame(rows)
+
+def test_batch_matches_per_row():
+    print("Testing batch slate scoring against the per-game loop...")
+    rng = np.random.default_rng(3)
+    n = 200
+    slate = pd.DataFrame({
+        'id': np.arange(n) + 401000000,
+        'home_team': [f"Home {i}" for i in range(n)], 'away_team': [f"Away {i}" for i in range(n)],
+        'start_date': "2025-12-20T17:00:00.000Z",
+        'spread': rng.choice([-3.0, -3.5, 0.0, 7.0, 10.5, -14.0], n),
+        'overUnder': rng.choice([55.0, 48.5, 61.0], n),
+        'best_home_ml': rng.choice([-150.0, 120.0, np.nan], n), 'best_away_ml': rng.choice([130.0, -110.0], n),
+        'x': 0.0,
+    })
+    p_spread, p_total, p_win = (rng.uniform(0.2, 0.8, n) for _ in range(3))
+
+    batch = score_slate(slate, _Fixed(p_spread), _Fixed(p_total), _Fixed(p_win), ['x'])
+    old = _per_row(slate, p_spread, p_total, p_win)
+    pd.testing.assert_frame_equal(batch[old.columns], old, check_dtype=False)
+    assert batch['Spread Pick'].str.endswith(".0)").any() and not batch['Spread Pick'].str.contains(r"\(-?\d+\)").any()
+
+    # The service's single-game path builds the same strings
+    one = pick_columns(["1"], ["Ohio State"], ["Purdue"], [None], [-3.0], [55.0], [-150.0], [130.0],
+                       np.array([0.6]), np.array([0.7]), np.array([0.8]))
+    assert list(one["Spread Pick"]) == ["Ohio State (-3.0)"] and list(one["Total Pick"]) == ["OVER 55.0"]
+
+    print("✅ Batch Scoring Verified.")
+
+if __name__ == "__main__":
+    test_batch_matches_per_row()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import pandas as pd
+import prediction_store as store
+
+def _picks(ids, conf="55.0%", line=-3.5):
+    return pd.DataFrame({
+        'GameID': [str(i) for i in ids], 'HomeTeam': 'Texas', 'AwayTeam': 'Rice', 'Game': 'Rice @ Texas',
+        'StartDate': [f"2025-09-{6 + k:02d}T19:00:00.000Z" for k in range(len(ids))],
+        'Moneyline Pick': 'Texas', 'Moneyline Conf': '80.2%', 'Spread Pick': f"Texas ({line:g})", 'Spread Conf': conf,
+        'Total Pick': 'OVER 51.5', 'Total Conf': '52.0%', 'Pick_Team': 'Texas', 'Pick_Line': line,
+        'Pick_Side': 'OVER', 'Pick_Total': 51.5, 'Pick_ML_Odds': -900.0,
+    })
+
+def test_prediction_store():
+    print("Testing SQLite prediction store...")
+    path = os.path.join(tempfile.mkdtemp(), "predictions.db")
+    conn = store.connect(path)
+
+    # Upserts only touch rows whose values changed
+    assert store.upsert_predictions(conn, _picks([101, 102, 103])) == 3
+    assert store.upsert_predictions(conn, _picks([101, 102, 103])) == 0
+    assert store.upsert_predictions(conn, _picks([102], conf="61.3%")) == 1
+    df = store.read_predictions(conn)
+    assert df['GameID'].tolist() == [101, 102, 103] and df['Spread Conf'].tolist() == [0.55, 0.613, 0.55]
+
+    # Scores grade rows in place; a later pending pick can't overwrite a graded game
+    graded = store.record_scores(conn, {101: (31, 20), 102: (20, 17), 999: (1, 0)})
+    assert graded['GameID'].tolist() == [101, 102]
+    assert graded['Spread_Result'].tolist() == ['WIN', 'LOSS'] and graded['ML_Result'].tolist() == ['WIN', 'WIN']
+    assert store.upsert_predictions(conn, _picks([101], line=-10.0)) == 0
+    assert store.game_ids(conn, graded=False) == [103]
+    # CLV backlog only covers the given season's games
+    assert store.missing_clv_ids(conn, [101, 103, 555]) == [101]
+
+    # Readers see committed data while a write transaction is open (WAL)
+    reader = store.connect(path, readonly=True)
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("UPDATE predictions SET pick_line = 0 WHERE game_id = 103")
+    assert store.read_predictions(reader, graded=False)['Pick_Line'].tolist() == [-3.5]
+    conn.rollback()
+
+    # Stale pending picks are dropped; the CSV export keeps the legacy layout
+    assert store.delete_pending(conn, keep_ids=[]) == 1
+    csv = os.path.join(os.path.dirname(path), "live_predictions.csv")
+    assert store.export_csv(conn, csv) == 2
+    out = pd.read_csv(csv, dtype=str)
+    assert out['GameID'].tolist() == ['101', '102'] and out['Spread Conf'].tolist() == ['55.0%', '61.3%']
+    assert out['Manual_HomeScore'].tolist() == ['31', '20']
+
+    # Legacy CSV import: float GameIDs and 'N/A' confidences
+    legacy = _picks([201.0, 202.0])
+    legacy['Moneyline Conf'] = 'N/A'
+    legacy.to_csv(csv, index=False)
+    assert store.import_csv(conn, csv) == 2
+    df = store.read_predictions(conn, ids=[201, 202])
+    assert df['GameID'].tolist() == [201, 202] and df['Moneyline Conf'].isna().all()
+    reader.close()
+    conn.close()
+
+    print("✅ Prediction Store Verified.")
+
+if __name__ == "__main__":
+    test_prediction_store()
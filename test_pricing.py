@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pricing
+
+def test_pricing():
+    print("Testing no-vig pricing and EV...")
+
+    # -110 / -110 is a fair coin with ~4.8% hold; -150 / +130 de-vigs to 0.58
+    fair, hold = pricing.no_vig([-110, -150, np.nan], [-110, 130, 120])
+    assert np.allclose(fair[:2], [0.5, 0.6 / (0.6 + 100 / 230)]) and np.isclose(hold[0], 2 * 110 / 210 - 1)
+    assert np.isnan(fair[2])
+
+    lines = pd.DataFrame({
+        'game_id': [1, 1, 2], 'provider': ['DraftKings', 'FanDuel', 'DraftKings'],
+        'spread': [-3.0, -2.5, 7.0], 'overUnder': [50.5, 51.0, 44.0],
+        'homeMoneyline': [-150.0, -140.0, 0.0], 'awayMoneyline': [130.0, 120.0, 0.0],
+        # Only game 2's spread comes with real prices; the rest are CFBD-style bare numbers
+        'homeSpreadPrice': [np.nan, np.nan, -120.0], 'awaySpreadPrice': [np.nan, np.nan, 100.0],
+    })
+    prices = pricing.price_table(lines, books=['DraftKings', 'FanDuel']).set_index('game_id')
+    # No juice quoted: no no-vig spread/total price, rather than a de-vigged -110 default
+    assert np.isnan(prices.loc[1, 'fair_home_spread']) and np.isnan(prices.loc[1, 'fair_over'])
+    assert prices.loc[1, 'n_spread_books'] == 0 and prices.loc[2, 'n_spread_books'] == 1
+    g2_fair = pricing.no_vig(-120, 100)[0]
+    assert np.isclose(prices.loc[2, 'fair_home_spread'], g2_fair)
+    dk, fd = pricing.no_vig(-150, 130)[0], pricing.no_vig(-140, 120)[0]
+    assert np.isclose(prices.loc[1, 'fair_home_ml'], (dk + fd) / 2) and prices.loc[1, 'n_ml_books'] == 2
+    assert np.isnan(prices.loc[2, 'fair_home_ml'])
+
+    # Picks: home -3 / UNDER 50.5 / away ML on game 1, home -2.75 (no book hangs it) / OVER on
+    # game 1 again, the priced away -7 on game 2, and a game the board doesn't cover
+    picks = pd.DataFrame({
+        'GameID': ['1', '1', '2', '3'], 'HomeTeam': ['A', 'A', 'E', 'C'], 'Pick_Team': ['A', 'A', 'F', 'D'],
+        'Pick_Line': [-3.0, -2.75, -7.0, 3.0], 'Pick_Side': ['UNDER', 'OVER', 'OVER', 'OVER'],
+        'Pick_Total': [50.5, 51.0, 44.0, 40.0], 'Moneyline Pick': ['B', 'A', 'F', 'C'],
+        'Pick_ML_Odds': [130.0, -140.0, 250.0, -200.0],
+        'Spread Conf': ['56.0%', '56.0%', '55.0%', '60.0%'], 'Total Conf': [0.52, 0.53, 0.5, 0.55],
+        'Moneyline Conf': [0.45, 0.6, 0.3, 0.70],
+    })
+    b = pricing.board(lines, ['DraftKings', 'FanDuel'])
+    ev = pricing.pick_ev(picks, b)
+    # Home -3 only at DraftKings: FanDuel's better -2.5 is a different bet than the model scored
+    assert ev.loc[0, 'Spread_Book'] == 'DraftKings' and np.isclose(ev.loc[0, 'Spread_EV'], 0.56 * 100 / 110 - 0.44)
+    assert ev.loc[0, 'Spread_Basis'] == pricing.FAIR_ASSUMED and np.isclose(ev.loc[0, 'Spread_Edge'], 0.06)
+    assert ev.loc[0, 'Total_Book'] == 'DraftKings' and ev.loc[1, 'Total_Book'] == 'FanDuel'
+    # No book at -2.75: standard -110, no book
+    assert ev.loc[1, 'Spread_Book'] is None and ev.loc[1, 'Spread_Odds'] == -110
+    # Away ML at the best +130 (DraftKings); fair probability is the de-vigged away side
+    assert ev.loc[0, 'ML_Odds'] == 130 and ev.loc[0, 'ML_Book'] == 'DraftKings'
+    assert np.isclose(ev.loc[0, 'ML_EV'], 0.45 * 1.3 - 0.55) and np.isclose(ev.loc[0, 'ML_Fair'], 1 - (dk + fd) / 2)
+    assert ev.loc[0, 'ML_Basis'] == pricing.FAIR_NO_VIG
+    # Real spread prices: priced at +100 with a no-vig fair probability for the away side
+    assert ev.loc[2, 'Spread_Odds'] == 100 and np.isclose(ev.loc[2, 'Spread_Fair'], 1 - g2_fair)
+    assert ev.loc[2, 'Spread_Basis'] == pricing.FAIR_NO_VIG and np.isclose(ev.loc[2, 'Spread_EV'], 0.55 - 0.45)
+    # No ML on the board for game 2: recorded odds, no fair price
+    assert ev.loc[2, 'ML_Odds'] == 250 and ev.loc[2, 'ML_Basis'] is None and np.isnan(ev.loc[2, 'ML_Fair'])
+    # Uncovered game: -110 spread/total and the recorded moneyline, no fair ML price
+    assert ev.loc[3, 'Spread_Odds'] == -110 and ev.loc[3, 'ML_Odds'] == -200
+    assert np.isnan(ev.loc[3, 'ML_Fair']) and np.isclose(ev.loc[3, 'ML_EV'], 0.7 * 0.5 - 0.3)
+    assert ev.loc[3, 'Total_Basis'] == pricing.FAIR_ASSUMED and ev.loc[3, 'Total_Fair'] == 0.5
+
+    # Bowls played in January price off the previous season's board
+    dates = pd.DataFrame({'StartDate': ["2025-12-20T19:00:00.000Z", "2026-01-09T00:30:00.000Z", "2026-09-05T16:00:00.000Z"]})
+    assert pricing.pick_seasons(dates) == [2025, 2026]
+
+    # Without a price table (graded history) the recorded odds are used
+    history = picks.iloc[[0, 3]].reset_index(drop=True).assign(
+        Spread_Result=['WIN', 'LOSS'], Total_Result=['PUSH', 'WIN'], ML_Result=['LOSS', 'WIN'])
+    pd.testing.assert_series_equal(pricing.pick_ev(history)['ML_Odds'], pd.Series([130.0, -200.0], name='ML_Odds'))
+    bt = pricing.ev_backtest(history).set_index('market')
+    assert bt.loc['Spread', 'bets'] == 2 and np.isclose(bt.loc['Spread', 'profit'], 100 * 100 / 110 - 100)
+    assert bt.loc['ML', 'bets'] == 2 and np.isclose(bt.loc['ML', 'profit'], 50.0 - 100.0)
+    assert bt.loc['Total', 'bets'] == 1  # 52% UNDER at -110 is -EV
+
+    print("✅ Pricing Verified.")
+
+if __name__ == "__main__":
+    test_pricing()
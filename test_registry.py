@@ -0,0 +1,40 @@
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+import registry
+
+def test_model_registry():
+    print("Testing versioned model registry...")
+    registry.REGISTRY_DIR = tempfile.mkdtemp()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3)).astype(np.float32)
+    y = (X[:, 0] > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=10, max_depth=3, random_state=42).fit(X, y)
+
+    v1 = registry.save_model("spread", model, ['a', 'b', 'c'], data=(X, y), metrics={'test_accuracy': 0.9}, train_seconds=0.5)
+    small = RandomForestClassifier(n_estimators=5, max_depth=2, random_state=42).fit(X[:, :2], y)
+    v2 = registry.save_model("spread", small, ['a', 'b'], data=(X[:, :2], y))
+    assert (v1, v2) == ("v0001", "v0002") and registry.versions("spread") == [v1, v2]
+    assert registry.latest("spread") == v2
+
+    meta = registry.read_meta("spread", v1)
+    assert meta['features'] == ['a', 'b', 'c'] and meta['n_rows'] == 200
+    assert meta['metrics'] == {'test_accuracy': 0.9} and meta['data_hash'] == registry.data_hash(X, y)
+    assert registry.find_version("spread", ['a', 'b', 'c']) == v1
+
+    # Lazy: metadata is available before the estimator is unpickled
+    handle = registry.load_model("spread", v1)
+    assert handle._model is None and handle.features == ['a', 'b', 'c']
+    frame = pd.DataFrame(X, columns=['a', 'b', 'c'])
+    assert np.allclose(handle.predict_proba(frame), model.predict_proba(frame))
+
+    # One shared copy per version within the process
+    assert registry.load_model("spread", v1) is handle
+    assert registry.load_model("spread").version == v2
+
+    print("✅ Model Registry Verified.")
+
+if __name__ == "__main__":
+    test_model_registry()
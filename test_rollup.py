@@ -0,0 +1,137 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from grading import grade_history
+import prediction_store as store
+import snapshot
+import rollup
+from rollup import update_rollup, sync_rollup, load_rollup, aggregate, bet_rows, summarize, conf_bucket, KEYS
+
+def test_performance_rollup():
+    print("Testing incremental performance rollup...")
+    path = os.path.join(tempfile.mkdtemp(), "rollup.json")
+
+    rng = np.random.default_rng(0)
+    n = 400
+    home_pts = rng.integers(0, 50, n)
+    history = pd.DataFrame({
+        'GameID': [str(1000 + i) for i in range(n)],
+        'HomeTeam': 'Home', 'AwayTeam': 'Away',
+        'StartDate': pd.date_range("2025-09-01", periods=n, freq="8h").strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        'Manual_HomeScore': home_pts.astype(float), 'Manual_AwayScore': rng.integers(0, 50, n).astype(float),
+        'Pick_Team': rng.choice(['Home', 'Away'], n), 'Pick_Line': rng.choice([-7.0, -3.5, 2.5, 10.0], n),
+        'Pick_Side': rng.choice(['OVER', 'UNDER'], n), 'Pick_Total': rng.choice([44.0, 51.5], n),
+        'Moneyline Pick': rng.choice(['Home', 'Away'], n), 'Pick_ML_Odds': rng.choice([-150.0, 130.0, np.nan], n),
+        'Spread Conf': [f"{c:.1f}%" for c in rng.uniform(50, 75, n)],
+        'Total Conf': [f"{c:.1f}%" for c in rng.uniform(50, 75, n)],
+        'Moneyline Conf': [f"{c:.1f}%" for c in rng.uniform(50, 75, n)],
+    })
+    history.loc[n - 50:, ['Manual_HomeScore', 'Manual_AwayScore']] = np.nan  # not played yet
+    info = pd.DataFrame({'season': 2025.0, 'season_type': 'regular', 'week': np.arange(n) // 20 + 1.0,
+                         'conference': rng.choice(['SEC', 'Big Ten', 'Non-conference'], n)},
+                        index=pd.Index(history['GameID'], name='GameID'))
+
+    # Grade in three passes, rerunning the last one: each game is rolled up exactly once
+    for cut in [100, 250, n, n]:
+        graded = grade_history(history.iloc[:cut])
+        table, added = update_rollup(graded, info, path)
+    assert added == 0 and len(load_rollup(path)[1]) == n - 50
+
+    full = aggregate(bet_rows(grade_history(history), info))
+    pd.testing.assert_frame_equal(table.sort_values(KEYS).reset_index(drop=True), full.reset_index(drop=True), check_dtype=False)
+
+    # A backfill regrades a rolled-up game: the rollup is rebuilt, not left stale
+    regraded = history.copy()
+    regraded.loc[0, ['Manual_HomeScore', 'Manual_AwayScore']] = [regraded.loc[0, 'Manual_AwayScore'] + 30, 0.0]
+    regraded.loc[0, 'Pick_ML_Odds'] = 250.0
+    new_table, revised = update_rollup(grade_history(regraded), info, path)
+    assert revised == 1
+    expected = aggregate(bet_rows(grade_history(regraded), info))
+    pd.testing.assert_frame_equal(new_table.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
+    assert update_rollup(grade_history(regraded), info, path)[1] == 0
+
+    # Records match a direct count over the graded history
+    graded = grade_history(history)
+    spread = summarize(table, by=['market']).set_index('market').loc['spread']
+    assert spread['wins'] == (graded['Spread_Result'] == 'WIN').sum()
+    assert spread['losses'] == (graded['Spread_Result'] == 'LOSS').sum()
+    assert spread['bets'] == graded['Spread_Result'].notna().sum()
+    assert np.isclose(spread['units'], (graded['Spread_Result'] == 'WIN').sum() * 100 / 110 - spread['losses'])
+
+    weekly = summarize(table, by=['week'], market='total', conference='SEC')
+    assert weekly['week'].is_monotonic_increasing and weekly['bets'].sum() <= n - 50
+    assert list(conf_bucket(["54.9%", "55.0%", "71.2%", None])) == ["50-55%", "55-60%", "70%+", None]
+
+    print("✅ Performance Rollup Verified.")
+
+def _picks(ids, home_pts, start="2025-09-06T19:00:00.000Z"):
+    n = len(ids)
+    return pd.DataFrame({
+        'GameID': [str(i) for i in ids], 'HomeTeam': 'Home', 'AwayTeam': 'Away', 'Game': 'Away @ Home',
+        'StartDate': start, 'Moneyline Pick': 'Home', 'Moneyline Conf': '60.0%',
+        'Spread Pick': 'Home (-3.5)', 'Spread Conf': '57.0%', 'Total Pick': 'OVER 51.5', 'Total Conf': '52.0%',
+        'Pick_Team': 'Home', 'Pick_Line': -3.5, 'Pick_Side': 'OVER', 'Pick_Total': 51.5, 'Pick_ML_Odds': -150.0,
+        'Manual_HomeScore': list(home_pts), 'Manual_AwayScore': [20] * n,
+    })
+
+def _snap(ids, season, week, conference):
+    games = [{'id': i, 'season': season, 'week': week, 'seasonType': 'regular', 'completed': True,
+              'homeConference': conference, 'awayConference': conference, 'homePoints': 30, 'awayPoints': 20}
+             for i in ids]
+    return {'games': snapshot.normalize_games(games), 'lines': snapshot.normalize_lines([]),
+            'srs': snapshot.normalize_srs([]), 'talent': snapshot.normalize_talent([])}
+
+def test_sync_reads_only_changed_rows():
+    print("Testing rollup sync against the prediction store...")
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "rollup.json")
+    conn = store.connect(os.path.join(tmp, "predictions.db"))
+    clock = iter(f"2025-10-01T00:00:{s:02d}" for s in range(60))
+    real_now, real_read, real_dir = store._now, store.read_predictions, snapshot.SNAPSHOT_DIR
+    read_sizes = []
+    def spy_read(*args, **kwargs):
+        df = real_read(*args, **kwargs)
+        read_sizes.append(len(df))
+        return df
+    snaps = {2025: _snap(range(1, 103), 2025, 3, "SEC")}
+    store._now, store.read_predictions = lambda: next(clock), spy_read
+    try:
+        store.upsert_predictions(conn, _picks(range(1, 101), [30] * 100))
+        assert sync_rollup(conn, snaps, path)[1] == 100
+
+        # Nothing written since: no rows read at all
+        read_sizes.clear()
+        assert sync_rollup(conn, snaps, path)[1] == 0 and read_sizes == []
+
+        # Two newly graded games: only those two rows are read
+        store.upsert_predictions(conn, _picks([101, 102], [10, 30]))
+        table, added = sync_rollup(conn, snaps, path)
+        assert added == 2 and read_sizes == [2]
+
+        # A regrade (changed score) forces one full read and a rebuild
+        read_sizes.clear()
+        store.upsert_predictions(conn, _picks([5], [0]))
+        table, revised = sync_rollup(conn, snaps, path)
+        assert revised == 1 and read_sizes == [1, 102]
+        expected = aggregate(bet_rows(real_read(conn, graded=True), rollup.season_info(real_read(conn, graded=True), snaps)))
+        pd.testing.assert_frame_equal(table.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
+        assert summarize(table).set_index('market').loc['spread', 'losses'] == 2
+        assert set(table['week']) == {3} and set(table['conference']) == {"SEC"}
+
+        # A backfilled game from another season gets its own season's week and
+        # conference (loaded from that season's stored snapshot)
+        snapshot.SNAPSHOT_DIR = os.path.join(tmp, "snapshots")
+        snapshot._write(2024, "both", _snap([900], 2024, 12, "Big Ten"))
+        store.upsert_predictions(conn, _picks([900], [30], start="2024-11-23T17:00:00.000Z"))
+        table, added = sync_rollup(conn, snaps, path)
+        old = table[table['season'] == 2024]
+        assert added == 1 and set(old['week']) == {12} and set(old['conference']) == {"Big Ten"}
+    finally:
+        store._now, store.read_predictions, snapshot.SNAPSHOT_DIR = real_now, real_read, real_dir
+        conn.close()
+    print("✅ Rollup Sync Verified.")
+
+if __name__ == "__main__":
+    test_performance_rollup()
+    test_sync_reads_only_changed_rows()
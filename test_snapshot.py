@@ -0,0 +1,64 @@
+import tempfile
+import snapshot
+from config import CURRENT_SEASON
+
+def _game(gid, week, completed=False, stype="regular"):
+    return {'id': gid, 'season': 2025, 'week': week, 'seasonType': stype, 'startDate': f"2025-09-{week:02d}T19:00:00.000Z",
+            'completed': completed, 'neutralSite': False, 'homeTeam': f"H{gid}", 'awayTeam': f"A{gid}"}
+
+def _lines(gid, week, spread):
+    return {'id': gid, 'seasonType': 'regular', 'week': week, 'lines': [{'provider': 'DraftKings', 'spread': spread}]}
+
+def test_week_update():
+    print("Testing snapshot week updates...")
+    snapshot.SNAPSHOT_DIR = tempfile.mkdtemp()
+    snap = {'games': snapshot.normalize_games([_game(1, 1, True), _game(2, 2), _game(3, 3)]),
+            'lines': snapshot.normalize_lines([_lines(2, 2, -3.0), _lines(3, 3, 7.0)]),
+            'srs': snapshot.normalize_srs([]), 'talent': snapshot.normalize_talent([])}
+    pending = [('regular', 2), ('regular', 3)]
+
+    # Week 2 refetches fine; week 3's /games fails and its /lines comes back empty
+    results = [[_game(2, 2, True)], [_lines(2, 2, -4.0)], {'error': 'timeout'}, [], None, None]
+    snap = snapshot._apply_week_update(snap, pending, results)
+    games = snap['games'].set_index('id')
+    assert sorted(games.index) == [1, 2, 3] and games.loc[2, 'completed'] and not games.loc[3, 'completed']
+    assert snap['lines'].set_index('game_id')['spread'].to_dict() == {2: -4.0, 3: 7.0}
+
+    # The failed week is still pending after a save, so the next run retries it
+    snapshot._write(CURRENT_SEASON, "regular", snap)
+    assert snap['manifest']['pending_weeks'] == [['regular', 3]]
+
+    # /games fine but /lines failed: new games, stored lines kept
+    results = [[_game(3, 3)], {'error': 'timeout'}, None, None]
+    snap = snapshot._apply_week_update(snap, [('regular', 3)], results)
+    assert snap['lines'].set_index('game_id')['spread'].to_dict() == {2: -4.0, 3: 7.0}
+
+    print("✅ Snapshot Week Updates Verified.")
+
+def test_shutout_scores():
+    print("Testing shutout scores in game records...")
+    g = dict(_game(4, 4, True), homePoints=24, awayPoints=0)
+    snap = {'games': snapshot.normalize_games([g, _game(5, 5)])}
+    done, = snapshot.game_records(snap, completed=True)
+    # A real 0 comes through as 0 (not None/NA), so the scripts keep shutouts
+    assert done['home_points'] == 24 and done['away_points'] == 0 and done['away_points'] is not None
+    upcoming, = snapshot.game_records(snap, completed=False)
+    assert upcoming['home_points'] is None and upcoming['away_points'] is None
+    print("✅ Shutout Scores Verified.")
+
+def test_past_season_pending():
+    print("Testing pending weeks of a rolled-over season...")
+    past = CURRENT_SEASON - 1
+    # A postponed regular-season game and an unplayed bowl stay pending after the rollover
+    games = snapshot.normalize_games([_game(1, 1, True), _game(2, 9), _game(3, 1, stype="postseason")])
+    assert snapshot._pending_weeks(past, "both", games) == [('postseason', 1), ('regular', 9)]
+    # Once every game is final, a past season is never refetched
+    final = snapshot.normalize_games([_game(1, 1, True), _game(3, 1, True, stype="postseason")])
+    assert snapshot._pending_weeks(past, "both", final) == []
+    assert snapshot._pending_weeks(past, "both", snapshot.normalize_games([_game(1, 1, True)])) == []
+    print("✅ Past Season Pending Weeks Verified.")
+
+if __name__ == "__main__":
+    test_week_update()
+    test_shutout_scores()
+    test_past_season_pending()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from storage import write_table, read_table, read_metadata, table_columns
+
+def test_table_round_trip():
+    print("Testing Parquet stage tables...")
+    tmp = tempfile.mkdtemp()
+    base = pd.DataFrame({
+        'id': np.arange(5, dtype='int64'), 'season': 2025, 'home_team': [f"T{i}" for i in range(5)],
+        'home_srs_rating': np.linspace(-5, 5, 5), 'away_srs_rating': np.linspace(5, -5, 5),
+    })
+    parent = write_table(base, os.path.join(tmp, "stage_a"), groups={'keys': ['id', 'season'],
+                                                                      'srs': ['home_srs_rating', 'away_srs_rating']})
+    child = base.assign(home_talent_score=1.5, away_talent_score=2.5).drop(columns='away_srs_rating')
+    write_table(child, os.path.join(tmp, "stage_b"), groups={'talent': ['home_talent_score', 'away_talent_score']},
+                parent=parent)
+
+    # Full read round-trips values and dtypes
+    pd.testing.assert_frame_equal(read_table(os.path.join(tmp, "stage_b")), child)
+
+    # Groups carry forward from the parent (minus dropped columns) and select just their columns
+    meta = read_metadata(os.path.join(tmp, "stage_b"))
+    assert meta['groups']['srs'] == ['home_srs_rating'] and meta['parent'] == parent
+    df = read_table(os.path.join(tmp, "stage_b"), columns=['id'], groups=['srs', 'talent'])
+    assert list(df.columns) == ['id', 'home_srs_rating', 'home_talent_score', 'away_talent_score']
+    for bad in [dict(groups=['weather']), dict(columns=['nope'])]:
+        try:
+            read_table(os.path.join(tmp, "stage_b"), **bad)
+            assert False, "expected KeyError"
+        except KeyError:
+            pass
+
+    # Legacy CSV fallback: columns work, groups can't be resolved and say so
+    legacy = os.path.join(tmp, "stage_old")
+    base.to_csv(f"{legacy}.csv", index=False)
+    assert table_columns(legacy) == list(base.columns) and read_metadata(legacy) == {}
+    pd.testing.assert_frame_equal(read_table(legacy, columns=['id', 'home_team']), base[['id', 'home_team']])
+    try:
+        read_table(legacy, groups=['srs'])
+        assert False, "expected KeyError"
+    except KeyError as e:
+        assert 'srs' in str(e)
+    try:
+        read_table(os.path.join(tmp, "stage_missing"))
+        assert False, "expected FileNotFoundError"
+    except FileNotFoundError:
+        pass
+
+    print("✅ Stage Tables Verified.")
+
+if __name__ == "__main__":
+    test_table_round_trip()
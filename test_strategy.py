@@ -0,0 +1,43 @@
+import numpy as np
+from strategy import american_payout, bet_mask, side_outcome, result_codes, simulate, bet_equity
+
+def test_strategy_simulator():
+    print("Testing vectorized strategy simulator...")
+
+    assert np.allclose(american_payout([-110, 150, -200, 0, np.nan]), [100/110, 1.5, 0.5, 100/110, 100/110])
+
+    # Reference: the old per-row loop from visualize.py
+    rng = np.random.default_rng(7)
+    probs = rng.uniform(0.3, 0.7, 2000)
+    home_cover = rng.integers(0, 2, 2000)
+    balance, history, wins = 0.0, [0.0], 0
+    for p, y in zip(probs, home_cover):
+        if p >= 0.55 or p <= 0.45:
+            won = (y == 1) if p >= 0.55 else (y == 0)
+            balance += 100 * (100/110) if won else -100
+            wins += won
+            history.append(balance)
+
+    sim = simulate(bet_mask(probs, 0.55, inclusive=True), side_outcome(probs, home_cover))
+    assert np.allclose(bet_equity(sim), history)
+    assert sim['bets'] == len(history) - 1 and sim['wins'] == wins
+    peak = np.maximum.accumulate(history)
+    assert np.isclose(sim['max_drawdown'], (peak - history).max())
+
+    # Real odds, pushes and ungraded rows
+    outcome = result_codes(["WIN", "LOSS", "PUSH", None, "WIN"])
+    sim = simulate(np.ones(5, dtype=bool), outcome, odds=[150, -120, -110, -110, None])
+    assert list(sim['pnl']) == [150.0, -100.0, 0.0, 0.0, 100 * 100/110]
+    assert (sim['bets'], sim['wins'], sim['losses'], sim['pushes']) == (4, 2, 1, 1)
+    assert np.isclose(sim['roi'], sim['profit'] / 400 * 100)
+
+    # Many strategies at once: one row per threshold
+    grid = simulate(bet_mask(probs, [0.52, 0.55, 0.6]), side_outcome(probs, home_cover))
+    assert grid['equity'].shape == (3, 2000)
+    single = simulate(bet_mask(probs, 0.6), side_outcome(probs, home_cover))
+    assert np.isclose(grid['profit'][2], single['profit'])
+
+    print("✅ Strategy Simulator Verified.")
+
+if __name__ == "__main__":
+    test_strategy_simulator()
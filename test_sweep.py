@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from strategy import result_codes, kelly_fraction, simulate
+from sweep import sweep_market, pareto_front
+
+def test_sweep():
+    print("Testing strategy parameter sweep...")
+
+    rng = np.random.default_rng(3)
+    n = 400
+    history = pd.DataFrame({
+        'Spread Conf': [f"{c:.1f}%" for c in rng.uniform(50, 70, n)],
+        'Spread_Result': rng.choice(["WIN", "LOSS", "PUSH", None], n, p=[0.52, 0.43, 0.03, 0.02]),
+        'Moneyline Conf': "N/A", 'ML_Result': "WIN", 'Pick_ML_Odds': -150.0,
+    })
+    cube = sweep_market(history, 'spread', thresholds=np.array([0.55, 0.6]),
+                        fractions=np.array([0.0, 0.25]), min_edges=np.array([0.0, 0.02]))
+    assert len(cube) == 8
+
+    # One variant re-simulated directly: 60% threshold, quarter Kelly, 2% edge over -110
+    prob = history['Spread Conf'].str.rstrip('%').astype(float).to_numpy() / 100
+    mask = (prob > 0.6) & (prob - 110 / 210 >= 0.02)
+    direct = simulate(mask, result_codes(history['Spread_Result']), stake=1000 * 0.25 * kelly_fraction(prob))
+    row = cube[(cube['threshold'] == 0.6) & (cube['kelly_fraction'] == 0.25) & (cube['min_edge'] == 0.02)].iloc[0]
+    assert row['bets'] == direct['bets'] and np.isclose(row['profit'], direct['profit'])
+    assert np.isclose(row['max_drawdown'], direct['max_drawdown'])
+
+    # No confidence values -> no moneyline bets at all
+    assert (sweep_market(history, 'moneyline')['bets'] == 0).all()
+
+    # Pareto front: ROI strictly rises as allowed drawdown grows
+    front = pareto_front(cube, min_bets=1)
+    assert front['max_drawdown'].is_monotonic_increasing and front['roi'].is_monotonic_increasing
+
+    print("✅ Strategy Sweep Verified.")
+
+if __name__ == "__main__":
+    test_sweep()
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from walkforward import week_ordinal
+from tuner import forward_folds, time_split, successive_halving
+
+def test_time_aware_search():
+    print("Testing forward-chaining folds & successive halving...")
+
+    order = np.repeat([202401, 202402, 202403, 202404, 202405, 202501, 202502, 202503, 202504, 202505], 30)
+    folds = forward_folds(order, n_folds=4)
+    assert len(folds) == 4
+    for train, valid in folds:
+        # Never train on a week at or after the validation weeks
+        assert order[train].max() < order[valid].min()
+    assert all(len(folds[k][0]) < len(folds[k + 1][0]) for k in range(3))
+
+    # Bowls are postseason week 1 but must come after the regular season
+    games = pd.DataFrame({'season': 2024, 'week': [1, 1, 14, 15], 'season_type': ['postseason', 'regular', 'regular', 'regular']})
+    bowl_order = np.repeat(week_ordinal(games).to_numpy(), 10)
+    train, valid = forward_folds(bowl_order, n_folds=3)[-1]
+    assert set(bowl_order[valid]) == {week_ordinal(games)[0]} and bowl_order[train].max() < bowl_order[valid].min()
+
+    train, test = time_split(order, 0.2)
+    assert order[train].max() < order[test].min() and len(test) == 60
+
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(len(order), 3)).astype(np.float32)
+    y = (X[:, 0] > 0).astype(int)
+    grid = {'n_estimators': [10], 'max_depth': [1, 3], 'min_samples_leaf': [1, 50]}
+    params, score, _, n_fits = successive_halving(X, y, folds, param_grid=grid, trees=[5, 15], factor=2, n_jobs=1)
+    # 4 configs x 4 folds, then the best 2 x 4 folds
+    assert n_fits == 24
+    assert params['n_estimators'] == 15 and score > 0.8
+
+    print("✅ Time-Aware Search Verified.")
+
+if __name__ == "__main__":
+    test_time_aware_search()
@@ -1,71 +1,182 @@
+import os
+import sys
+import time
+import numpy as np
 import pandas as pd
-import joblib
+from joblib import Parallel, delayed
+from storage import read_table, table_columns
+from matrix import shared_matrix, rows, memory_report
+from registry import save_model
+from walkforward import week_ordinal
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.model_selection import GridSearchCV, ParameterGrid
 
-def tune_spread_model():
+FEATURES = [
+    'spread', 'overUnder',
+    'home_offense.ppa', 'home_offense.successRate', 'home_offense.explosiveness',
+    'home_defense.ppa', 'home_defense.successRate', 'home_defense.explosiveness',
+    'away_offense.ppa', 'away_offense.successRate', 'away_offense.explosiveness',
+    'away_defense.ppa', 'away_defense.successRate', 'away_defense.explosiveness'
+]
+
+# The "Grid" of possibilities
+PARAM_GRID = {
+    'n_estimators': [50, 100, 200, 300],        # Number of trees
+    'max_depth': [3, 5, 7, 10],                 # How deep each tree can go (lower = less overfitting)
+    'min_samples_split': [2, 5, 10],            # Minimum data points to create a split
+    'min_samples_leaf': [1, 2, 4]               # Minimum data points at the end of a branch
+}
+
+# Successive halving: trees are the budget. Every config starts small,
+# the best 1/HALVING_FACTOR move on and grow more trees on top of the old ones.
+HALVING_TREES = [33, 100, 300]
+HALVING_FACTOR = 3
+N_FOLDS = 4
+TEST_FRACTION = 0.2
+N_JOBS = int(os.getenv("CFB_WORKERS", -1))
+
+
+def forward_folds(order, n_folds=N_FOLDS):
+    """
+    Forward-chaining splits over time (order = walkforward.week_ordinal, so
+    bowls sort after the regular season).
+    Weeks are cut into n_folds + 1 blocks; fold k trains on blocks 0..k
+    and validates on block k+1, so no fold ever trains on future games.
+    """
+    blocks = np.array_split(np.unique(order), n_folds + 1)
+    folds = []
+    for k in range(n_folds):
+        train = np.flatnonzero(order <= blocks[k][-1])
+        valid = np.flatnonzero(np.isin(order, blocks[k + 1]))
+        folds.append((train, valid))
+    return folds
+
+
+def time_split(order, test_fraction=TEST_FRACTION):
+    """Hold out the latest weeks (about test_fraction of games) as the test set."""
+    cutoff = np.quantile(order, 1 - test_fraction)
+    return np.flatnonzero(order < cutoff), np.flatnonzero(order >= cutoff)
+
+
+def _grow(model, params, n_trees, X, y, train, valid):
+    """Add trees to a warm-started forest (or build it) and score it on the fold."""
+    if model is None:
+        model = RandomForestClassifier(n_estimators=n_trees, warm_start=True, random_state=42, **params)
+    else:
+        model.set_params(n_estimators=n_trees)
+    # Forward folds are contiguous row ranges, so these are views of the shared memmap
+    model.fit(rows(X, train), rows(y, train))
+    return model, model.score(rows(X, valid), rows(y, valid))
+
+
+def successive_halving(X, y, folds, param_grid=PARAM_GRID, trees=HALVING_TREES, factor=HALVING_FACTOR, n_jobs=N_JOBS):
+    """
+    Returns (best_params, best_cv_score, time_to_best, n_fits).
+    Forests are kept between rungs, so promoted configs only pay for the new trees.
+    """
+    grid = {k: v for k, v in param_grid.items() if k != 'n_estimators'}
+    candidates = list(ParameterGrid(grid))
+    forests = {}  # (candidate, fold) -> warm forest
+    start, n_fits = time.time(), 0
+    alive = list(range(len(candidates)))
+    scores = {}
+
+    for rung, n_trees in enumerate(trees):
+        jobs = [(c, f) for c in alive for f in range(len(folds))]
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_grow)(forests.get((c, f)), candidates[c], n_trees, X, y, *folds[f])
+            for (c, f) in jobs)
+        n_fits += len(jobs)
+
+        fold_scores = {}
+        for (c, f), (model, score) in zip(jobs, results):
+            forests[(c, f)] = model
+            fold_scores.setdefault(c, []).append(score)
+        scores = {c: float(np.mean(s)) for c, s in fold_scores.items()}
+
+        keep = max(1, int(np.ceil(len(alive) / factor))) if rung < len(trees) - 1 else 1
+        alive = sorted(alive, key=lambda c: -scores[c])[:keep]
+        for key in [k for k in forests if k[0] not in alive]:
+            del forests[key]
+        print(f"   Rung {rung + 1}: {len(jobs) // len(folds):>3} configs x {n_trees:>3} trees "
+              f"| best CV {scores[alive[0]]:.1%} | {time.time() - start:6.1f}s")
+
+    best = alive[0]
+    params = dict(candidates[best], n_estimators=trees[-1])
+    return params, scores[best], time.time() - start, n_fits
+
+
+def grid_search(X, y, folds, param_grid=PARAM_GRID, n_jobs=N_JOBS):
+    """The exhaustive search (every combination, every fold). Returns the same tuple."""
+    start = time.time()
+    search = GridSearchCV(estimator=RandomForestClassifier(random_state=42), param_grid=param_grid,
+                          cv=folds, n_jobs=n_jobs, verbose=1, scoring='accuracy')
+    search.fit(X, y)
+    n_fits = len(search.cv_results_['params']) * len(folds)
+    # The winner is only known once every fit has finished
+    return search.best_params_, search.best_score_, time.time() - start, n_fits
+
+
+def tune_spread_model(mode="halving"):
     print("--- 🔧 STARTING HYPERPARAMETER TUNING 🔧 ---")
-    
-    # 1. Load Data
+
+    # 1. Load Data (once; every candidate and worker maps the same float32 matrix)
     print("Loading data...")
-    df = pd.read_csv("cfb_training_data_24_25.csv")
-    
-    features = [
-        'spread', 'overUnder',
-        'home_offense.ppa', 'home_offense.successRate', 'home_offense.explosiveness',
-        'home_defense.ppa', 'home_defense.successRate', 'home_defense.explosiveness',
-        'away_offense.ppa', 'away_offense.successRate', 'away_offense.explosiveness',
-        'away_defense.ppa', 'away_defense.successRate', 'away_defense.explosiveness'
-    ]
-    
-    # Filter valid data
-    df_clean = df.dropna(subset=features + ['target_home_cover']).copy()
-    X = df_clean[features]
-    y = df_clean['target_home_cover']
-    
-    # 2. Split Data (Keep the test set separate so we don't cheat!)
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # 3. Define the "Grid" of possibilities
-    # The machine will try EVERY combination of these settings.
-    param_grid = {
-        'n_estimators': [50, 100, 200, 300],        # Number of trees
-        'max_depth': [3, 5, 7, 10],                 # How deep each tree can go (lower = less overfitting)
-        'min_samples_split': [2, 5, 10],            # Minimum data points to create a split
-        'min_samples_leaf': [1, 2, 4]               # Minimum data points at the end of a branch
-    }
-    
-    # 4. Setup the Grid Search
-    # cv=5 means "5-Fold Cross Validation". It trains 5 times on different chunks of data 
-    # to ensure the score isn't just luck.
-    rf = RandomForestClassifier(random_state=42)
-    
-    print(f"Testing {len(param_grid['n_estimators']) * len(param_grid['max_depth']) * len(param_grid['min_samples_split']) * len(param_grid['min_samples_leaf'])} different model combinations...")
-    print("This might take a minute...")
-    
-    grid_search = GridSearchCV(estimator=rf, param_grid=param_grid, 
-                               cv=5, n_jobs=-1, verbose=1, scoring='accuracy')
-    
-    grid_search.fit(X_train, y_train)
-    
-    # 5. The Results
-    best_params = grid_search.best_params_
-    best_score = grid_search.best_score_
-    
+    keys = ['season', 'week', 'season_type']
+    if 'season_type' not in table_columns("cfb_training_data_24_25"):
+        # Older tables can't tell bowls (postseason week 1) from September games
+        print("⚠️ No season_type column; rerun main.py so postseason games sort last.")
+        keys = ['season', 'week']
+    df = read_table("cfb_training_data_24_25", columns=keys + FEATURES + ['target_home_cover'])
+    if 'season_type' not in df:
+        df['season_type'] = 'regular'
+
+    # Filter valid data, oldest games first
+    df_clean = df.dropna(subset=FEATURES + ['target_home_cover']).copy()
+    df_clean['order'] = week_ordinal(df_clean)
+    df_clean = df_clean.sort_values('order', kind='mergesort').reset_index(drop=True)
+    X = shared_matrix(df_clean, "tuner_X", FEATURES)
+    y = df_clean['target_home_cover'].to_numpy(dtype=int)
+    order = df_clean['order'].to_numpy()
+
+    # 2. Split Data by time (test on the latest weeks so we don't cheat!)
+    train_idx, test_idx = time_split(order)
+    X_train, y_train = rows(X, train_idx), rows(y, train_idx)
+    folds = forward_folds(order[train_idx])
+    print(f"Train: {len(train_idx)} games | Test: {len(test_idx)} games (latest weeks) | {len(folds)} forward folds")
+
+    # 3. Search
+    n_combos = int(np.prod([len(v) for v in PARAM_GRID.values()]))
+    if mode == "grid":
+        print(f"Testing {n_combos} different model combinations (exhaustive)...")
+        best_params, best_score, time_to_best, n_fits = grid_search(X_train, y_train, folds)
+    else:
+        print(f"Successive halving over {n_combos // len(PARAM_GRID['n_estimators'])} configs, trees {HALVING_TREES}...")
+        best_params, best_score, time_to_best, n_fits = successive_halving(X_train, y_train, folds)
+
+    # 4. The Results
     print("\n--- ✅ TUNING COMPLETE ---")
     print(f"Best Training Accuracy (CV): {best_score:.1%}")
+    print(f"Time-to-best: {time_to_best:.1f}s ({n_fits} fits)")
     print("Best Parameters found:")
     print(best_params)
-    
-    # 6. Validate on the Test Set (The Moment of Truth)
-    best_model = grid_search.best_estimator_
-    test_acc = best_model.score(X_test, y_test)
-    
+
+    # 5. Validate on the Test Set (The Moment of Truth)
+    # Fit on named columns so the estimator carries feature_names_in_ itself
+    best_model = RandomForestClassifier(random_state=42, n_jobs=-1, **best_params)
+    start = time.time()
+    best_model.fit(pd.DataFrame(X_train, columns=FEATURES), y_train)
+    fit_seconds = time.time() - start
+    test_acc = best_model.score(pd.DataFrame(rows(X, test_idx), columns=FEATURES), rows(y, test_idx))
+
     print(f"\nTest Set Accuracy (Unseen Data): {test_acc:.1%}")
-    
-    # 7. Save the Tuned Model
-    joblib.dump(best_model, "model_spread_tuned.pkl")
-    print("Saved optimized model to 'model_spread_tuned.pkl'")
+
+    # 6. Save the Tuned Model
+    version = save_model("spread", best_model, FEATURES, data=(X_train, y_train),
+                         metrics={'cv_accuracy': best_score, 'test_accuracy': test_acc},
+                         train_seconds=fit_seconds, source=f"tuner.py ({mode})")
+    print(f"Saved optimized model to the registry as spread {version}")
+    memory_report(f"tuner/{mode}")
 
 if __name__ == "__main__":
-    tune_spread_model()
\ No newline at end of file
+    tune_spread_model("grid" if "--grid" in sys.argv else "halving")
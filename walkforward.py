@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from honest_backfill import FEATURES, load_games, make_targets, fit_models, make_picks
+from grading import grade_history, record
+
+# Walk-forward backtest: for every week of the test season(s), train on all
+# games played before that week and predict that week only. Folds run in a
+# process pool; the feature matrix and targets live in one shared-memory block
+# that every worker maps, so nothing is pickled per fold except the week id.
+
+# --- CONFIG ---
+TRAIN_SEASONS = [2024]
+TEST_SEASONS = [2025]
+MIN_TRAIN_GAMES = 200
+WORKERS = int(os.getenv("CFB_WORKERS", os.cpu_count() or 1))
+OUTPUT_FILE = "walkforward_results.csv"
+
+# Postseason sorts after every regular-season week of the same year
+SEASON_TYPE_ORDER = {'regular': 0, 'postseason': 1}
+
+# Per-worker views onto the shared block (set by _attach)
+_SHARED = {}
+
+
+def week_ordinal(df):
+    """Sortable int per (season, season_type, week)."""
+    stype = df['season_type'].map(SEASON_TYPE_ORDER).fillna(0).astype(int)
+    return df['season'].astype(int) * 1000 + stype * 100 + df['week'].fillna(0).astype(int)
+
+
+def share_arrays(arrays):
+    """Copy named float64 arrays into one shared-memory block. Returns (shm, layout)."""
+    total = sum(a.nbytes for a in arrays.values())
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    layout, offset = {}, 0
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        view = np.ndarray(arr.shape, dtype=np.float64, buffer=shm.buf, offset=offset)
+        view[:] = arr
+        layout[name] = (arr.shape, offset)
+        offset += arr.nbytes
+    return shm, layout
+
+
+def _attach(shm_name, layout):
+    """Worker initializer: map the shared block once per process."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _SHARED['shm'] = shm  # keep the mapping alive
+    for name, (shape, offset) in layout.items():
+        _SHARED[name] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, offset=offset)
+
+
+def run_fold(ordinal):
+    """Train on every game before `ordinal`, predict the games in it."""
+    order = _SHARED['ordinal']
+    train = order < ordinal
+    test = np.flatnonzero(order == ordinal)
+
+    X = _SHARED['X']
+    models = fit_models(X[train], _SHARED['y_spread'][train], _SHARED['y_win'][train],
+                        _SHARED['y_total'][train], n_jobs=1)
+    probs = [m.predict_proba(X[test])[:, 1] for m in models]
+    return ordinal, int(train.sum()), test, probs
+
+
+def main():
+    print("--- 🚶 RUNNING WALK-FORWARD BACKTEST ---")
+    start = time.time()
+
+    # 1. Load games (same snapshots & features as honest_backfill)
+    print("   -> Loading season data...")
+    df = load_games(TRAIN_SEASONS + TEST_SEASONS)
+    if df.empty:
+        print("❌ No completed games with lines found.")
+        return
+    df['ordinal'] = week_ordinal(df)
+    df = df.sort_values(['ordinal', 'StartDate'], kind='mergesort').reset_index(drop=True)
+
+    # 2. Folds: one per test week with enough history behind it
+    y_spread, y_win, y_total = make_targets(df)
+    ordinals = df['ordinal'].to_numpy()
+    weeks = np.unique(ordinals[df['season'].isin(TEST_SEASONS).to_numpy()])
+    folds = [o for o in weeks if (ordinals < o).sum() >= MIN_TRAIN_GAMES]
+    if not folds:
+        print(f"❌ No test weeks with at least {MIN_TRAIN_GAMES} training games.")
+        return
+    print(f"   -> {len(folds)} weekly folds, {len(df)} games, {WORKERS} workers")
+
+    # 3. Run folds in parallel against one shared copy of the data
+    shm, layout = share_arrays({
+        'X': df[FEATURES].to_numpy(dtype=float),
+        'y_spread': y_spread.to_numpy(), 'y_win': y_win.to_numpy(), 'y_total': y_total.to_numpy(),
+        'ordinal': ordinals,
+    })
+    picks = []
+    try:
+        with ProcessPoolExecutor(max_workers=WORKERS, initializer=_attach,
+                                 initargs=(shm.name, layout)) as pool:
+            for ordinal, n_train, test, (p_spr, p_win, p_tot) in pool.map(run_fold, folds):
+                week = make_picks(df.iloc[test], p_spr, p_win, p_tot)
+                week['_ordinal'] = ordinal
+                picks.append(week)
+                print(f"      Week {ordinal % 100:>2} ({'post' if ordinal % 1000 >= 100 else 'reg'}) "
+                      f"| train {n_train:>5} | test {len(test):>3}")
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # 4. Grade & save (same schema as backtest_2025.csv)
+    results_df = grade_history(pd.concat(picks, ignore_index=True))
+
+    print("\n--- 📅 WEEKLY RECORD (Spread / ML / Total) ---")
+    for ordinal, week in results_df.groupby('_ordinal'):
+        line = " | ".join(f"{w}-{l}-{p}" for w, l, p, _ in
+                          (record(week[c]) for c in ["Spread_Result", "ML_Result", "Total_Result"]))
+        print(f"{ordinal // 1000} wk {ordinal % 100:>2}{' (post)' if ordinal % 1000 >= 100 else ''}: {line}")
+
+    results_df = results_df.drop(columns='_ordinal')
+    results_df.to_csv(OUTPUT_FILE, index=False)
+
+    print("\n--- 📊 WALK-FORWARD RESULTS ---")
+    for bet_type, col in [("Spread", "Spread_Result"), ("Moneyline", "ML_Result"), ("Total", "Total_Result")]:
+        wins, losses, pushes, win_rate = record(results_df[col])
+        print(f"{bet_type}: {wins}-{losses}-{pushes} ({win_rate:.1f}%)")
+
+    print(f"\n✅ SUCCESS: {len(results_df)} picks saved to {OUTPUT_FILE} ({time.time() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1].isdigit():
+        TEST_SEASONS = [int(sys.argv[1])]
+        TRAIN_SEASONS = [TEST_SEASONS[0] - 1]
+    main()
@@ -1,33 +1,16 @@
-import os
-import requests
 import pandas as pd
-import time
-from dotenv import load_dotenv
-
-load_dotenv()
-API_KEY = os.getenv("CFBD_API_KEY")
-HEADERS = {"Authorization": f"Bearer {API_KEY}", "Accept": "application/json"}
-
-def get_data(endpoint, params):
-    url = f"https://api.collegefootballdata.com{endpoint}"
-    try:
-        response = requests.get(url, headers=HEADERS, params=params)
-        response.raise_for_status()
-        time.sleep(0.3)
-        return response.json()
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return []
+from api import get_data
+from storage import read_table, write_table
 
 def main():
     print("--- 🌪️ FETCHING WEATHER DATA 🌪️ ---")
     
     # 1. Load Existing Data
     try:
-        df = pd.read_csv("cfb_training_data_ultimate.csv")
+        df = read_table("cfb_training_data_ultimate")
         print(f"Loaded {len(df)} games.")
     except FileNotFoundError:
-        print("Error: cfb_training_data_ultimate.csv not found. Run talent.py first!")
+        print("Error: cfb_training_data_ultimate not found. Run talent.py first!")
         return
 
     # 2. Fetch Weather for Each Season
@@ -80,8 +63,10 @@ def main():
     df['windSpeed'] = df['windSpeed'].fillna(0.0)
     
     # 5. Save
-    output_filename = "cfb_training_data_weather.csv"
-    df.to_csv(output_filename, index=False)
+    weather_cols = [c for c in ['temperature', 'windSpeed', 'weatherConditionCode'] if c in df.columns]
+    output_filename = write_table(df, "cfb_training_data_weather",
+                                  groups={'weather': weather_cols},
+                                  parent="cfb_training_data_ultimate")
     print(f"\nSUCCESS: Saved dataset to {output_filename}")
     print("New Columns: ['temperature', 'windSpeed']")
 